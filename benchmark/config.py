@@ -9,6 +9,12 @@ n_proc = 4
 # Seed for the benchmark
 seed = 1234
 
+# Seeds of the MCTS runs, each configuration runs once per seed on every graph
+mcts_seeds = [seed]
+
+# Append-only file with the result of every finished job, a run skips the jobs already in it
+results_file = "results/benchmark.jsonl"
+
 # Configuration for the MCTS runs
 mcts_config: list[MctsConfig] = [
     MctsConfig(MctsAlg.OPT, StateRep.DSATUR, 10, -1, None, None, 0, 0, 2, 1, seed),
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import MISSING, dataclass, fields
+from enum import Enum
 from time import time
 from typing import Iterable
 import matplotlib.pyplot as plt
@@ -9,25 +10,12 @@ from random import Random
 
 from src.types import BenchmarkResult, GcpSolver, MctsConfig
 from src.algorithms.mcts_setups import run_opt_mcts, run_uct_mcts
-from src.utils import read_graph
-from src.algorithms import dsatur, largest_first, recursive_largest_fit, seq_assignment
-from config import all_graphs, all_ub_graphs, dimacs_solved_graphs, all_solved_graphs, mcts_config, n_proc, seed, BenchmarkGraph
+from src.runner import ResultsStore, Solver, check_coloring, load_graph, make_jobs, run_jobs
+from src.algorithms import dsatur_fast, largest_first, recursive_largest_fit_fast, seq_assignment
+from config import all_graphs, all_ub_graphs, dimacs_solved_graphs, all_solved_graphs, mcts_config, mcts_seeds, n_proc, results_file, seed, BenchmarkGraph
 
 
 
-loaded_graphs: dict[str, tuple[range, list[set[int]]]] = {}
-
-def check_coloring(edges: list[set[int]], coloring: list[int], complete: bool = True) -> bool:
-    if complete and len(coloring) != len(edges):
-        return False
-
-    for index, color in enumerate(coloring):
-        for neighbor in edges[index]:
-            if neighbor < len(coloring) and coloring[neighbor] == color:
-                return False
-            
-    return True
-
 def test_heuristic(graphs: list[BenchmarkGraph], heur: GcpSolver) -> list[BenchmarkResult]:
     # x = []
     # y = []
@@ -37,7 +25,7 @@ def test_heuristic(graphs: list[BenchmarkGraph], heur: GcpSolver) -> list[Benchm
     benchmark_results = []
 
     for (path, (n, e), best_sol, orig) in graphs:
-        nodes, adj = loaded_graphs[path] if path in loaded_graphs else read_graph(f"instances/{path}")
+        nodes, adj = load_graph(path)
         t0 = time()
         colors, k = heur(nodes, adj)
         total_time = time() - t0
@@ -78,43 +66,52 @@ def print_result(alg_name: str, results: list[BenchmarkResult], verbose=True) ->
     print("Mean Square Error (MSE):", sqr_sum / len(results))
 
 def mcts_name_from_config(config: MctsConfig):
-    return f"MCTS {config.mcts_kind} {config.max_iter}I {"HEUR" if config.heuristic_fun is None else ""} {config.n_simulations}SIM"
+    # The optional fields are listed when they differ from their defaults, so that two configurations only
+    # share a name when they run the same search
+    name = f"MCTS {config.mcts_kind} {config.state_rep} {config.max_iter}I {"HEUR" if config.heuristic_fun is None else ""} {config.n_simulations}SIM"
+    name += f" c_p={config.c_p} c_h={config.c_h} c_r={config.c_r} {config.max_time}T"
+
+    for field in fields(config):
+        value = getattr(config, field.name)
+
+        if field.default is not MISSING and field.name != "profile" and value != field.default:
+            name += f" {field.name}={value.name if isinstance(value, Enum) else value}"
+
+    return name
 
 def main():
     random_gen = Random(seed)
-    pool = Pool(n_proc)
 
     # graph_sample = random_gen.sample(all_solved_graphs, 5)
     graph_sample = all_ub_graphs
 
-    heur_algs = [
-        seq_assignment,
-        largest_first,
-        recursive_largest_fit,
-        dsatur
-    ]
+    heur_algs = {
+        "Sequential Assignment": seq_assignment,
+        "Largest First": largest_first,
+        "Recursive Largest Fit": recursive_largest_fit_fast,
+        "DSATUR": dsatur_fast
+    }
 
-    t0 = time()
+    solvers: dict[str, Solver] = dict(heur_algs)
 
-    heur_res = pool.starmap(run_benchmark, ((graph_sample, heur) for heur in heur_algs))
-    pool.close()
+    for config in mcts_config:
+        name = mcts_name_from_config(config)
 
-    mcts_res: dict[str, list[BenchmarkResult]] = {}
-    for mcts_input in mcts_config:
-        mcts_res[mcts_name_from_config(mcts_input)] = run_benchmark(graph_sample, lambda x, y: run_uct_mcts(mcts_input, y))
+        if name in solvers:
+            raise ValueError(f"Two solvers are named {name}, the results of one would replace the other")
 
-    total_time = time() - t0
+        solvers[name] = config
+
+    t0 = time()
+
+    # Every (solver, graph, seed) job runs in the pool, the jobs already in the results file are skipped
+    store = ResultsStore(results_file)
+    results = run_jobs(make_jobs(solvers, graph_sample, mcts_seeds), solvers, store, n_proc)
 
-    print_result("Sequential Assignment", heur_res[0], False)
-    print_result("Largest First", heur_res[1], False)
-    print_result("Recursive Largest Fit", heur_res[2], False)
-    print_result("DSATUR", heur_res[3], False)
-    # 787s total time
-    # 114s total time
+    total_time = time() - t0
 
-    # 6.3
-    for alg_name in mcts_res:
-        print_result(alg_name, mcts_res[alg_name])
+    for alg_name in solvers:
+        print_result(alg_name, [res for job, res in results if job.solver == alg_name], alg_name not in heur_algs)
 
     print("Benchmark total time: ", total_time)
     
@@ -0,0 +1,48 @@
+import os
+import resource
+from time import perf_counter
+
+from mcts import AsyncTreeParallelMonteCarloTreeSearch, TreeParallelMonteCarloTreeSearch
+from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.other import Solutions
+from mcts.sample import GraphColorDsaturState
+
+from config import n_proc, seed
+from src.utils import read_graph
+
+# Iterations per second and busy share of the rollout workers of the tree parallel engine, which waits for
+# each batch, against the asynchronous one, which keeps a queue of rollouts in flight
+instances = ["queen8_8.col", "DSJC125.5.col.b", "le450_15a.col"]
+max_time = 10
+
+
+def make_default_policy(seed: int, solutions: Solutions) -> UctDefaultPolicy:
+    return UctDefaultPolicy(solutions=solutions, seed=seed)
+
+def children_cpu() -> float:
+    # CPU time of the terminated child processes, the pool workers once the run is over
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def measure(engine, graph: list[set[int]]) -> tuple[float, float, float]:
+    # Returns the iterations per second, the share of the run during which the workers were busy (over
+    # the workers that can run at once) and the number of colors
+    cpu = children_cpu()
+    t0 = perf_counter()
+    summary = engine.run(UctTreeNode(GraphColorDsaturState(graph)), max_time=max_time)
+    elapsed = perf_counter() - t0
+    busy = (children_cpu() - cpu) / (elapsed * min(n_proc, os.cpu_count() or 1))
+    return summary.n_iter / summary.elapsed, busy, -summary.best_reward if summary.best_reward is not None else -1
+
+def main():
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+        print(f"{path} ({max_time}s, {n_proc} workers):")
+
+        for name, engine_type in (("Tree parallel", TreeParallelMonteCarloTreeSearch), ("Async tree parallel", AsyncTreeParallelMonteCarloTreeSearch)):
+            solutions = Solutions()
+            speed, busy, colors = measure(engine_type(UctTreePolicy(seed=seed), make_default_policy, n_proc, solutions, seed), graph)
+            print(f"  {name}: {speed:.1f} it/s, workers busy {100 * busy:.0f}%, {colors:.0f} colors")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from time import perf_counter
+
+from mcts.algorithms.batch import BatchRolloutPolicy
+from mcts.algorithms.uct import UctDefaultPolicy
+from mcts.other import StateNode
+from mcts.sample import GraphColorDsaturState, GraphColorSeqState
+
+from src.utils import read_graph
+
+# Instances and number of rollouts used to compare the batched NumPy rollouts with the sequential ones
+instances = ["queen8_8.col", "DSJC125.5.col.b", "DSJC250.5.col.b"]
+batch_size = 64
+n_batches = 4
+seed = 1234
+
+
+def measure(policy, node) -> tuple[float, float]:
+    # Returns the rollouts per second and the mean reward
+    total = 0.0
+    count = 0
+
+    t0 = perf_counter()
+
+    for _ in range(n_batches):
+        reward, n = policy.simulate(node)
+        total += reward
+        count += n
+
+    return count / (perf_counter() - t0), total / count
+
+def main():
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+
+        print(f"{path} ({n_batches} x {batch_size} rollouts):")
+
+        for state in (GraphColorSeqState(graph), GraphColorDsaturState(graph)):
+            node = StateNode(state)
+            python_speed, python_reward = measure(UctDefaultPolicy(n_sims=batch_size, seed=seed), node)
+            batch_speed, batch_reward = measure(BatchRolloutPolicy(batch_size, seed=seed), node)
+
+            print(f"  {type(state).__name__}: python {python_speed:.1f} rollouts/s (mean {python_reward:.2f}), "
+                f"numpy {batch_speed:.1f} rollouts/s (mean {batch_reward:.2f}, {batch_speed / python_speed:.2f}x)")
+
+if __name__ == "__main__":
+    main()
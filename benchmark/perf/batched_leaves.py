@@ -0,0 +1,43 @@
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.batch import BatchRolloutPolicy
+from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.other import Solutions
+from mcts.sample import GraphColorDsaturState
+
+from src.utils import read_graph
+
+# Iterations per second of a single process search that simulates one leaf per step against batches of
+# leaves selected with virtual loss, with the NumPy rollouts and with a pool of rollout workers
+instances = ["DSJC125.5.col.b", "DSJC250.5.col.b"]
+n_iter = 400
+batch_sizes = [1, 8, 32]
+n_workers = 4
+seed = 1234
+
+
+def run(default_policy, graph, solutions: Solutions, batch_size: int) -> tuple[float, float]:
+    search = MonteCarloTreeSearch(UctTreePolicy(seed=seed), default_policy, solutions)
+    summary = search.run(UctTreeNode(GraphColorDsaturState(graph)), n_iter, batch_size=batch_size)
+    return summary.n_iter / summary.elapsed, -summary.best_reward if summary.best_reward is not None else -1
+
+def main():
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+
+        print(f"{path} ({n_iter} iterations):")
+
+        for name, make_policy in (
+                ("NumPy rollouts (4 per leaf)", lambda solutions: BatchRolloutPolicy(4, solutions=solutions, seed=seed)),
+                (f"pool of {n_workers} workers", lambda solutions: UctDefaultPolicy(1, n_workers, solutions=solutions, seed=seed))):
+            for batch_size in batch_sizes:
+                solutions = Solutions()
+                default_policy = make_policy(solutions)
+                speed, colors = run(default_policy, graph, solutions, batch_size)
+
+                if isinstance(default_policy, UctDefaultPolicy):
+                    default_policy.close()
+
+                print(f"  {name}, {batch_size} leaves per step: {speed:.0f} iterations/s, {colors:.0f} colors")
+
+if __name__ == "__main__":
+    main()
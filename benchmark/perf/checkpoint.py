@@ -0,0 +1,89 @@
+import os
+import pickle
+import tempfile
+from time import perf_counter
+
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.opt import OptDefaultPolicy, OptTreeNode, OptTreePolicy
+from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.other import Solutions
+from mcts.sample import GraphColorSeqState
+
+from src.utils import read_graph
+
+# Size and time of a checkpoint against pickling the whole tree, and whether a search saved halfway and
+# resumed from the file ends with the same tree as an uninterrupted one
+instance = "DSJC125.5.col.b"
+n_iter = 20000
+seed = 1234
+
+
+def uct_search() -> MonteCarloTreeSearch:
+    solutions = Solutions()
+    return MonteCarloTreeSearch(UctTreePolicy(seed=seed), UctDefaultPolicy(solutions=solutions, seed=seed), solutions)
+
+def opt_search() -> MonteCarloTreeSearch:
+    solutions = Solutions()
+    return MonteCarloTreeSearch(OptTreePolicy(seed=seed, incumbent=solutions), OptDefaultPolicy(seed=seed, solutions=solutions), solutions)
+
+def visits(root) -> list[float]:
+    # Visits of every node in preorder, equal for two trees grown by the same choices
+    result = []
+    stack = [root]
+
+    while stack:
+        node = stack.pop()
+        result.append(node.N)
+        stack.extend(child[1] if isinstance(child, tuple) else child for child in reversed(node.children))
+
+    return result
+
+def main():
+    _, graph = read_graph(f"instances/{instance}")
+    path = os.path.join(tempfile.mkdtemp(), "tree.ckpt")
+
+    print(f"{instance} ({n_iter} iterations):")
+
+    for name, make_search, node in (("UCT", uct_search, UctTreeNode), ("OPT", opt_search, OptTreeNode)):
+        search = make_search()
+        root = node(GraphColorSeqState(graph))
+        search.run(root, n_iter)
+
+        t0 = perf_counter()
+        n_nodes = search.save(path, root)
+        save_time = perf_counter() - t0
+        size = os.path.getsize(path)
+
+        t0 = perf_counter()
+        loaded_root = make_search().load(path)
+        load_time = perf_counter() - t0
+        assert visits(loaded_root) == visits(root)
+
+        t0 = perf_counter()
+        pickled = pickle.dumps(root, pickle.HIGHEST_PROTOCOL)
+        pickle_time = perf_counter() - t0
+
+        print(f"  {name}: {n_nodes} nodes, checkpoint {size / 1e6:.2f} MB ({size / n_nodes:.0f} B/node), save {save_time:.2f} s, "
+            f"load {load_time:.2f} s, pickle of the tree {len(pickled) / 1e6:.2f} MB in {pickle_time:.2f} s")
+
+        # Half the iterations, a checkpoint, and the other half in a new search restored from it
+        search = make_search()
+        root = node(GraphColorSeqState(graph))
+        search.run(root, n_iter // 2)
+        search.save(path, root)
+
+        resumed = make_search()
+        resumed_root = resumed.load(path)
+        resumed.run(resumed_root, n_iter - n_iter // 2)
+
+        search = make_search()
+        root = node(GraphColorSeqState(graph))
+        search.run(root, n_iter)
+
+        same = visits(resumed_root) == visits(root) and resumed.best_reward() == search.best_reward()
+        print(f"  {name} resumed halfway: {'same' if same else 'different'} tree and best reward ({search.best_reward()})")
+
+    os.remove(path)
+
+if __name__ == "__main__":
+    main()
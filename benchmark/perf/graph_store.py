@@ -0,0 +1,47 @@
+import resource
+from multiprocessing import Pool
+
+from src.utils import GraphStore, GraphStoreHandle, read_graph
+
+# Large instances loaded by every worker, the memory of each worker is compared when it parses them
+# itself against when it attaches to a shared GraphStore
+instances = ["DSJC1000.5.col.b", "DSJC1000.9.col.b", "flat1000_76_0.col.b", "latin_square_10.col"]
+n_workers = [1, 2, 4]
+
+
+def max_rss() -> int:
+    # Peak resident memory of the process in KB (Linux), it includes the shared pages that were read
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def load_parsed(_: int) -> int:
+    rss = max_rss()
+    graphs = [read_graph(f"instances/{path}") for path in instances]
+    growth = max_rss() - rss
+    del graphs
+    return growth
+
+def load_shared(handle: GraphStoreHandle) -> int:
+    rss = max_rss()
+    store = GraphStore.attach(handle)
+    arrays = [store.csr(path) for path in instances]
+    max(int(indices.max(initial=0)) for _, indices in arrays) # Reads every page of the shared arrays
+    growth = max_rss() - rss
+    del arrays
+    store.close()
+    return growth
+
+def main():
+    with GraphStore.create(instances) as store:
+        print(f"Shared store: {store.nbytes() / 2 ** 20:.1f} MB")
+
+        for n in n_workers:
+            with Pool(n) as pool:
+                parsed = sum(pool.map(load_parsed, range(n), chunksize=1))
+
+            with Pool(n) as pool:
+                shared = sum(pool.map(load_shared, [store.handle] * n, chunksize=1))
+
+            print(f"  {n} workers: parsed {parsed / 1024:.1f} MB, shared {shared / 1024:.1f} MB of resident memory growth")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from time import perf_counter
+
+from src.algorithms import dsatur, dsatur_fast, recursive_largest_fit, recursive_largest_fit_fast
+from src.utils import read_graph
+from config import all_graphs
+
+# Time of the DSATUR and RLF baselines against their optimised versions on every instance of the
+# benchmark, which must give the same colorings
+pairs = [("DSATUR", dsatur, dsatur_fast), ("RLF", recursive_largest_fit, recursive_largest_fit_fast)]
+
+
+def timed(heur, nodes, adj) -> tuple[tuple[list[int], int], float]:
+    t0 = perf_counter()
+    res = heur(nodes, adj)
+    return res, perf_counter() - t0
+
+def main():
+    totals = {name: [0.0, 0.0] for name, _, _ in pairs}
+
+    for path, _, _, _ in all_graphs:
+        nodes, adj = read_graph(f"instances/{path}")
+        line = []
+
+        for name, heur, heur_fast in pairs:
+            res, t = timed(heur, nodes, adj)
+            res_fast, t_fast = timed(heur_fast, nodes, adj)
+
+            if res != res_fast:
+                raise AssertionError(f"{name} colorings differ on {path}")
+
+            totals[name][0] += t
+            totals[name][1] += t_fast
+            line.append(f"{name} {res[1]} colors {t * 1000:.1f} -> {t_fast * 1000:.1f} ms")
+
+        print(f"{path}: {", ".join(line)}")
+
+    for name, (t, t_fast) in totals.items():
+        print(f"{name} total: {t:.2f} s -> {t_fast:.2f} s ({t / t_fast:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.uct import LeafEvaluation, UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.other import SearchProfiler, Solutions
+from mcts.sample import GraphColorDsaturState
+
+from src.utils import read_graph
+
+# Simulation time per iteration and colors found with several rollouts per leaf, for each way of
+# aggregating them, with and without cutting off the rollouts that cannot enter the kept rewards
+instances = ["queen8_8.col", "DSJC125.5.col.b"]
+n_iter = 300
+n_sims = 8
+seed = 1234
+settings = [
+    ("1 rollout", {"n_sims": 1}),
+    ("mean", {"evaluation": LeafEvaluation.MEAN}),
+    ("max", {"evaluation": LeafEvaluation.MAX, "cut_off": False}),
+    ("max, cut off", {"evaluation": LeafEvaluation.MAX}),
+    ("top 3, cut off", {"evaluation": LeafEvaluation.TOP_K, "top_k": 3})
+]
+
+
+def main():
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+
+        print(f"{path} ({n_iter} iterations, {n_sims} rollouts per leaf):")
+
+        for name, kwargs in settings:
+            solutions = Solutions()
+            profiler = SearchProfiler()
+            default_policy = UctDefaultPolicy(**{"n_sims": n_sims, "solutions": solutions, "seed": seed, **kwargs})
+            search = MonteCarloTreeSearch(UctTreePolicy(seed=seed), default_policy, solutions)
+            summary = search.run(UctTreeNode(GraphColorDsaturState(graph)), n_iter, profiler=profiler)
+
+            print(f"  {name}: {1000 * profiler.profile.simulation.time / n_iter:.1f} ms/iteration, {-summary.best_reward if summary.best_reward is not None else -1:.0f} colors")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import tracemalloc
+
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.opt import OptTreeNode, OptTreePolicy
+from mcts.algorithms.uct import UctTreeNode, UctTreePolicy
+from mcts.other import NodeBudget
+from mcts.sample import GraphColorSeqState
+
+from perf.tree_store import RandomRewardPolicy
+from src.utils import read_graph
+
+# Memory of the tree over a long run without a node budget and with one, the rollouts are replaced by
+# random rewards so that the tree grows as fast as possible
+instance = "DSJC1000.5.col.b"
+n_iter = 40000
+n_checkpoints = 4
+max_nodes = 10000
+seed = 1234
+
+
+def run(policy, node, graph, budget: NodeBudget | None) -> list[tuple[int, float]]:
+    # Returns the number of nodes and the traced memory in MB at each checkpoint
+    root = node(GraphColorSeqState(graph))
+    search = MonteCarloTreeSearch(policy(seed=seed, budget=budget), RandomRewardPolicy(seed))
+    checkpoints = []
+
+    tracemalloc.start()
+
+    for _ in range(n_checkpoints):
+        search.run(root, n_iter // n_checkpoints)
+        checkpoints.append((root.count(), tracemalloc.get_traced_memory()[0] / 2 ** 20))
+
+    tracemalloc.stop()
+
+    return checkpoints
+
+def main():
+    _, graph = read_graph(f"instances/{instance}")
+
+    print(f"{instance} ({n_iter} iterations):")
+
+    for name, policy, node in (("UCT", UctTreePolicy, UctTreeNode), ("OPT", OptTreePolicy, OptTreeNode)):
+        for budget in (None, NodeBudget(max_nodes)):
+            checkpoints = run(policy, node, graph, budget)
+            label = f"max_nodes={max_nodes}" if budget is not None else "no budget"
+
+            print(f"  {name} {label}: " + ", ".join(f"{nodes} nodes {memory:.0f} MB" for nodes, memory in checkpoints))
+
+if __name__ == "__main__":
+    main()
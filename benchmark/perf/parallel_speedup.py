@@ -0,0 +1,59 @@
+from functools import partial
+
+from mcts import AsyncTreeParallelMonteCarloTreeSearch, MonteCarloTreeSearch, RootParallelMonteCarloTreeSearch, TreeParallelMonteCarloTreeSearch
+from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.other import Solutions
+from mcts.sample import GraphColorDsaturState
+
+from config import all_graphs, n_proc, seed
+from src.utils import read_graph
+
+# Instances and time budget (in seconds) used to compare the parallel engines with a single process
+instances = ["myciel5.col", "queen8_8.col", "DSJC125.5.col.b", "le450_15a.col"]
+max_time = 10
+
+def make_search(graph: list[set[int]], seed: int) -> tuple[MonteCarloTreeSearch, UctTreeNode]:
+    solutions = Solutions()
+    search = MonteCarloTreeSearch(UctTreePolicy(seed=seed), UctDefaultPolicy(solutions=solutions, seed=seed), solutions)
+    return search, UctTreeNode(GraphColorDsaturState(graph))
+
+def make_default_policy(seed: int, solutions: Solutions) -> UctDefaultPolicy:
+    return UctDefaultPolicy(solutions=solutions, seed=seed)
+
+def colors(best_reward: float | None) -> int:
+    # -1 if no coloring was found, as the benchmark runner does
+    return int(-best_reward) if best_reward is not None else -1
+
+def main():
+    known_best = {path: best_sol for (path, _, best_sol, _) in all_graphs}
+
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+        print(f"{path} (best known {known_best[path]}, {max_time}s, {n_proc} processes):")
+
+        search, root = make_search(graph, seed)
+        single = search.run(root, max_time=max_time)
+        single_rate = single.n_iter / single.elapsed
+        print(f"  Single process: {single_rate:.1f} it/s, {colors(single.best_reward)} colors")
+
+        # Synced on time only, the rounds are not limited in iterations
+        root_parallel = RootParallelMonteCarloTreeSearch(partial(make_search, graph), n_proc, sync_iter=0, sync_time=1.0, seed=seed)
+        res = root_parallel.run(max_time=max_time)
+
+        if 0 in res.worker_iters:
+            raise RuntimeError(f"A root parallel worker did not iterate: {res.worker_iters}")
+
+        print(f"  Root parallel: {res.n_iter / res.elapsed:.1f} it/s, {colors(res.best_reward)} colors, speedup {res.n_iter / res.elapsed / single_rate:.2f}")
+
+        solutions = Solutions()
+        tree_parallel = TreeParallelMonteCarloTreeSearch(UctTreePolicy(seed=seed), make_default_policy, n_proc, solutions, seed)
+        tree_res = tree_parallel.run(UctTreeNode(GraphColorDsaturState(graph)), max_time=max_time)
+        print(f"  Tree parallel: {tree_res.n_iter / tree_res.elapsed:.1f} it/s, {colors(tree_res.best_reward)} colors, speedup {tree_res.n_iter / tree_res.elapsed / single_rate:.2f}")
+
+        solutions = Solutions()
+        async_parallel = AsyncTreeParallelMonteCarloTreeSearch(UctTreePolicy(seed=seed), make_default_policy, n_proc, solutions, seed)
+        async_res = async_parallel.run(UctTreeNode(GraphColorDsaturState(graph)), max_time=max_time)
+        print(f"  Async tree parallel: {async_res.n_iter / async_res.elapsed:.1f} it/s, {colors(async_res.best_reward)} colors, speedup {async_res.n_iter / async_res.elapsed / single_rate:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from time import perf_counter
+
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.rave import RaveDefaultPolicy, RaveTreeNode, RaveTreePolicy
+from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.other import Solutions
+from mcts.sample import GraphColorSeqState
+
+from src.utils import read_graph
+
+# Colors found by UCT and by RAVE with the same number of iterations, over a few seeds
+instances = ["queen8_8.col", "DSJC125.5.col.b"]
+n_iter = 1000
+seeds = [1, 2, 3, 4, 5]
+
+
+def run(tree_policy, default_policy, node, graph, solutions: Solutions) -> int:
+    # Returns -1 if no coloring was found, as the benchmark runner does
+    summary = MonteCarloTreeSearch(tree_policy, default_policy, solutions).run(node(GraphColorSeqState(graph)), n_iter)
+    return int(-summary.best_reward) if summary.best_reward is not None else -1
+
+def main():
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+
+        print(f"{path} ({n_iter} iterations):")
+
+        for name, tree_policy, default_policy, node in (
+                ("UCT", UctTreePolicy, UctDefaultPolicy, UctTreeNode),
+                ("RAVE", RaveTreePolicy, RaveDefaultPolicy, RaveTreeNode)):
+            t0 = perf_counter()
+            colors = []
+
+            for seed in seeds:
+                solutions = Solutions()
+                colors.append(run(tree_policy(seed=seed), default_policy(solutions=solutions, seed=seed), node, graph, solutions))
+
+            elapsed = (perf_counter() - t0) / len(seeds)
+            print(f"  {name}: {sum(colors) / len(colors):.1f} colors on average {colors}, {elapsed:.1f} s per run")
+
+if __name__ == "__main__":
+    main()
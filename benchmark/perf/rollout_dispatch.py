@@ -0,0 +1,55 @@
+import pickle
+from random import Random
+from time import perf_counter
+
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.sample import GraphColorSeqState
+
+from config import n_proc, seed
+from perf.tree_store import RandomRewardPolicy
+from src.utils import read_graph
+
+# Instance, tree sizes at which the dispatch is measured and number of dispatches per measurement
+instance = "DSJC250.5.col.b"
+tree_sizes = [100, 1000, 5000, 20000]
+n_dispatch = 20
+
+def time_per_call(fun, n: int) -> float:
+    t0 = perf_counter()
+
+    for _ in range(n):
+        fun()
+
+    return (perf_counter() - t0) / n
+
+def main():
+    _, graph = read_graph(f"instances/{instance}")
+    random_gen = Random(seed)
+
+    tree_policy = UctTreePolicy(seed=seed)
+    search = MonteCarloTreeSearch(tree_policy, RandomRewardPolicy(seed))
+    root = UctTreeNode(GraphColorSeqState(graph))
+    default_policy = UctDefaultPolicy(n_sims=n_proc, n_threads=n_proc, seed=seed)
+
+    print(f"{instance}, {n_proc} rollouts per dispatch:")
+
+    for size in tree_sizes:
+        search.run(root, size - root.count())
+        leaf = tree_policy.tree_policy(root)
+
+        node_task = (leaf, None, random_gen)
+        state_task = (leaf.state.encode(), random_gen.getrandbits(64))
+        node_bytes = len(pickle.dumps(node_task))
+        state_bytes = len(pickle.dumps(state_task))
+        node_time = time_per_call(lambda: pickle.dumps(node_task), n_dispatch)
+        state_time = time_per_call(lambda: pickle.dumps(state_task), n_dispatch)
+        dispatch_time = time_per_call(lambda: default_policy.simulate(leaf), n_dispatch)
+
+        print(f"  {root.count()} nodes: node task {node_bytes} bytes ({node_time * 1e3:.2f} ms to pickle), "
+            f"state task {state_bytes} bytes ({state_time * 1e3:.3f} ms to pickle), {dispatch_time * 1e3:.1f} ms per dispatch")
+
+    default_policy.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from random import Random
+from time import perf_counter
+
+from mcts.interfaces import State
+from mcts.sample import GraphColorBitsetDsaturState, GraphColorDsaturState, GraphColorSeqState, TicTacToeState
+
+from src.utils import read_graph
+
+# Instances and number of rollouts used to compare the copy based play path with the in-place apply path
+instances = ["queen8_8.col", "DSJC125.5.col.b", "DSJC250.5.col.b"]
+n_rollouts = 200
+seed = 1234
+
+
+def rollout_play(state: State, random_gen: Random) -> State:
+    while not state.is_terminal():
+        state = state.play(random_gen.choice(list(state.actions_default())))
+
+    return state
+
+def rollout_apply(state: State, random_gen: Random) -> State:
+    state = state.clone_for_rollout()
+
+    while not state.is_terminal():
+        state.apply(random_gen.choice(list(state.actions_default())))
+
+    return state
+
+def measure(state: State, rollout, n: int) -> tuple[float, float]:
+    # Returns the rollouts per second and the mean reward, both paths use the same seed so the
+    # rewards must match
+    random_gen = Random(seed)
+    total = 0.0
+
+    t0 = perf_counter()
+
+    for _ in range(n):
+        total += rollout(state, random_gen).get_reward()
+
+    return n / (perf_counter() - t0), total / n
+
+def compare(name: str, state: State, n: int) -> None:
+    play_speed, play_reward = measure(state, rollout_play, n)
+    apply_speed, apply_reward = measure(state, rollout_apply, n)
+    assert play_reward == apply_reward
+
+    print(f"  {name}: play {play_speed:.1f} rollouts/s, apply {apply_speed:.1f} rollouts/s ({apply_speed / play_speed:.2f}x)")
+
+def main():
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+
+        print(f"{path} ({n_rollouts} rollouts):")
+
+        compare("GraphColorSeqState", GraphColorSeqState(graph), n_rollouts)
+        compare("GraphColorDsaturState", GraphColorDsaturState(graph), n_rollouts)
+        compare("GraphColorBitsetDsaturState", GraphColorBitsetDsaturState(graph), n_rollouts)
+
+    print("Tic tac toe (10000 rollouts):")
+    compare("TicTacToeState", TicTacToeState(), 10000)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.opt import OptTreeNode, OptTreePolicy
+from mcts.algorithms.uct import UctTreeNode, UctTreePolicy
+from mcts.algorithms.vector import OptVectorTreeNode, OptVectorTreePolicy, UctVectorTreeNode, UctVectorTreePolicy
+from mcts.other import SearchProfiler
+from mcts.sample import GraphColorSeqState
+
+from perf.tree_store import RandomRewardPolicy
+from src.utils import read_graph
+
+# Instances and number of iterations used to compare the selection time of the object tree policies with
+# the vectorised ones, the rollouts are replaced by random rewards
+instances = ["queen8_8.col", "DSJC250.9.col.b", "latin_square_10.col"]
+n_iter = 5000
+seed = 1234
+
+
+def selection_time(tree_policy, root) -> tuple[float, list[int]]:
+    # Returns the selection time per iteration in microseconds and the visits of the root children
+    profiler = SearchProfiler()
+    MonteCarloTreeSearch(tree_policy, RandomRewardPolicy(seed)).run(root, n_iter, profiler=profiler)
+    children = [child[1] if isinstance(child, tuple) else child for child in root.children]
+    return 1e6 * profiler.profile.selection.time / n_iter, [child.N for child in children]
+
+def main():
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+
+        print(f"{path} ({n_iter} iterations):")
+
+        for name, (policy, node), (vector_policy, vector_node) in (
+                ("UCT", (UctTreePolicy, UctTreeNode), (UctVectorTreePolicy, UctVectorTreeNode)),
+                ("OPT", (OptTreePolicy, OptTreeNode), (OptVectorTreePolicy, OptVectorTreeNode))):
+            time, visits = selection_time(policy(seed=seed), node(GraphColorSeqState(graph)))
+            vector_time, vector_visits = selection_time(vector_policy(seed=seed), vector_node(GraphColorSeqState(graph)))
+            assert visits == vector_visits
+
+            print(f"  {name}: {time:.1f} us/selection, vectorised {vector_time:.1f} us/selection ({time / vector_time:.2f}x)")
+
+if __name__ == "__main__":
+    main()
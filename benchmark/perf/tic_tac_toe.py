@@ -0,0 +1,44 @@
+from time import perf_counter
+
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.sample import TicTacToeBitboardState, TicTacToeState
+
+from perf.rollouts import measure, rollout_apply, rollout_play
+
+# Rollouts per second of the list board against the bitboard, and iterations per second of a full UCT
+# search on the bitboard, where most of the time is spent in the engine rather than in the game
+n_rollouts = 50000
+n_iter = 20000
+seed = 1234
+
+
+def search_speed(root) -> tuple[float, list[int]]:
+    # Returns the iterations per second and the visits of the root children
+    search = MonteCarloTreeSearch(UctTreePolicy(seed=seed), UctDefaultPolicy(seed=seed))
+    t0 = perf_counter()
+    search.run(root, n_iter)
+    return n_iter / (perf_counter() - t0), [child.N for child in root.children]
+
+def main():
+    print(f"Rollouts ({n_rollouts} rollouts):")
+
+    for name, rollout in (("play", rollout_play), ("apply", rollout_apply)):
+        speed, reward = measure(TicTacToeState(), rollout, n_rollouts)
+        bitboard_speed, bitboard_reward = measure(TicTacToeBitboardState(), rollout, n_rollouts)
+        assert reward == bitboard_reward
+
+        print(f"  {name}: TicTacToeState {speed:.0f} rollouts/s, TicTacToeBitboardState {bitboard_speed:.0f} rollouts/s "
+            f"({bitboard_speed / speed:.2f}x)")
+
+    print(f"UCT search ({n_iter} iterations):")
+
+    speed, visits = search_speed(UctTreeNode(TicTacToeState()))
+    bitboard_speed, bitboard_visits = search_speed(UctTreeNode(TicTacToeBitboardState()))
+    assert visits == bitboard_visits
+
+    print(f"  TicTacToeState {speed:.0f} iterations/s, TicTacToeBitboardState {bitboard_speed:.0f} iterations/s "
+        f"({bitboard_speed / speed:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+from time import perf_counter
+
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.sample import GraphColorDsaturState, TicTacToeState
+
+from src.utils import read_graph
+
+# Sequential decisions with a fixed number of iterations per decision, either continuing in the subtree
+# of the committed action (MonteCarloTreeSearch.advance) or searching from a new root every time
+instances = ["queen6_6.col", "myciel5.col"]
+n_iter = 500
+seed = 1234
+
+
+def most_visited_action(root: UctTreeNode):
+    child = max(root.children, key=lambda child: child.N)
+    return next(action for action in root.state.actions_tree() if root.state.play(action) == child.state)
+
+def play(state, reuse: bool) -> tuple[object, float, int]:
+    # Returns the final state, the time and the visits inherited from the previous decisions
+    search = MonteCarloTreeSearch(UctTreePolicy(seed=seed), UctDefaultPolicy(seed=seed))
+    root = UctTreeNode(state)
+    inherited = 0
+    t0 = perf_counter()
+
+    while not root.state.is_terminal():
+        search.run(root, n_iter)
+        action = most_visited_action(root)
+
+        if reuse:
+            root = search.advance(root, action)
+            inherited += root.N
+        else:
+            root = UctTreeNode(root.state.play(action))
+
+    return root.state, perf_counter() - t0, inherited
+
+def main():
+    cases = [("TicTacToeState", TicTacToeState())]
+
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+        cases.append((path, GraphColorDsaturState(graph)))
+
+    for name, state in cases:
+        print(f"{name} ({n_iter} iterations per decision):")
+
+        for reuse in (False, True):
+            final_state, time, inherited = play(state, reuse)
+            result = f"{final_state.n_colors} colors" if hasattr(final_state, "n_colors") else f"reward {final_state.get_reward()}"
+
+            print(f"  {'reuse' if reuse else 'fresh'}: {time:.2f} s, {result}, {inherited} visits inherited")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from random import Random
+from time import perf_counter
+import tracemalloc
+
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.arena import ArenaUctTreePolicy, TreeArena
+from mcts.algorithms.uct import UctTreeNode, UctTreePolicy
+from mcts.interfaces import DefaultPolicy
+from mcts.sample import GraphColorSeqState
+
+from src.utils import read_graph
+
+# Instances and number of iterations used to compare the object tree with the TreeArena
+instances = ["queen8_8.col", "DSJC125.5.col.b", "DSJC250.5.col.b"]
+n_iter = 10000
+seed = 1234
+
+
+class RandomRewardPolicy(DefaultPolicy[object, tuple[float, int]]):
+    # Replaces the rollouts so that the measurements are dominated by the tree operations
+    def __init__(self, seed: int) -> None:
+        self.random_gen = Random(seed)
+
+    def simulate(self, node: object) -> tuple[float, int]:
+        return (-self.random_gen.random(), 1)
+
+def measure(build) -> tuple[int, float]:
+    # Returns the nodes per second and the bytes per node, the memory is measured separately as
+    # tracemalloc slows down the allocations
+    t0 = perf_counter()
+    _, n_nodes = build()
+    elapsed = perf_counter() - t0
+
+    tracemalloc.start()
+    tree, n_nodes = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+
+    return n_nodes / elapsed, allocated / n_nodes
+
+def build_object_tree(graph: list[set[int]]) -> tuple[object, int]:
+    root = UctTreeNode(GraphColorSeqState(graph))
+    MonteCarloTreeSearch(UctTreePolicy(seed=seed), RandomRewardPolicy(seed)).run(root, n_iter)
+    return root, root.count()
+
+def build_arena_tree(graph: list[set[int]]) -> tuple[object, int]:
+    arena = TreeArena()
+    root = arena.add_root(GraphColorSeqState(graph))
+    MonteCarloTreeSearch(ArenaUctTreePolicy(arena, seed=seed), RandomRewardPolicy(seed)).run(root, n_iter)
+    return arena, arena.size
+
+def main():
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+
+        print(f"{path} ({n_iter} iterations):")
+
+        for name, build in (("Object tree", build_object_tree), ("Tree arena", build_arena_tree)):
+            nodes_per_sec, bytes_per_node = measure(lambda: build(graph))
+            print(f"  {name}: {nodes_per_sec:.0f} nodes/s, {bytes_per_node:.0f} bytes/node")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from mcts import MonteCarloTreeSearch
+from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
+from mcts.other import SearchProfiler, Solutions
+from mcts.sample import GraphColorBitsetDsaturState
+
+from src.utils import read_graph
+
+# Depth reached within the iteration budget on sparse instances, where most colors stay available to each
+# vertex, expanding every child before selecting against progressive widening with and without ordered expansion
+instances = ["DSJC250.1.col.b", "le450_25a.col"]
+n_iter = 1000
+seed = 1234
+settings = [
+    ("full expansion", {}),
+    ("widening 0.5", {"widening": 0.5}),
+    ("widening 0.5, ordered", {"widening": 0.5, "ordered_expansion": True})
+]
+
+
+def main():
+    for path in instances:
+        _, graph = read_graph(f"instances/{path}")
+
+        print(f"{path} ({n_iter} iterations):")
+
+        for name, kwargs in settings:
+            solutions = Solutions()
+            profiler = SearchProfiler()
+            search = MonteCarloTreeSearch(UctTreePolicy(seed=seed, **kwargs), UctDefaultPolicy(solutions=solutions, seed=seed), solutions)
+            summary = search.run(UctTreeNode(GraphColorBitsetDsaturState(graph)), n_iter, profiler=profiler)
+
+            depths = profiler.profile.leaf_depths
+            mean_depth = sum(depth * count for depth, count in enumerate(depths)) / n_iter
+
+            print(f"  {name}: depth {len(profiler.profile.tree_depths) - 1} (mean leaf depth {mean_depth:.1f}), "
+                f"{-summary.best_reward if summary.best_reward is not None else -1:.0f} colors, {summary.elapsed:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 from src.algorithms.heuristic_algorithms import dsatur
+from src.algorithms.heuristic_algorithms import dsatur_fast
 from src.algorithms.heuristic_algorithms import largest_first
 from src.algorithms.heuristic_algorithms import recursive_largest_fit
+from src.algorithms.heuristic_algorithms import recursive_largest_fit_fast
 from src.algorithms.heuristic_algorithms import seq_assignment
 
 __all__ = [
     "dsatur",
+    "dsatur_fast",
     "largest_first",
     "recursive_largest_fit",
+    "recursive_largest_fit_fast",
     "seq_assignment"
 ]
\ No newline at end of file
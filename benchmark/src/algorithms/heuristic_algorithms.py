@@ -1,5 +1,7 @@
 from typing import Iterable
 
+import numpy as np
+
 
 LOG = False
 
@@ -106,6 +108,63 @@ def recursive_largest_fit(nodes: Iterable[int], adj: list[set[int]]) -> tuple[li
 
     return color, K
 
+def recursive_largest_fit_fast(nodes: Iterable[int], adj: list[set[int]]) -> tuple[list[int], int]:
+    """Recursive largest fit with bitset adjacencies.
+
+    Same coloring as recursive_largest_fit: the vertex sets are updated by
+    the same operations, so ties are broken in the same order. The uncolored
+    degrees are kept up to date and the uncolorable adjacencies of a
+    candidate are counted on bitsets instead of intersecting sets.
+    """
+    K = 0               # current color class
+    V = set(nodes)      # yet uncolored vertices
+    color = [-1 for i in nodes]       # solution vector
+    unc_adj = [set(adj[i]) for i in nodes]      # currently uncolored adjacencies
+    unc_deg = [len(unc_adj[i]) for i in nodes]  # len(unc_adj[i])
+    adj_bits = [sum(1 << j for j in adj[i]) for i in nodes]     # adjacencies as bitsets
+
+    while V:
+        # phase 1: color vertex with max number of connections to uncolored vertices
+        # (max keeps the first maximal vertex in the iteration order of V, like the scan)
+        u_star = max(V, key=unc_deg.__getitem__)
+
+        V.remove(u_star)
+        color[u_star] = K
+        for i in unc_adj[u_star]:
+            if u_star != i:
+                unc_adj[i].remove(u_star)
+                unc_deg[i] -= 1
+        U = set(unc_adj[u_star]) # adj.vertices are uncolorable with current color
+        V -= unc_adj[u_star]     # remove them from V
+
+        # U as a bitset, its vertices stay uncolored so unc_adj[i] & U == adj[i] & U
+        u_bits = 0
+        for i in U:
+            u_bits |= 1 << i
+
+        # phase 2: check for other vertices that can have the same color (K)
+        while V:
+            # determine colorable vertex with maximum uncolorable adjacencies:
+            u_star = max(V, key=lambda i: (adj_bits[i] & u_bits).bit_count())
+            V.remove(u_star)
+            color[u_star] = K
+            for i in unc_adj[u_star]:
+                if u_star != i:
+                    unc_adj[i].remove(u_star)
+                    unc_deg[i] -= 1
+
+            # remove from V all adjacencies not colorable with K
+            not_colored = unc_adj[u_star] & V
+            V -= not_colored    # remove uncolored adjacencies from V
+            U |= not_colored    # add them to U
+            for i in not_colored:
+                u_bits |= 1 << i
+
+        V = U   # update list of yet uncolored vertices
+        K += 1  # switch to next color class
+
+    return color, K
+
 def dsatur(nodes: Iterable[int], adj: list[set[int]]) -> tuple[list[int], int]:
     """Dsatur algorithm (Brelaz, 1979).
    
@@ -157,4 +216,41 @@ def dsatur(nodes: Iterable[int], adj: list[set[int]]) -> tuple[list[int], int]:
 
         U.remove(u_star)
 
+    return color, K
+
+def dsatur_fast(nodes: Iterable[int], adj: list[set[int]]) -> tuple[list[int], int]:
+    """Dsatur algorithm on NumPy arrays.
+
+    Same coloring as dsatur: the vertex to color is the argmax of
+    (n + 1) * saturation + uncolored degree, whose first maximum is the
+    vertex found by the scan of dsatur. The scores and the colors seen by
+    each vertex are updated for all the neighbors of a vertex at once.
+    """
+    color: list[int] = [-1 for i in nodes]       # solution vector
+    n = len(color)
+    neighbors = [np.fromiter(adj[i], dtype=np.intp, count=len(adj[i])) for i in nodes]
+    width = max((len(adj[i]) for i in nodes), default=0) + 1    # no more colors than the maximum degree + 1
+    seen = np.zeros((width, n), dtype=bool)     # seen[k, i]: a neighbor of i has color k
+    score = np.array([len(adj[i]) for i in nodes], dtype=np.int64)     # colored vertices have a negative score
+    colored = np.iinfo(np.int64).min // 2
+
+    K = 0
+    for _ in range(n):
+        # choose vertex with maximum saturation degree, ties broken by degree on uncolored nodes
+        u_star = int(np.argmax(score))
+
+        # find a color for node 'u_star'
+        free = np.flatnonzero(~seen[:K, u_star])
+        if len(free) > 0:
+            k_star = int(free[0])
+        else:   # must use a new color
+            k_star = K
+            K += 1
+        color[u_star] = k_star
+        score[u_star] = colored
+
+        adj_u = neighbors[u_star]
+        score[adj_u] += (~seen[k_star, adj_u]) * (n + 1) - 1
+        seen[k_star, adj_u] = True
+
     return color, K
\ No newline at end of file
@@ -1,17 +1,24 @@
 from typing import Any, Iterable, cast
 from mcts.algorithms.opt import OptDefaultPolicy, OptTreeNode, OptTreePolicy
+from mcts.algorithms.rave import RaveDefaultPolicy, RaveTreeNode, RaveTreePolicy
 from mcts.algorithms.uct import UctDefaultPolicy, UctTreeNode, UctTreePolicy
 from mcts import MonteCarloTreeSearch
 from mcts.interfaces.state import State
+from mcts.other.node_budget import NodeBudget
+from mcts.other.search_profiler import SearchProfiler
 from mcts.other.solutions import Solutions
+from mcts.sample.graph_color_bitset_dsatur_state import GraphColorBitsetDsaturState
 from mcts.sample.graph_color_dsatur_state import GraphColorDsaturState
 from mcts.sample.graph_color_seq_state import GraphColorSeqState
+from mcts.sample.graph_bounds import greedy_clique
 
 from src.types.types import MctsConfig, StateRep
 
-def state_from_kind(kind: StateRep, graph: list[set[int]]) -> GraphColorDsaturState | GraphColorSeqState:
+def state_from_kind(kind: StateRep, graph: list[set[int]]) -> GraphColorDsaturState | GraphColorBitsetDsaturState | GraphColorSeqState:
     if kind == StateRep.DSATUR:
         return GraphColorDsaturState(graph)
+    elif kind == StateRep.BITSET_DSATUR:
+        return GraphColorBitsetDsaturState(graph)
     else:
         return GraphColorSeqState(graph)
 
@@ -38,33 +45,58 @@ def default_policy_weights(state: GraphColorDsaturState, actions: list[tuple[int
 def tree_policy_heuristic(state: GraphColorDsaturState, actions: list[tuple[int, int]]) -> float:
     return 1.0
 
-def run_uct_mcts(config: MctsConfig, graph: list[set[int]]) -> tuple[list[int], int]:
+def run_uct_mcts(config: MctsConfig, graph: list[set[int]], profiler: SearchProfiler | None = None) -> tuple[list[int], int]:
     solutions = Solutions()
-    tree_policy = UctTreePolicy(seed=config.seed)
-    default_policy = UctDefaultPolicy(heuristic=default_policy_weights, solutions=solutions, seed=config.seed)
+    budget = NodeBudget(config.max_nodes) if config.max_nodes >= 0 else None
+    tree_policy = UctTreePolicy(seed=config.seed, solver=config.solver, budget=budget, widening=config.widening, c_w=config.c_w,
+        ordered_expansion=config.ordered_expansion)
+    default_policy = UctDefaultPolicy(config.n_simulations, heuristic=default_policy_weights, solutions=solutions, seed=config.seed,
+        evaluation=config.leaf_evaluation, top_k=config.top_k)
 
     state = state_from_kind(config.state_rep, graph)
     solver = mcts_from_config(config)
     root = node_from_config(config, state)
 
-    solver = MonteCarloTreeSearch(tree_policy, default_policy)
+    solver = MonteCarloTreeSearch(tree_policy, default_policy, solutions)
 
-    solver.run(root, config.max_iter)
+    solver.run(root, config.max_iter, config.max_time, profiler=profiler, batch_size=config.batch_size)
 
     best_solution = solutions.best_solution
 
     return (best_solution[0].coloring if best_solution != None else [], cast(int, -best_solution[1] if best_solution is not None else -1))
 
-def run_opt_mcts(seed, n_iter: int, graph: list[set[int]]) -> tuple[list[int], int]:
-    tree_policy = OptTreePolicy(seed=seed)
-    default_policy = OptDefaultPolicy(seed=seed)
+def run_rave_mcts(config: MctsConfig, graph: list[set[int]], profiler: SearchProfiler | None = None) -> tuple[list[int], int]:
+    solutions = Solutions()
+    budget = NodeBudget(config.max_nodes) if config.max_nodes >= 0 else None
+    tree_policy = RaveTreePolicy(seed=config.seed, solver=config.solver, budget=budget, widening=config.widening, c_w=config.c_w,
+        ordered_expansion=config.ordered_expansion, ref=config.rave_ref, rave_bias=config.rave_bias)
+    default_policy = RaveDefaultPolicy(heuristic=default_policy_weights, solutions=solutions, seed=config.seed)
+
+    root = RaveTreeNode(state_from_kind(config.state_rep, graph))
+    solver = MonteCarloTreeSearch(tree_policy, default_policy, solutions)
+
+    solver.run(root, config.max_iter, config.max_time, profiler=profiler, batch_size=config.batch_size)
+
+    best_solution = solutions.best_solution
+
+    return (best_solution[0].coloring if best_solution is not None else [], cast(int, -best_solution[1] if best_solution is not None else -1))
+
+def run_opt_mcts(config: MctsConfig, graph: list[set[int]], profiler: SearchProfiler | None = None) -> tuple[list[int], int]:
+    budget = NodeBudget(config.max_nodes) if config.max_nodes >= 0 else None
+    incumbent = Solutions() if config.prune else None
+
+    # With pruning the rollouts feed the incumbent, subtrees that cannot use fewer colors are skipped and
+    # the search stops once the root is pruned, i.e. when the incumbent is proven optimal (OptTreePolicy.is_solved)
+    tree_policy = OptTreePolicy(seed=config.seed, incumbent=incumbent, reward_bound=-len(greedy_clique(graph)) if config.prune else None,
+        solver=config.solver, budget=budget, widening=config.widening, c_w=config.c_w, ordered_expansion=config.ordered_expansion)
+    default_policy = OptDefaultPolicy(seed=config.seed, solutions=incumbent, prune=config.prune)
 
     state = GraphColorSeqState(graph)
     root = OptTreeNode(state)
 
     solver = MonteCarloTreeSearch(tree_policy, default_policy)
 
-    solver.run(root, n_iter)
+    solver.run(root, config.max_iter, config.max_time, profiler=profiler, batch_size=config.batch_size)
 
     best_solution = default_policy.best_solution
 
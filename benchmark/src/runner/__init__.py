@@ -0,0 +1,15 @@
+from src.runner.benchmark_runner import check_coloring
+from src.runner.benchmark_runner import load_graph
+from src.runner.benchmark_runner import make_jobs
+from src.runner.benchmark_runner import run_jobs
+from src.runner.benchmark_runner import Solver
+from src.runner.results_store import ResultsStore
+
+__all__ = [
+    "check_coloring",
+    "load_graph",
+    "make_jobs",
+    "ResultsStore",
+    "run_jobs",
+    "Solver"
+]
\ No newline at end of file
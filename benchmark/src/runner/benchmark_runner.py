@@ -0,0 +1,105 @@
+from collections.abc import Iterable
+from dataclasses import replace
+from multiprocessing import Pool
+from time import time
+
+from mcts.other.search_profiler import SearchProfiler
+
+from src.algorithms.mcts_setups import run_opt_mcts, run_rave_mcts, run_uct_mcts
+from src.runner.results_store import ResultsStore
+from src.types import BenchmarkJob, BenchmarkResult, GcpSolver, MctsAlg, MctsConfig
+from src.utils import GraphStore, GraphStoreHandle, read_graph
+
+type Solver = GcpSolver | MctsConfig # Heuristics must be module level functions so that they can be sent to the workers
+
+# Instances parsed once by the main process, the pool workers attach to it instead of reading them again
+graph_store: GraphStore | None = None
+_solvers: dict[str, Solver] = {}
+
+def attach_graph_store(handle: GraphStoreHandle) -> None:
+    global graph_store
+    graph_store = GraphStore.attach(handle)
+
+def load_graph(path: str) -> tuple[range, list[set[int]]]:
+    if graph_store is not None and path in graph_store:
+        return graph_store.graph(path)
+
+    return read_graph(f"instances/{path}")
+
+def check_coloring(edges: list[set[int]], coloring: list[int], complete: bool = True) -> bool:
+    if complete and len(coloring) != len(edges):
+        return False
+
+    for index, color in enumerate(coloring):
+        for neighbor in edges[index]:
+            if neighbor < len(coloring) and coloring[neighbor] == color:
+                return False
+
+    return True
+
+def _init_runner_worker(handle: GraphStoreHandle, solvers: dict[str, Solver]) -> None:
+    global _solvers
+    attach_graph_store(handle)
+    _solvers = solvers
+
+def run_job(job: BenchmarkJob) -> tuple[BenchmarkJob, BenchmarkResult]:
+    solver = _solvers[job.solver]
+    nodes, adj = load_graph(job.graph)
+
+    profiler = SearchProfiler() if isinstance(solver, MctsConfig) and solver.profile else None
+    t0 = time()
+
+    if isinstance(solver, MctsConfig):
+        config = replace(solver, seed=job.seed)
+
+        if config.mcts_kind == MctsAlg.OPT:
+            colors, _ = run_opt_mcts(config, adj, profiler)
+        elif config.mcts_kind == MctsAlg.RAVE:
+            colors, _ = run_rave_mcts(config, adj, profiler)
+        else:
+            colors, _ = run_uct_mcts(config, adj, profiler)
+    else:
+        colors, _ = solver(nodes, adj)
+
+    total_time = time() - t0
+    n_iter = profiler.profile.n_iter if profiler is not None else -1
+    report = profiler.report() if profiler is not None else None
+
+    return job, BenchmarkResult(check_coloring(adj, colors), colors, total_time, n_iter, job.V, job.E, job.best_sol, report)
+
+def make_jobs(solvers: dict[str, Solver], graphs: Iterable[tuple[str, tuple[int, int], int, str]], seeds: list[int]) -> list[BenchmarkJob]:
+    # MCTS configurations run once per seed, the heuristics once. The largest instances come first so
+    # that they do not end up running alone at the end of the sweep
+    jobs = []
+
+    for name, solver in solvers.items():
+        for (path, (n, e), best_sol, _) in graphs:
+            config = solver.key if isinstance(solver, MctsConfig) else ""
+
+            for seed in (seeds if isinstance(solver, MctsConfig) else [None]):
+                jobs.append(BenchmarkJob(name, path, seed, n, e, best_sol, config))
+
+    jobs.sort(key=lambda job: (job.E, job.V), reverse=True)
+
+    return jobs
+
+def run_jobs(jobs: list[BenchmarkJob], solvers: dict[str, Solver], store: ResultsStore, n_proc: int, verbose: bool = True) -> list[tuple[BenchmarkJob, BenchmarkResult]]:
+    # Skips the jobs already in the store and appends each result as soon as its job finishes, the
+    # results of all the given jobs are returned
+    completed = store.completed()
+    pending = [job for job in jobs if job.key not in completed]
+
+    if verbose:
+        print(f"{len(jobs) - len(pending)} of {len(jobs)} jobs already completed")
+
+    if pending:
+        with GraphStore.create(list(dict.fromkeys(job.graph for job in pending))) as shared_graphs:
+            with Pool(n_proc, _init_runner_worker, (shared_graphs.handle, solvers)) as pool:
+                for index, (job, result) in enumerate(pool.imap_unordered(run_job, pending, chunksize=1)):
+                    store.append(job, result)
+
+                    if verbose:
+                        print(f"[{index + 1}/{len(pending)}] {job.solver} on {job.graph} (seed {job.seed}): {result.color_count} colors in {result.time:.2f}s")
+
+    keys = {job.key for job in jobs}
+    return [(job, result) for job, result in store.load() if job.key in keys]
@@ -0,0 +1,56 @@
+import json
+import os
+from dataclasses import asdict
+
+from src.types import BenchmarkJob, BenchmarkResult
+
+
+class ResultsStore:
+    """Append-only JSONL file with one line per finished job.
+    Every line is flushed to disk as soon as it is written, so a run that is
+    interrupted only loses the jobs that were still running. A partially
+    written last line is ignored when the file is read back.
+    """
+    filename: str
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+
+        if os.path.dirname(filename):
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        # Terminates an interrupted last line so that it does not swallow the next one
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            with open(filename, "rb+") as f:
+                f.seek(-1, os.SEEK_END)
+
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def load(self) -> list[tuple[BenchmarkJob, BenchmarkResult]]:
+        results: list[tuple[BenchmarkJob, BenchmarkResult]] = []
+
+        if not os.path.exists(self.filename):
+            return results
+
+        with open(self.filename) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # Interrupted write
+
+                results.append((BenchmarkJob(**record["job"]), BenchmarkResult(**record["result"])))
+
+        return results
+
+    def completed(self) -> set[str]:
+        return {job.key for job, _ in self.load()}
+
+    def append(self, job: BenchmarkJob, result: BenchmarkResult) -> None:
+        line = json.dumps({"job": asdict(job), "result": asdict(result)})
+
+        with open(self.filename, "a") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
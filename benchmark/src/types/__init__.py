@@ -1 +1 @@
-from src.types.types import BenchmarkResult, GcpSolver, MctsAlg, MctsConfig, StateRep
\ No newline at end of file
+from src.types.types import BenchmarkJob, BenchmarkResult, GcpSolver, MctsAlg, MctsConfig, StateRep
\ No newline at end of file
@@ -1,18 +1,25 @@
+import hashlib
+import json
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
 from typing import Any, Iterable
 
+from mcts.algorithms.uct import LeafEvaluation
 from mcts.interfaces import State
 from enum import Enum
 type GcpSolver = Callable[[Iterable[int], list[set[int]]], tuple[list[int], int]]
 
+CONFIG_VERSION = 2 # Part of MctsConfig.key, the UCT results of version 1 ran a single rollout per leaf whatever n_simulations
+
 class MctsAlg(Enum):
     UCT = 0
     OPT = 1
+    RAVE = 2
 
 class StateRep(Enum):
     SEQ = 0
     DSATUR = 1
+    BITSET_DSATUR = 2
 
 @dataclass
 class MctsConfig[S: State[Any, float, float]]:
@@ -35,6 +42,43 @@ class MctsConfig[S: State[Any, float, float]]:
 
     # Other
     seed: int | float | str | bytes | bytearray | None
+    profile: bool = False # Attaches a SearchProfiler report to the results
+    prune: bool = False # Branch and bound on the incumbent coloring, only used by OPT
+    solver: bool = False # Skips solved subtrees and stops once the root is solved
+    max_nodes: int = -1 # Node budget of the tree, the least visited subtrees are recycled past it
+    widening: float = -1 # Progressive widening exponent, at most max(1, floor(c_w * N^widening)) children per node, -1 to disable
+    c_w: float = 1.0
+    ordered_expansion: bool = False # Expands the children by decreasing State.action_priority
+    rave_ref: int = 50 # Visits from which a node keeps AMAF statistics, only used by RAVE
+    rave_bias: float = 1e-3 # Decay of the weight of the AMAF values, only used by RAVE
+    leaf_evaluation: LeafEvaluation = LeafEvaluation.MEAN # Aggregation of the n_simulations rollouts of a leaf, only used by UCT
+    top_k: int = 1 # Rollouts kept by LeafEvaluation.TOP_K
+    batch_size: int = 1 # Leaves selected with virtual loss and simulated together at each step
+
+    @property
+    def key(self) -> str:
+        # Stable hash of every field but the seed and of CONFIG_VERSION, functions are identified by their qualified name
+        def encode(value: Any) -> Any:
+            return value.name if isinstance(value, Enum) else f"{value.__module__}.{getattr(value, "__qualname__", type(value).__qualname__)}"
+
+        fields = json.dumps({**asdict(replace(self, seed=None)), "version": CONFIG_VERSION}, sort_keys=True, default=encode)
+        return hashlib.sha256(fields.encode()).hexdigest()[:16]
+
+@dataclass(frozen=True)
+class BenchmarkJob:
+    solver: str # Name of a heuristic or of a MCTS configuration
+    graph: str # Instance file, relative to the instances folder
+    seed: int | None # None for the deterministic heuristics
+    V: int
+    E: int
+    best_sol: int
+    config: str = "" # MctsConfig.key of the configuration, empty for the heuristics
+
+    @property
+    def key(self) -> str:
+        # Identifies the job in the results store, the results of another configuration under the same
+        # name are not reused
+        return f"{self.solver}|{self.config}|{self.graph}|{self.seed}"
 
 @dataclass
 class BenchmarkResult:
@@ -45,6 +89,7 @@ class BenchmarkResult:
     V: int
     E: int
     best_sol: int
+    profile: dict[str, Any] | None = None # SearchProfiler report of the MCTS runs with profiling enabled
 
     @property
     def color_count(self):
@@ -1,9 +1,17 @@
+from src.utils.graph_store import GraphStore
+from src.utils.graph_store import GraphStoreHandle
 from src.utils.input_utils import read_graph
 from src.utils.input_utils import read_graph_ascii
 from src.utils.input_utils import read_graph_binary
+from src.utils.input_utils import read_graph_csr
+from src.utils.input_utils import csr_to_adj
 
 __all__ = [
+    "csr_to_adj",
+    "GraphStore",
+    "GraphStoreHandle",
     "read_graph",
     "read_graph_ascii",
-    "read_graph_binary"
+    "read_graph_binary",
+    "read_graph_csr"
 ]
\ No newline at end of file
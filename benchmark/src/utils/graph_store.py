@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from src.utils.input_utils import csr_to_adj, read_graph_csr
+
+
+@dataclass(frozen=True)
+class GraphStoreHandle:
+    # Picklable description of a store, sent to the workers so that they can attach to it
+    name: str
+    index: dict[str, tuple[int, int, int]] # Path -> (number of vertices, offset of indptr, offset of indices)
+
+class GraphStore:
+    """CSR adjacencies of a set of instances, parsed once and kept in a single
+    shared memory block. Workers attach to the block by name and read the
+    arrays in place, so the parsed graphs are not copied per process.
+    The process that created the store must call unlink once it is done.
+    """
+    handle: GraphStoreHandle
+    _memory: SharedMemory
+    _data: np.ndarray | None
+    _owner: bool
+
+    def __init__(self, handle: GraphStoreHandle, memory: SharedMemory, owner: bool) -> None:
+        self.handle = handle
+        self._memory = memory
+        self._data = np.ndarray((memory.size // 4,), dtype=np.int32, buffer=memory.buf)
+        self._owner = owner
+
+    @classmethod
+    def create(cls, paths: list[str], directory: str = "instances") -> GraphStore:
+        graphs = {path: read_graph_csr(f"{directory}/{path}") for path in dict.fromkeys(paths)}
+        index: dict[str, tuple[int, int, int]] = {}
+        size = 0
+
+        for path, (indptr, indices) in graphs.items():
+            index[path] = (len(indptr) - 1, size, size + len(indptr))
+            size += len(indptr) + len(indices)
+
+        memory = SharedMemory(create=True, size=max(4 * size, 4))
+        data = np.ndarray((size,), dtype=np.int32, buffer=memory.buf)
+
+        for path, (indptr, indices) in graphs.items():
+            _, indptr_offset, indices_offset = index[path]
+            data[indptr_offset:indices_offset] = indptr
+            data[indices_offset:indices_offset + len(indices)] = indices
+
+        del data
+        return cls(GraphStoreHandle(memory.name, index), memory, True)
+
+    @classmethod
+    def attach(cls, handle: GraphStoreHandle) -> GraphStore:
+        # Not tracked, otherwise the resource tracker of the worker would unlink the block when it exits
+        return cls(handle, SharedMemory(handle.name, track=False), False)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.handle.index
+
+    def csr(self, path: str) -> tuple[np.ndarray, np.ndarray]:
+        # Views on the shared block, they must not outlive the store
+        n, indptr_offset, indices_offset = self.handle.index[path]
+        assert self._data is not None
+        indptr = self._data[indptr_offset:indices_offset]
+        return indptr, self._data[indices_offset:indices_offset + int(indptr[n])]
+
+    def graph(self, path: str) -> tuple[range, list[set[int]]]:
+        # Same result as read_graph, built from the shared arrays when it is needed
+        indptr, indices = self.csr(path)
+        return range(len(indptr) - 1), csr_to_adj(indptr, indices)
+
+    def nbytes(self) -> int:
+        return self._memory.size
+
+    def close(self) -> None:
+        # Fails with a BufferError while arrays returned by csr are still alive
+        if self._data is not None:
+            self._data = None
+            self._memory.close()
+
+    def unlink(self) -> None:
+        self.close()
+
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self) -> GraphStore:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.unlink()
@@ -1,11 +1,82 @@
+import os
 from typing import cast
 
+import numpy as np
+
+
+CSR_VERSION = 2 # Part of the cache key, the caches of version 1 hold the neighbors in increasing order
+
+def read_graph(filename, cache: bool = True) -> tuple[range, list[set[int]]]:
+    # Goes through the CSR reader and its cache unless cache is False
+    if not cache:
+        if len(filename)>6 and filename[-6:] == ".col.b":
+            return read_graph_binary(filename)
+        else:
+            return read_graph_ascii(filename)
+
+    indptr, indices = read_graph_csr(filename)
+    return range(len(indptr) - 1), csr_to_adj(indptr, indices)
+
+def read_graph_csr(filename, cache: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """Read a graph as a CSR adjacency, the neighbors of vertex v are
+    indices[indptr[v]:indptr[v + 1]], in the order read_graph_binary and
+    read_graph_ascii add them to the set of v.
+    The arrays are cached in filename + ".npz", which is rebuilt when the
+    modification time or the size of the instance change, or when the cache
+    was written by another version of the reader.
+    """
+    cache_file = filename + ".npz"
+    stat = os.stat(filename)
+    key = np.array([stat.st_mtime_ns, stat.st_size, CSR_VERSION], dtype=np.int64)
+
+    if cache and os.path.exists(cache_file):
+        try:
+            with np.load(cache_file) as data:
+                if np.array_equal(data["key"], key):
+                    return data["indptr"], data["indices"]
+        except (OSError, ValueError, KeyError):
+            pass # Unreadable cache, it is rebuilt below
 
-def read_graph(filename) -> tuple[range, list[set[int]]]:
     if len(filename)>6 and filename[-6:] == ".col.b":
-        return read_graph_binary(filename)
+        indptr, indices = read_csr_binary(filename)
     else:
-        return read_graph_ascii(filename)
+        indptr, indices = read_csr_ascii(filename)
+
+    if cache:
+        # Written to a temporary file first so that concurrent runs never read a partial cache
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+
+        with open(tmp_file, "wb") as f:
+            np.savez(f, key=key, indptr=indptr, indices=indices)
+
+        os.replace(tmp_file, cache_file)
+
+    return indptr, indices
+
+def edges_to_csr(n: int, rows: np.ndarray, cols: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Builds the symmetric CSR adjacency of the undirected edges (rows[k], cols[k]), duplicates are merged.
+    # The neighbors of a vertex keep the order of their first edge, which is the order in which the file
+    # readers add them to its set
+    src = np.column_stack((rows, cols)).ravel().astype(np.int64)
+    dst = np.column_stack((cols, rows)).ravel().astype(np.int64)
+    order = np.argsort(src, kind="stable")
+    src, dst = src[order], dst[order]
+
+    _, first = np.unique(src * n + dst, return_index=True)
+    first.sort()
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src[first], minlength=n), out=indptr[1:])
+
+    return indptr, dst[first]
+
+def csr_to_adj(indptr: np.ndarray, indices: np.ndarray) -> list[set[int]]:
+    # The neighbors are added in the order of the CSR rows, the order of the file readers, so that the sets
+    # iterate as the ones of read_graph_binary and read_graph_ascii and the baselines that break ties in set
+    # order (e.g. RLF) give the same colorings
+    neighbors = indices.tolist()
+    bounds = indptr.tolist()
+    return [set(neighbors[bounds[v]:bounds[v + 1]]) for v in range(len(bounds) - 1)]
 
 def bytes_to_bits(bytes: bytes) -> list[int]:
     bits = []
@@ -42,12 +113,8 @@ def read_edges(line: bytes, adj: list[set[int]]) -> None:
             j = 0
 
 
-def read_graph_binary(filename) -> tuple[range, list[set[int]]]:
-    """Read a graph from a file in the Binary format specified by David Johnson
-    for the DIMACS clique challenge.
-    Instances are available at
-    ftp://dimacs.rutgers.edu/pub/challenge/graph/benchmarks/clique
-    """
+def open_binary(filename) -> tuple[int, bytes]:
+    # Returns the number of vertices and the bit matrix of a binary instance
     try:
         if len(filename)>3 and filename[-3:] == ".gz":  # file compressed with gzip
             import gzip
@@ -67,19 +134,76 @@ def read_graph_binary(filename) -> tuple[range, list[set[int]]]:
     preamble = cast(str, preamble)
 
     last_line = preamble.split("\n")[-2]
-    p, name, n, nedges = last_line.split()
-    n, nedges = int(n), int(nedges)
-    nodes = range(n)
-    adj: list[set[int]] = [set([]) for i in nodes]
+    n = int(last_line.split()[2])
     binary_line = f.read()
 
     if type(binary_line) is str:
         binary_line = binary_line.encode()
     binary_line = cast(bytes, binary_line)
 
-    read_edges(binary_line, adj)
+    f.close()
+    return n, binary_line
+
+def read_csr_binary(filename) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorised version of read_graph_binary that returns the CSR adjacency.
+    Row i of the lower triangular bit matrix holds the bits (i, 0)..(i, i),
+    most significant bit first, padded to a whole number of bytes.
+    """
+    n, binary_line = open_binary(filename)
+    bits = np.unpackbits(np.frombuffer(binary_line, dtype=np.uint8))
+
+    row_lengths = np.arange(n, dtype=np.int64) + 1
+    row_offsets = np.zeros(n, dtype=np.int64)
+    np.cumsum((row_lengths[:-1] + 7) // 8 * 8, out=row_offsets[1:])
+
+    rows = np.repeat(np.arange(n, dtype=np.int64), row_lengths)
+    cols = np.arange(len(rows), dtype=np.int64) - np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+    mask = bits[row_offsets[rows] + cols] == 1
 
+    return edges_to_csr(n, rows[mask], cols[mask])
+
+def read_csr_ascii(filename) -> tuple[np.ndarray, np.ndarray]:
+    # Same edges, in the same order, as read_graph_ascii, returned as the CSR adjacency
+    try:
+        if len(filename)>3 and filename[-3:] == ".gz":  # file compressed with gzip
+            import gzip
+            f = gzip.open(filename, "rt")
+        else:   # usual, uncompressed file
+            f = open(filename)
+    except IOError:
+        print("could not open file", filename)
+        exit(-1)
+
+    n = 0
+    rows: list[int] = []
+    cols: list[int] = []
+
+    for line in f:
+        if line[0] == 'e':
+            _, i, j = line.split()
+            u, v = int(i) - 1, int(j) - 1
+
+            if u != v: # Self-loops are dropped
+                rows.append(u)
+                cols.append(v)
+        elif line[0] == 'p':
+            n = int(line.split()[2])
     f.close()
+
+    return edges_to_csr(n, np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))
+
+def read_graph_binary(filename) -> tuple[range, list[set[int]]]:
+    """Read a graph from a file in the Binary format specified by David Johnson
+    for the DIMACS clique challenge.
+    Instances are available at
+    ftp://dimacs.rutgers.edu/pub/challenge/graph/benchmarks/clique
+    """
+    n, binary_line = open_binary(filename)
+    nodes = range(n)
+    adj: list[set[int]] = [set([]) for i in nodes]
+
+    read_edges(binary_line, adj)
+
     return nodes, adj
 
 def read_graph_ascii(filename) -> tuple[range, list[set[int]]]:
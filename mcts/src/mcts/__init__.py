@@ -1,5 +1,9 @@
 from mcts.monte_carlo_tree_search import MonteCarloTreeSearch
+from mcts.parallel_monte_carlo_tree_search import AsyncTreeParallelMonteCarloTreeSearch, RootParallelMonteCarloTreeSearch, TreeParallelMonteCarloTreeSearch
 
 __all__ = [
-    "MonteCarloTreeSearch"
+    "AsyncTreeParallelMonteCarloTreeSearch",
+    "MonteCarloTreeSearch",
+    "RootParallelMonteCarloTreeSearch",
+    "TreeParallelMonteCarloTreeSearch"
 ]
\ No newline at end of file
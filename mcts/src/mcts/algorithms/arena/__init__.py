@@ -0,0 +1,12 @@
+from mcts.algorithms.arena.arena_default_policy import ArenaDefaultPolicy
+from mcts.algorithms.arena.arena_opt_tree_policy import ArenaOptTreePolicy
+from mcts.algorithms.arena.arena_uct_tree_policy import ArenaUctTreePolicy
+from mcts.algorithms.arena.tree_arena import NO_NODE, TreeArena
+
+__all__ = [
+    "ArenaDefaultPolicy",
+    "ArenaOptTreePolicy",
+    "ArenaUctTreePolicy",
+    "NO_NODE",
+    "TreeArena"
+]
\ No newline at end of file
@@ -0,0 +1,28 @@
+from collections.abc import Callable
+from typing import Any
+
+from mcts.interfaces import DefaultPolicy, State
+from mcts.algorithms.arena.tree_arena import TreeArena
+from mcts.other.state_node import StateNode
+
+
+class ArenaDefaultPolicy[A, S: State[Any, float, float]](DefaultPolicy[int, tuple[float, int]]):
+    # Runs a node-based default policy (e.g. UctDefaultPolicy) on the nodes of a TreeArena
+    arena: TreeArena[A, S]
+    default_policy: DefaultPolicy[Any, tuple[float, int]]
+
+    def __init__(self, arena: TreeArena[A, S], default_policy: DefaultPolicy[Any, tuple[float, int]]) -> None:
+        self.arena = arena
+        self.default_policy = default_policy
+
+    @property
+    def rollout_hook(self) -> Callable[[int, bool], None] | None:
+        return self.default_policy.rollout_hook
+
+    @rollout_hook.setter
+    def rollout_hook(self, hook: Callable[[int, bool], None] | None) -> None:
+        # The rollouts are run by the wrapped policy
+        self.default_policy.rollout_hook = hook
+
+    def simulate(self, node: int) -> tuple[float, int]:
+        return self.default_policy.simulate(StateNode(self.arena.states[node]))
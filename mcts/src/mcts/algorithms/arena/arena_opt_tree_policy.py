@@ -0,0 +1,73 @@
+from math import inf, log, sqrt
+from random import Random
+from typing import Any
+
+from mcts.interfaces import TreePolicy
+from mcts.interfaces.state import State
+from mcts.algorithms.arena.tree_arena import NO_NODE, TreeArena
+
+class ArenaOptTreePolicy[A, S: State[Any, float, float]](TreePolicy[int, tuple[float, int]]):
+    arena: TreeArena[A, S]
+    c_p: float
+    c_h: float
+    c_r: float
+    random_gen: Random
+
+    def __init__(self, arena: TreeArena[A, S], c_p = 1 / sqrt(2), c_h = 0.1, c_r = 0.0, seed: int | float | str | bytes | bytearray | None = None):
+        self.arena = arena
+        self.c_p = c_p
+        self.c_h = c_h
+        self.c_r = c_r
+        self.random_gen = Random(seed)
+
+    def compute_uct(self, parent: int, node: int) -> float:
+        arena = self.arena
+        parent_best = arena.best_solution[parent]
+        parent_worst = arena.worst_solution[parent]
+
+        if parent_best == parent_worst:
+            return 0
+
+        exploit_term = (arena.best_solution[node] - parent_worst) / (parent_best - parent_worst)
+        exploration_term = sqrt(2.0 * log(arena.N[parent]) / arena.N[node])
+        heuristic_term = 0
+        random_term = (self.random_gen.random() / arena.N[parent])
+
+        return exploit_term + (self.c_p * exploration_term) + (self.c_h * heuristic_term) + (self.c_r * random_term)
+
+    def tree_policy(self, node: int) -> int:
+        if self.arena.N[node] == 0:
+            return node
+
+        next_node = self.expand(node)
+
+        if next_node == NO_NODE:
+            next_node = self.select(node)
+
+        return next_node
+
+    def select(self, node: int) -> int:
+        if self.arena.states[node].is_terminal():
+            return node
+
+        next_sibling = self.arena.next_sibling
+        best_node = child = self.arena.first_child[node]
+        best_value = -inf
+
+        while child != NO_NODE:
+            value = self.compute_uct(node, child)
+
+            if value > best_value:
+                best_node, best_value = child, value
+
+            child = next_sibling[child]
+
+        return self.tree_policy(best_node)
+
+    def expand(self, node: int) -> int:
+        return self.arena.expand(node)
+
+    def backpropagate(self, node: int, result: tuple[float, int]) -> None:
+        while node != NO_NODE:
+            self.arena.update(node, result)
+            node = self.arena.parent[node]
@@ -0,0 +1,143 @@
+from array import array
+from collections.abc import Iterator
+from math import inf
+from typing import Any
+
+from mcts.interfaces import State
+
+NO_NODE = -1 # Handle used for a missing parent, child or sibling
+
+
+class TreeArena[A, S: State[Any, float, float]]:
+    # Struct-of-arrays tree store, a node is the integer index of its entries in the arrays
+    N: array[int] # Number of times each node has been visited
+    W: array[float] # Total reward of each node
+    best_solution: array[float]
+    worst_solution: array[float]
+    parent: array[int]
+    first_child: array[int]
+    last_child: array[int] # Kept so children are linked in expansion order, like the object trees
+    next_sibling: array[int]
+    states: list[S]
+    actions: list[A | None] # Action that led to each node, None for the root
+    size: int
+    capacity: int
+
+    _children_iters: dict[int, Iterator[A]] # Created on the first expansion and dropped once exhausted
+    _expanded: set[int] # Nodes whose children iterator has been exhausted
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.size = 0
+        self.capacity = max(1, capacity)
+        self.N = array("q", [0]) * self.capacity
+        self.W = array("d", [0.0]) * self.capacity
+        self.best_solution = array("d", [-inf]) * self.capacity
+        self.worst_solution = array("d", [inf]) * self.capacity
+        self.parent = array("q", [NO_NODE]) * self.capacity
+        self.first_child = array("q", [NO_NODE]) * self.capacity
+        self.last_child = array("q", [NO_NODE]) * self.capacity
+        self.next_sibling = array("q", [NO_NODE]) * self.capacity
+        self.states = []
+        self.actions = []
+        self._children_iters = {}
+        self._expanded = set()
+
+    def _grow(self) -> None:
+        extra = self.capacity
+        self.N.extend(array("q", [0]) * extra)
+        self.W.extend(array("d", [0.0]) * extra)
+        self.best_solution.extend(array("d", [-inf]) * extra)
+        self.worst_solution.extend(array("d", [inf]) * extra)
+        self.parent.extend(array("q", [NO_NODE]) * extra)
+        self.first_child.extend(array("q", [NO_NODE]) * extra)
+        self.last_child.extend(array("q", [NO_NODE]) * extra)
+        self.next_sibling.extend(array("q", [NO_NODE]) * extra)
+        self.capacity += extra
+
+    def _new_node(self, state: S, action: A | None, parent: int) -> int:
+        if self.size == self.capacity:
+            self._grow()
+
+        node = self.size
+        self.size += 1
+        self.parent[node] = parent
+        self.states.append(state)
+        self.actions.append(action)
+
+        return node
+
+    def add_root(self, state: S) -> int:
+        return self._new_node(state, None, NO_NODE)
+
+    def add_child(self, node: int, action: A) -> int:
+        child = self._new_node(self.states[node].play(action), action, node)
+
+        if self.last_child[node] == NO_NODE:
+            self.first_child[node] = child
+        else:
+            self.next_sibling[self.last_child[node]] = child
+
+        self.last_child[node] = child
+        return child
+
+    def expand(self, node: int) -> int:
+        if node in self._expanded:
+            return NO_NODE
+
+        children_iter = self._children_iters.get(node)
+
+        if children_iter is None:
+            children_iter = self._children_iters[node] = self.states[node].actions_tree()
+
+        try:
+            action = next(children_iter)
+        except StopIteration:
+            del self._children_iters[node]
+            self._expanded.add(node)
+            return NO_NODE
+
+        return self.add_child(node, action)
+
+    def is_fully_expanded(self, node: int) -> bool:
+        return node in self._expanded
+
+    def children(self, node: int) -> Iterator[int]:
+        child = self.first_child[node]
+
+        while child != NO_NODE:
+            yield child
+            child = self.next_sibling[child]
+
+    def update(self, node: int, result: tuple[float, int]) -> None:
+        value = self.states[node].interpret_reward(result[0])
+        self.N[node] += result[1]
+        self.W[node] += value
+
+        if value > self.best_solution[node]:
+            self.best_solution[node] = value
+
+        if value < self.worst_solution[node]:
+            self.worst_solution[node] = value
+
+    def estimated_value(self, node: int) -> float:
+        return self.W[node] / self.N[node] if self.N[node] > 0 else 0
+
+    def best_child(self, node: int) -> int:
+        return max(self.children(node), key=self.estimated_value, default=NO_NODE)
+
+    def count(self, node: int = 0) -> int:
+        total = 0
+        stack = [node]
+
+        while stack:
+            cur = stack.pop()
+            total += 1
+            stack.extend(self.children(cur))
+
+        return total
+
+    def nbytes(self) -> int:
+        # Memory held by the statistic and link arrays, states and actions are not included
+        arrays = (self.N, self.W, self.best_solution, self.worst_solution,
+            self.parent, self.first_child, self.last_child, self.next_sibling)
+        return sum(arr.itemsize * len(arr) for arr in arrays)
@@ -0,0 +1,7 @@
+from mcts.algorithms.batch.batch_rollout_policy import BatchRolloutPolicy
+from mcts.algorithms.batch.csr_graph import CsrGraph
+
+__all__ = [
+    "BatchRolloutPolicy",
+    "CsrGraph"
+]
\ No newline at end of file
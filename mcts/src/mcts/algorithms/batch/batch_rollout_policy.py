@@ -0,0 +1,174 @@
+from typing import Any, cast
+
+import numpy as np
+
+from mcts.interfaces import DefaultPolicy, State
+from mcts.algorithms.batch.csr_graph import CsrGraph
+from mcts.other.solutions import Solutions
+from mcts.sample.graph_color_seq_state import GraphColorSeqState
+
+
+class BatchRolloutPolicy[S: State[Any, float, float]](DefaultPolicy[Any, tuple[float, int]]):
+    # Runs batch_size colorings of the leaf state at once with NumPy. Supports GraphColorSeqState, which
+    # colors the vertices by index, and the DSATUR states (GraphColorDsaturState and
+    # GraphColorBitsetDsaturState), which color the uncolored vertex with the highest saturation. Each
+    # step picks the smallest feasible color with probability greedy and a uniformly random feasible
+    # color (the distribution of UctDefaultPolicy without heuristic) otherwise
+    batch_size: int
+    greedy: float
+    solutions: Solutions | None # Only receives the best terminal state of each batch
+    best_solution: tuple[S | None, float]
+    random_gen: np.random.Generator
+
+    _graph: list[set[int]] | None # Graph the cached CSR adjacency was built from
+    _csr: CsrGraph | None
+
+    def __init__(self, batch_size: int = 64, greedy: float = 0.0, solutions: Solutions | None = None, seed: int | None = None) -> None:
+        self.batch_size = batch_size
+        self.greedy = greedy
+        self.solutions = solutions
+        self.best_solution = (None, -np.inf)
+        self.random_gen = np.random.default_rng(seed)
+        self._graph = None
+        self._csr = None
+
+    def csr(self, graph: list[set[int]]) -> CsrGraph:
+        if graph is not self._graph or self._csr is None:
+            self._graph = graph
+            self._csr = CsrGraph(graph)
+
+        return self._csr
+
+    def run_batch(self, state: S) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Returns the colors (B, V) and number of colors (B,) of the terminal colorings and the order (B, steps)
+        # in which the uncolored vertices were colored
+        return self.run_batches([state])
+
+    def run_batches(self, states: list[S]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # run_batch for several states of the same graph at once, the batch_size rows of each state follow
+        # each other. The orders are padded with -1 after the last uncolored vertex of a state, the rows
+        # that are done keep recoloring a vertex with its own color, which changes nothing
+        # Both state kinds expose graph, colorings and n_colors
+        graph_states = [cast(Any, state) for state in states]
+        csr = self.csr(graph_states[0].graph)
+        sequential = isinstance(states[0], GraphColorSeqState)
+        n_batch, n_vertices = self.batch_size * len(states), csr.n_vertices
+        rows = np.arange(n_batch)
+
+        initials: list[dict[int, int]] = [dict(enumerate(gs.colorings)) if sequential else gs.colorings for gs in graph_states]
+        n_colors = np.repeat(np.array([gs.n_colors for gs in graph_states], dtype=np.int64), self.batch_size)
+
+        # forbidden[b, v, c] is set when a neighbor of v has color c. The color axis starts with room for
+        # a few new colors and doubles when a rollout runs out of it
+        n_slots = max(8, 2 * (int(n_colors.max()) + 1))
+        base_colors = np.full((len(states), n_vertices), -1, dtype=np.int64)
+        base_forbidden = np.zeros((len(states), n_vertices, n_slots), dtype=bool)
+
+        for index, initial in enumerate(initials):
+            for vertex, color in initial.items():
+                base_colors[index, vertex] = color
+                base_forbidden[index, csr.indices[csr.indptr[vertex]:csr.indptr[vertex + 1]], color] = True
+
+        colors = np.repeat(base_colors, self.batch_size, axis=0)
+        forbidden = np.repeat(base_forbidden, self.batch_size, axis=0)
+        saturation = forbidden.sum(axis=2)
+        tie_break = n_vertices - 1 - csr.rank
+
+        n_initial = np.repeat(np.array([len(initial) for initial in initials], dtype=np.int64), self.batch_size)
+        n_steps = n_vertices - int(n_initial.min())
+        order = np.full((n_batch, n_steps), -1, dtype=np.int64)
+
+        for step in range(n_steps):
+            active = n_initial + step < n_vertices
+
+            if sequential:
+                vertices = np.minimum(n_initial + step, n_vertices - 1)
+            else:
+                priority = np.where(colors < 0, saturation * n_vertices + tie_break, -1)
+                vertices = priority.argmax(axis=1)
+
+            max_color = int(n_colors.max()) + 1
+
+            if max_color > forbidden.shape[2]:
+                forbidden = np.concatenate((forbidden, np.zeros_like(forbidden)), axis=2)
+
+            # Colors 0..n_colors that no neighbor uses, the last one opens a new color
+            allowed = ~forbidden[rows, vertices, :max_color] & (np.arange(max_color) <= n_colors[:, None])
+
+            picks = (self.random_gen.random(n_batch) * allowed.sum(axis=1)).astype(np.int64)
+            chosen = (allowed.cumsum(axis=1) > picks[:, None]).argmax(axis=1)
+
+            if self.greedy > 0:
+                chosen = np.where(self.random_gen.random(n_batch) < self.greedy, allowed.argmax(axis=1), chosen)
+
+            if len(states) > 1:
+                chosen = np.where(active, chosen, colors[rows, vertices])
+
+            colors[rows, vertices] = chosen
+            n_colors = np.maximum(n_colors, chosen + 1)
+            order[:, step] = np.where(active, vertices, -1)
+
+            owners, neighbors = csr.neighbors(vertices)
+            neighbor_colors = chosen[owners]
+
+            if not sequential:
+                gained = ~forbidden[owners, neighbors, neighbor_colors]
+                saturation[owners[gained], neighbors[gained]] += 1
+
+            forbidden[owners, neighbors, neighbor_colors] = True
+
+        return colors, n_colors, order
+
+    def terminal_state(self, state: S, colors: np.ndarray, order: np.ndarray) -> S:
+        # Replays a coloring of the batch on a rollout clone of the leaf state
+        terminal = state.clone_for_rollout()
+        sequential = isinstance(state, GraphColorSeqState)
+
+        for vertex in order.tolist():
+            if vertex < 0:
+                break
+
+            terminal.apply((int(colors[vertex]), 0.0) if sequential else (vertex, int(colors[vertex])))
+
+        return terminal
+
+    def evaluate(self, state: S, colors: np.ndarray, n_colors: np.ndarray, order: np.ndarray) -> tuple[float, int]:
+        best = int(n_colors.argmin())
+        reward = float(-n_colors[best])
+
+        if reward > self.best_solution[1] or (self.solutions is not None and self.solutions.accepts(reward)):
+            terminal = self.terminal_state(state, colors[best], order[best])
+
+            if reward > self.best_solution[1]:
+                self.best_solution = (terminal, reward)
+
+            if self.solutions is not None:
+                self.solutions.add_solution((terminal, reward))
+
+        return (float(-n_colors.sum()), self.batch_size)
+
+    def simulate(self, node: Any) -> tuple[float, int]:
+        state: S = node.state
+        return self.evaluate(state, *self.run_batch(state))
+
+    def simulate_batch(self, nodes: list[Any]) -> list[tuple[float, int]]:
+        # The rollouts of all the leaves run in the same arrays, batch_size rows per leaf
+        states: list[S] = [node.state for node in nodes]
+        colors, n_colors, order = self.run_batches(states)
+        results = []
+
+        for index, state in enumerate(states):
+            block = slice(index * self.batch_size, (index + 1) * self.batch_size)
+            results.append(self.evaluate(state, colors[block], n_colors[block], order[block]))
+
+        return results
+
+    def checkpoint(self) -> Any:
+        return (self.random_gen.bit_generator.state, self.best_solution, self.solutions)
+
+    def restore(self, data: Any) -> None:
+        random_state, self.best_solution, solutions = data
+        self.random_gen.bit_generator.state = random_state
+
+        if self.solutions is not None and solutions is not None:
+            self.solutions.restore(solutions)
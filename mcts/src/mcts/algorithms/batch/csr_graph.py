@@ -0,0 +1,33 @@
+import numpy as np
+
+
+class CsrGraph:
+    # Adjacency of a graph in compressed sparse row form, the neighbors of vertex v are
+    # indices[indptr[v]:indptr[v + 1]]. Self loops are dropped
+    indptr: np.ndarray
+    indices: np.ndarray
+    rank: np.ndarray # DSATUR tie-break rank of each vertex, by decreasing degree and then by index
+
+    def __init__(self, graph: list[set[int]]) -> None:
+        neighbors = [sorted(u for u in adj if u != v) for v, adj in enumerate(graph)]
+
+        self.indptr = np.zeros(len(graph) + 1, dtype=np.int64)
+        np.cumsum([len(adj) for adj in neighbors], out=self.indptr[1:])
+        self.indices = np.fromiter((u for adj in neighbors for u in adj), dtype=np.int64, count=int(self.indptr[-1]))
+
+        # The states compare len(graph[v]), which counts self loops, so the rank does too
+        order = sorted(range(len(graph)), key=lambda v: (-len(graph[v]), v))
+        self.rank = np.empty(len(graph), dtype=np.int64)
+        self.rank[order] = np.arange(len(graph))
+
+    @property
+    def n_vertices(self) -> int:
+        return len(self.indptr) - 1
+
+    def neighbors(self, vertices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Neighbors of every vertex of the array, returned with the position of the vertex they belong to
+        starts = self.indptr[vertices]
+        lengths = self.indptr[vertices + 1] - starts
+        offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        return np.repeat(np.arange(len(vertices)), lengths), self.indices[np.repeat(starts, lengths) + offsets]
@@ -2,30 +2,85 @@ from math import inf
 from random import Random
 
 from mcts.monte_carlo_tree_search import DefaultPolicy
-from mcts.algorithms.opt.opt_tree_node import OptTreeNode
+from mcts.algorithms.opt.opt_tree_node import CUT_OFF, OptTreeNode
 from mcts.interfaces import State
+from mcts.other.solutions import Solutions
 from typing import Any
 
 class OptDefaultPolicy[A, S: State[Any, float, float]](DefaultPolicy[OptTreeNode[A, S], tuple[float, int]]):
     random_gen: Random
     best_solution: tuple[S | None, float]
+    solutions: Solutions | None # Receives the improving terminal states, e.g. the incumbent of the tree policy
+    prune: bool # Stops a rollout once its state cannot improve on the best solution
 
-    def __init__(self, seed: int | float | str | bytes | bytearray | None = None) -> None:
+    def __init__(self, seed: int | float | str | bytes | bytearray | None = None, solutions: Solutions | None = None, prune: bool = False) -> None:
         self.best_solution = (None, -inf)
         self.random_gen = Random(seed)
+        self.solutions = solutions
+        self.prune = prune
+
+    def is_bounded(self, state: S) -> float | None:
+        # Bound of the state if it shows that no completion improves on the best solution
+        if not self.prune or self.best_solution[0] is None:
+            return None
+
+        bound = state.reward_bound()
+
+        return bound if bound is not None and bound <= self.best_solution[1] else None
 
     def simulate(self, node: OptTreeNode[A, S]) -> tuple[float, int]:
         cur_state = node.state
-        
-        while not cur_state.is_terminal():
-            children = list(cur_state.actions_default())
-            action = self.random_gen.choice(children)
-            cur_state = cur_state.play(action)
+        in_place = cur_state.supports_rollout()
+        steps = 0
+        cut_off = False
+
+        if in_place:
+            # The rollout is played in place on a single mutable copy of the leaf state
+            cur_state = cur_state.clone_for_rollout()
+
+            while not cur_state.is_terminal():
+                if self.is_bounded(cur_state) is not None:
+                    cut_off = True
+                    break
+
+                children = list(cur_state.actions_default())
+                cur_state.apply(self.random_gen.choice(children))
+                steps += 1
+        else:
+            while not cur_state.is_terminal():
+                if self.is_bounded(cur_state) is not None:
+                    cut_off = True
+                    break
+
+                children = list(cur_state.actions_default())
+                action = self.random_gen.choice(children)
+                cur_state = cur_state.play(action)
+                steps += 1
+
+        if self.rollout_hook is not None:
+            self.rollout_hook(steps, in_place)
+
+        if cut_off:
+            # The bound is only reached in the best case, the rollout counts as a visit without a reward
+            return (CUT_OFF, 1)
 
         reward = cur_state.get_reward()
 
         if cur_state.interpret_reward(reward) > self.best_solution[1]:
             self.best_solution = (cur_state, cur_state.interpret_reward(reward))
+
+            if self.solutions is not None:
+                self.solutions.add_solution(self.best_solution)
             
 
-        return (reward, 1)
\ No newline at end of file
+        return (reward, 1)
+
+    def checkpoint(self) -> Any:
+        return (self.random_gen.getstate(), self.best_solution, self.solutions)
+
+    def restore(self, data: Any) -> None:
+        random_state, self.best_solution, solutions = data
+        self.random_gen.setstate(random_state)
+
+        if self.solutions is not None and solutions is not None:
+            self.solutions.restore(solutions)
\ No newline at end of file
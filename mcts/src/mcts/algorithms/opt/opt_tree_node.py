@@ -1,8 +1,12 @@
 from collections.abc import Iterator
-from math import inf
-from typing import Any
+from math import inf, isnan, nan
+from typing import Any, cast
 
 from mcts.interfaces import State
+from mcts.other.transposition_table import TranspositionTable
+
+# Reward of a rollout cut off by branch and bound, which counts as a visit but reached no solution
+CUT_OFF = nan
 
 class OptTreeNode[A, S: State[Any, float, float]]:
     state: S # State of the node
@@ -11,8 +15,12 @@ class OptTreeNode[A, S: State[Any, float, float]]:
     worst_solution: float # 
     parent: OptTreeNode[A, S] | None # Parent of the node or None if this node is the root
     children: list[tuple[A, OptTreeNode[A, S]]]
+    dead: bool = False # Set by branch and bound when the subtree cannot improve on the incumbent
+    solved_reward: float | None = None # Best reward of the subtree, set by the solver once every completion has been explored
 
     _children_iter: Iterator[A]
+    _exhausted: bool = False # Whether every action has been expanded
+    _ordered: bool = False # Whether the remaining actions are sorted by priority
 
     def __init__(self, state: S, parent: OptTreeNode[A, S] | None = None):
         self.state = state
@@ -25,6 +33,10 @@ class OptTreeNode[A, S: State[Any, float, float]]:
 
     def update(self, result: tuple[float, int]) -> None:
         self.N += result[1]
+
+        if isnan(result[0]): # CUT_OFF, best_solution and worst_solution only hold rewards that were reached
+            return
+
         value = self.state.interpret_reward(result[0])
 
         if value > self.best_solution:
@@ -39,16 +51,66 @@ class OptTreeNode[A, S: State[Any, float, float]]:
         self.children.append((action, new_node))
         return new_node
     
-    def expand(self) -> OptTreeNode[A, S] | None:
+    def expand(self, transpositions: TranspositionTable[S, OptTreeNode[A, S]] | None = None) -> OptTreeNode[A, S] | None:
         try:
             action = next(self._children_iter)
-            return self.add_child(action)
         except StopIteration:
+            self._exhausted = True
             return None
 
+        if transpositions is None:
+            return self.add_child(action)
+
+        # The node of an equal state is shared instead of growing a new subtree, it keeps its first parent
+        new_state = self.state.play(action)
+        shared_node = transpositions.get(new_state)
+
+        if shared_node is not None:
+            transpositions.reused_visits += int(shared_node.N)
+            self.children.append((action, shared_node))
+            return shared_node
+
+        new_node = OptTreeNode(new_state, self)
+        self.children.append((action, new_node))
+        transpositions.put(new_state, new_node)
+        return new_node
+
+    def collapse(self) -> int:
+        # Releases the subtree, the node keeps its statistics and expands its actions again. Returns the
+        # number of released children
+        released = len(self.children)
+        self.children = []
+        self._children_iter = self.state.actions_tree()
+        self._exhausted = False
+        self._ordered = False
+        return released
+
+    def order_actions(self) -> None:
+        # Expands the actions by decreasing State.action_priority, ties keep the order of the iterator. Called
+        # before the first expansion, as the action iterators restart when they are iterated again
+        if not self._ordered:
+            self._children_iter = iter(sorted(self._children_iter, key=self.state.action_priority, reverse=True))
+            self._ordered = True
+
     def is_terminal(self) -> bool:
         return self.state.is_terminal()
 
+    def try_solve(self) -> bool:
+        # A node is solved when it is terminal or when it is fully expanded and all its children are solved
+        if self.solved_reward is not None:
+            return True
+
+        if self.state.is_terminal():
+            self.solved_reward = self.state.get_reward()
+            return True
+
+        if not self._exhausted or any(child.solved_reward is None for _, child in self.children):
+            return False
+
+        best_child = max((child for _, child in self.children), key=lambda child: child.state.interpret_reward(cast(float, child.solved_reward)))
+        self.solved_reward = best_child.solved_reward
+        return True
+
     def estimated_value(self):
         return self.best_solution
 
@@ -1,41 +1,102 @@
+from collections.abc import Iterable, Iterator
 from math import inf, log, sqrt
 from random import Random
 from typing import Any
 from mcts.interfaces import TreePolicy
 from mcts.algorithms.opt.opt_tree_node import OptTreeNode
 from mcts.interfaces import State
+from mcts.other.solutions import Solutions
+from mcts.other.node_budget import NodeBudget
+from mcts.other.transposition_table import TranspositionTable
 
 class OptTreePolicy[A, S: State[Any, float, float]](TreePolicy[OptTreeNode[A, S], tuple[float, int]]):
     c_p: float
     c_h: float
     c_r: float
     random_gen: Random
+    transpositions: TranspositionTable[S, OptTreeNode[A, S]] | None # Turns the tree into a DAG over equal states
+    incumbent: Solutions | None # Best solution found so far, enables branch and bound when set
+    reward_bound: float | None # Bound on the reward of every solution (e.g. minus the size of a clique)
+    solver: bool # Marks exhausted subtrees as solved, selection skips them and the search stops once the root is solved
+    budget: NodeBudget | None # Bounds the number of nodes, the least visited subtrees are recycled past the limit
+    widening: float # Progressive widening exponent, a node of N visits has at most max(1, floor(c_w * N^widening)) children, -1 to disable
+    c_w: float
+    ordered_expansion: bool # Expands the children by decreasing State.action_priority
+
+    _path: list[OptTreeNode[A, S]] # Nodes visited by the current descent, used to backpropagate in a DAG
+
+    def __init__(self, c_p = 1 / sqrt(2), c_h = 0.1, c_r = 0.0, seed: int | float | str | bytes | bytearray | None = None, transpositions: TranspositionTable[S, OptTreeNode[A, S]] | None = None,
+            incumbent: Solutions | None = None, reward_bound: float | None = None, solver: bool = False, budget: NodeBudget | None = None,
+            widening: float = -1, c_w: float = 1.0, ordered_expansion: bool = False):
+        if incumbent is not None and transpositions is not None:
+            raise ValueError("Branch and bound is not supported together with transpositions")
+
+        if budget is not None and transpositions is not None:
+            raise ValueError("A node budget is not supported together with transpositions")
 
-    def __init__(self, c_p = 1 / sqrt(2), c_h = 0.1, c_r = 0.0, seed: int | float | str | bytes | bytearray | None = None):
         self.c_p = c_p
         self.c_h = c_h
         self.c_r = c_r
         self.random_gen = Random(seed)
+        self.transpositions = transpositions
+        self.incumbent = incumbent
+        self.reward_bound = reward_bound
+        self.solver = solver
+        self.budget = budget
+        self.widening = widening
+        self.c_w = c_w
+        self.ordered_expansion = ordered_expansion
+        self._path = []
 
     def compute_uct(self, parent: OptTreeNode[A, S], node: OptTreeNode[A, S]) -> float:
-        if parent.best_solution == parent.worst_solution:
+        # The best solution is -inf (and the worst inf) below a node whose rollouts were all cut off, such a
+        # parent scores every child 0 and such a child gets the exploit term of the worst solution
+        if parent.best_solution <= parent.worst_solution:
             return 0
         
-        exploit_term = (node.best_solution - parent.worst_solution) / (parent.best_solution - parent.worst_solution)
+        node_best = node.best_solution if node.best_solution > -inf else parent.worst_solution
+        exploit_term = (node_best - parent.worst_solution) / (parent.best_solution - parent.worst_solution)
         exploration_term = sqrt(2.0 * log(parent.N) / node.N)
         heuristic_term = 0
         random_term = (self.random_gen.random() / parent.N)
 
         return exploit_term + (self.c_p * exploration_term) + (self.c_h * heuristic_term) + (self.c_r * random_term)
 
+    def is_pruned(self, node: OptTreeNode[A, S]) -> bool:
+        # A node is pruned when no solution below it can be strictly better than the incumbent
+        if node.dead:
+            return True
+
+        if self.incumbent is None or self.incumbent.best_solution is None:
+            return False
+
+        bound = node.state.reward_bound()
+
+        if self.reward_bound is not None:
+            bound = self.reward_bound if bound is None else min(bound, self.reward_bound)
+
+        if bound is not None and bound <= self.incumbent.best_solution[1]:
+            node.dead = True
+
+        return node.dead
+
     def tree_policy(self, node: OptTreeNode[A, S]) -> OptTreeNode[A, S]:
+        if self.incumbent is not None or self.solver:
+            return self.filtered_tree_policy(node)
+
+        if self.transpositions is not None:
+            self._path.append(node)
+
         if node.N == 0:
             return node
         
-        next_node = self.expand(node)
+        next_node = self.expand(node) if self.can_expand(node) else None
 
         if next_node is None:
             next_node =  self.select(node)
+        elif self.transpositions is not None:
+            # A shared node may already have statistics, in which case the descent continues through it
+            next_node = self.tree_policy(next_node)
 
         return next_node
 
@@ -48,10 +109,196 @@ class OptTreePolicy[A, S: State[Any, float, float]](TreePolicy[OptTreeNode[A, S]
         
         return self.tree_policy(best_node)
 
+    def filtered_tree_policy(self, root: OptTreeNode[A, S]) -> OptTreeNode[A, S]:
+        # Same descent as tree_policy over the children that are neither pruned nor solved. A node whose
+        # children are all closed is solved or pruned too and the descent restarts from the root, which is
+        # returned once it is closed
+        while not self.is_closed(root):
+            node = root
+            self._path = []
+
+            while not self.is_closed(node):
+                if self.transpositions is not None:
+                    self._path.append(node)
+
+                if node.N == 0:
+                    return node
+
+                children = None
+
+                if self.can_expand(node):
+                    next_node = self.expand_open(node)
+                else:
+                    # Progressive widening only holds back the remaining actions while a child is open
+                    children = [child for _, child in node.children if not self.is_closed(child)]
+                    next_node = self.expand_open(node) if not children else None
+
+                if next_node is not None:
+                    if self.transpositions is None or next_node.N == 0:
+                        return next_node
+
+                    node = next_node
+                    continue
+
+                if node.state.is_terminal():
+                    return node
+
+                if children is None:
+                    children = [child for _, child in node.children if not self.is_closed(child)]
+
+                if not children:
+                    if self.solver:
+                        self.solve(self.ancestors(node))
+
+                    if self.incumbent is not None:
+                        node.dead = True
+
+                    break
+
+                node = max(map(lambda n: (self.compute_uct(node, n), n), children), key=lambda x: x[0])[1]
+
+        return root
+
+    def expand_open(self, node: OptTreeNode[A, S]) -> OptTreeNode[A, S] | None:
+        # Expands until a child that is not pruned is created
+        next_node = self.expand(node)
+
+        while next_node is not None and self.is_pruned(next_node):
+            next_node = self.expand(node)
+
+        return next_node
+
+    def is_closed(self, node: OptTreeNode[A, S]) -> bool:
+        return self.is_pruned(node) or (self.solver and node.solved_reward is not None)
+
+    def ancestors(self, node: OptTreeNode[A, S] | None) -> Iterator[OptTreeNode[A, S]]:
+        # The node and its ancestors, from the node up to the root
+        if self.transpositions is not None:
+            yield from reversed(self._path)
+            return
+
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def solve(self, nodes: Iterable[OptTreeNode[A, S]]) -> None:
+        # Ancestors can only be solved once their descendant on the path is
+        for node in nodes:
+            if not node.try_solve():
+                break
+
+    def is_solved(self, node: OptTreeNode[A, S]) -> bool:
+        # A dead root proves that the incumbent is optimal
+        return node.solved_reward is not None or node.dead
+
+    def can_expand(self, node: OptTreeNode[A, S]) -> bool:
+        # Progressive widening, the k-th child is only added once c_w * N^widening reaches k
+        return self.widening < 0 or not node.children or len(node.children) + 1 <= self.c_w * node.N ** self.widening
+
     def expand(self, node: OptTreeNode[A, S]) -> OptTreeNode[A, S] | None:
-        return node.expand()
+        if self.ordered_expansion:
+            node.order_actions()
+
+        new_node = node.expand(self.transpositions)
+
+        if new_node is not None and self.budget is not None:
+            self.budget.add()
+
+        return new_node
 
     def backpropagate(self, node: OptTreeNode[A, S] | None, result: tuple[float, int]) -> None:
+        if self.solver:
+            self.solve(self.ancestors(node))
+
+        if self.transpositions is not None:
+            # Parent links only follow the first path to a shared node, so the descent path is used instead
+            for path_node in self._path:
+                path_node.update(result)
+
+            self._path = []
+            return
+
+        leaf = node
+
         while node != None:
             node.update(result)
+            node = node.parent
+
+        if self.budget is not None and self.budget.is_full():
+            root = leaf
+
+            while root is not None and root.parent is not None:
+                root = root.parent
+
+            self.budget.recycle(root)
+
+    def reroot(self, root: OptTreeNode[A, S], action: A) -> OptTreeNode[A, S]:
+        # A child that was not expanded yet becomes a fresh root
+        new_root = next((child for child_action, child in root.children if child_action == action), None)
+
+        if new_root is None:
+            new_root = type(root)(root.state.play(action))
+
+        new_root.parent = None
+        root.children = []
+        self._path = []
+
+        if self.budget is not None:
+            self.budget.recount(new_root)
+
+        if self.transpositions is not None:
+            # Only the nodes below the new root stay shared. A shared node whose first parent was released
+            # takes the parent it is reached from, so that it does not keep the released subtree alive
+            self.transpositions.clear()
+            self.transpositions.put(new_root.state, new_root)
+            seen = {id(new_root)}
+            stack = [new_root]
+
+            while stack:
+                node = stack.pop()
+
+                for child in (child for _, child in node.children):
+                    if id(child) not in seen:
+                        seen.add(id(child))
+                        child.parent = node
+                        self.transpositions.put(child.state, child)
+                        stack.append(child)
+
+        return new_root
+
+    def checkpoint(self) -> Any:
+        return (self.random_gen.getstate(), self.incumbent)
+
+    def restore(self, root: OptTreeNode[A, S], data: Any) -> None:
+        random_state, incumbent = data
+        self.random_gen.setstate(random_state)
+        self._path = []
+
+        if self.incumbent is not None and incumbent is not None:
+            self.incumbent.restore(incumbent)
+
+        if self.budget is not None:
+            self.budget.recount(root)
+
+        if self.transpositions is not None:
+            # A loaded tree has no shared nodes, each node is the one of its state
+            self.transpositions.clear()
+
+            for node in NodeBudget.nodes(root):
+                self.transpositions.put(node.state, node)
+
+    def add_virtual_loss(self, node: OptTreeNode[A, S] | None) -> float:
+        # Pending visits only lower the exploration term, the best and worst solutions are left unchanged
+        if self.transpositions is not None:
+            raise ValueError("Virtual loss is not supported together with transpositions")
+
+        while node != None:
+            node.N += 1
+            node = node.parent
+
+        return 1
+
+    def remove_virtual_loss(self, node: OptTreeNode[A, S] | None, value: float) -> None:
+        while node != None:
+            node.N -= value
             node = node.parent
\ No newline at end of file
@@ -0,0 +1,9 @@
+from mcts.algorithms.rave.rave_default_policy import RaveDefaultPolicy
+from mcts.algorithms.rave.rave_tree_node import RaveTreeNode
+from mcts.algorithms.rave.rave_tree_policy import RaveTreePolicy
+
+__all__ = [
+    "RaveDefaultPolicy",
+    "RaveTreeNode",
+    "RaveTreePolicy"
+]
\ No newline at end of file
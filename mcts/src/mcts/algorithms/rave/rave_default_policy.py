@@ -0,0 +1,78 @@
+from collections.abc import Callable, Hashable
+from math import inf
+from random import Random
+from typing import Any
+
+from mcts.algorithms.uct.uct_tree_node import UctTreeNode
+from mcts.interfaces import DefaultPolicy, State
+from mcts.other.solutions import Solutions
+
+# (total reward, number of rollouts, (reward, keys of the played actions) of each rollout)
+type RaveResult = tuple[float, int, list[tuple[float, list[Hashable]]]]
+
+class RaveDefaultPolicy[A, S: State[Any, float, float]](DefaultPolicy[UctTreeNode[A, S], RaveResult]):
+    # Same rollouts as UctDefaultPolicy with its default settings, which also return the keys of the
+    # actions played by each rollout, for the AMAF statistics of RaveTreePolicy. The rollouts run in this
+    # process
+    heur: Callable[[S, list[A]], list[float]] | None
+    random_gen: Random
+    solutions: Solutions | None
+    n_sims: int
+
+    def __init__(self, n_sims = 1, heuristic: Callable[[S, list[A]], list[float]] | None = None, solutions: Solutions | None = None,
+            seed: int | float | str | bytes | bytearray | None = None) -> None:
+        self.best_solution = (None, -inf)
+        self.random_gen = Random(seed)
+        self.n_sims = n_sims
+        self.heur = heuristic
+        self.solutions = solutions
+
+    @staticmethod
+    def run_recorded_simulation(node: UctTreeNode[A, S], heur: Callable[[S, list[A]], list[float]] | None, random_gen: Random,
+            hook: Callable[[int, bool], None] | None = None) -> tuple[S, float, list[Hashable]]:
+        # Same rollout as UctDefaultPolicy.run_simulation, the key of an action is taken before it is played
+        cur_state = node.state
+        in_place = cur_state.supports_rollout()
+        keys = []
+
+        if in_place:
+            cur_state = cur_state.clone_for_rollout()
+
+            while not cur_state.is_terminal():
+                actions = [a for a in cur_state.actions_default()]
+                weights = heur(node.state, actions) if heur is not None else None
+
+                action = random_gen.choices(actions, weights)[0]
+                keys.append(cur_state.action_key(action))
+                cur_state.apply(action)
+        else:
+            while not cur_state.is_terminal():
+                actions = [a for a in cur_state.actions_default()]
+                weights = heur(node.state, actions) if heur is not None else None
+
+                action = random_gen.choices(actions, weights)[0]
+                keys.append(cur_state.action_key(action))
+                cur_state = cur_state.play(action)
+
+        if hook is not None:
+            hook(len(keys), in_place)
+
+        return cur_state, cur_state.get_reward(), keys
+
+    def simulate(self, node: UctTreeNode[A, S]) -> RaveResult:
+        results = [self.run_recorded_simulation(node, self.heur, self.random_gen, self.rollout_hook) for _ in range(self.n_sims)]
+
+        if self.solutions is not None:
+            self.solutions.add_solutions([(state, reward) for state, reward, _ in results])
+
+        return (sum(res[1] for res in results), self.n_sims, [(reward, keys) for _, reward, keys in results])
+
+    def checkpoint(self) -> Any:
+        return (self.random_gen.getstate(), self.best_solution, self.solutions)
+
+    def restore(self, data: Any) -> None:
+        random_state, self.best_solution, solutions = data
+        self.random_gen.setstate(random_state)
+
+        if self.solutions is not None and solutions is not None:
+            self.solutions.restore(solutions)
@@ -0,0 +1,31 @@
+from collections.abc import Hashable
+from typing import Any
+
+from mcts.algorithms.uct.uct_tree_node import UctTreeNode
+from mcts.interfaces import State
+from mcts.other.transposition_table import TranspositionTable
+
+
+class RaveTreeNode[A, S: State[Any, float, float]](UctTreeNode[A, S]):
+    # UctTreeNode that knows the key of the action leading to it and, once it has enough visits, keeps the
+    # AMAF statistics of every action played below it
+    parent: RaveTreeNode[A, S] | None
+    key: Hashable | None = None # State.action_key of the action played by the parent, None for the root
+    amaf: dict[Hashable, list[float]] | None = None # Action key -> [visits, total raw reward], created by the tree policy
+
+    def expand(self, transpositions: TranspositionTable[S, UctTreeNode[A, S]] | None = None) -> RaveTreeNode[A, S] | None:
+        # The AMAF updates follow the parent links, so the nodes cannot be shared by transpositions
+        if transpositions is not None:
+            raise ValueError("RAVE is not supported together with transpositions")
+
+        try:
+            action = next(self._children_iter)
+            new_state = self.state.play(action)
+        except StopIteration:
+            self._exhausted = True
+            return None
+
+        new_node = RaveTreeNode(new_state, self)
+        new_node.key = self.state.action_key(action)
+        self.children.append(new_node)
+        return new_node
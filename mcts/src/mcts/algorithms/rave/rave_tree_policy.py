@@ -0,0 +1,102 @@
+from collections.abc import Callable, Hashable
+from math import inf, log, sqrt
+from typing import Any, cast
+
+from mcts.algorithms.rave.rave_default_policy import RaveResult
+from mcts.algorithms.rave.rave_tree_node import RaveTreeNode
+from mcts.algorithms.uct.uct_tree_node import UctTreeNode
+from mcts.algorithms.uct.uct_tree_policy import UctTreePolicy
+from mcts.interfaces import State
+from mcts.other.node_budget import NodeBudget
+
+
+class RaveTreePolicy[A, S: State[Any, float, float]](UctTreePolicy[A, S, RaveResult]):
+    # UCT with RAVE over RaveTreeNode trees and the results of RaveDefaultPolicy. The AMAF value of a child
+    # is read from the table of the closest ancestor with at least ref visits (GRAVE), since the action of
+    # a child of a coloring state is always played first below its parent and only the tables of the
+    # ancestors see it played from other positions. It is blended into the exploitation term with
+    # beta = N_amaf / (N + N_amaf + rave_bias * N * N_amaf), which decays as the child gets visits
+    ref: int # Visits from which a node keeps an AMAF table and can be used as a reference
+    rave_bias: float
+
+    _table_owner: RaveTreeNode[A, S] | None # Parent whose reference table is cached in _table
+    _table: dict[Hashable, list[float]] | None
+
+    def __init__(self, heuristic: Callable[[S], float] | None = None, c_p = 1 / sqrt(2), c_h = 0.1, c_r = 0.0, seed: int | float | str | bytes | bytearray | None = None,
+            virtual_loss: float = 1.0, solver: bool = False, budget: NodeBudget | None = None, widening: float = -1, c_w: float = 1.0,
+            ordered_expansion: bool = False, ref: int = 50, rave_bias: float = 1e-3):
+        super().__init__(heuristic, c_p, c_h, c_r, seed, None, virtual_loss, solver, budget, widening, c_w, ordered_expansion)
+        self.ref = ref
+        self.rave_bias = rave_bias
+        self._table_owner = None
+        self._table = None
+
+    def reference_table(self, parent: RaveTreeNode[A, S]) -> dict[Hashable, list[float]] | None:
+        # Cached for the consecutive calls that score the children of the same parent
+        if parent is not self._table_owner:
+            node: RaveTreeNode[A, S] | None = parent
+
+            while node is not None and node.amaf is None:
+                node = node.parent
+
+            self._table_owner = parent
+            self._table = node.amaf if node is not None else None
+
+        return self._table
+
+    def compute_uct(self, n: int, node: UctTreeNode[A, S] | None) -> float:
+        if node is None or node.N == 0:
+            return inf
+
+        node = cast("RaveTreeNode[A, S]", node)
+        exploit_term = node.W / node.N
+        table = self.reference_table(node.parent) if node.parent is not None else None
+        stats = table.get(node.key) if table is not None else None
+
+        if stats is not None:
+            # The tables keep raw rewards, the interpretations of the sample states are linear
+            amaf_n, amaf_w = stats
+            beta = amaf_n / (node.N + amaf_n + self.rave_bias * node.N * amaf_n)
+            exploit_term = (1 - beta) * exploit_term + beta * node.state.interpret_reward(amaf_w / amaf_n)
+
+        exploration_term = sqrt(log(n) / node.N)
+        heuristic_term = self.heuristic(node.state) if self.heuristic != None else 0
+        random_term = (self.random_gen.random() / n)
+
+        return exploit_term + (self.c_p * exploration_term) + (self.c_h * heuristic_term) + (self.c_r * random_term)
+
+    def backpropagate(self, node: UctTreeNode[A, S] | None, result: RaveResult) -> None:
+        super().backpropagate(node, result)
+
+        # Each table gets the actions played below its node, in the rollouts and then on the tree path
+        rollouts = [(reward, set(keys)) for reward, keys in result[2]]
+        rave_node = cast("RaveTreeNode[A, S] | None", node)
+
+        while rave_node is not None:
+            if rave_node.amaf is None and rave_node.N >= self.ref:
+                rave_node.amaf = {}
+
+            if rave_node.amaf is not None:
+                table = rave_node.amaf
+
+                for reward, keys in rollouts:
+                    for key in keys:
+                        stats = table.get(key)
+
+                        if stats is None:
+                            table[key] = [1, reward]
+                        else:
+                            stats[0] += 1
+                            stats[1] += reward
+
+            if rave_node.key is not None:
+                for _, keys in rollouts:
+                    keys.add(rave_node.key)
+
+            rave_node = rave_node.parent
+
+        self._table_owner = None
+
+    def restore(self, root: UctTreeNode[A, S], data: Any) -> None:
+        super().restore(root, data)
+        self._table_owner = None
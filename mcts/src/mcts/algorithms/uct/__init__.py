@@ -1,4 +1,4 @@
-from mcts.algorithms.uct.uct_default_policy import UctDefaultPolicy
+from mcts.algorithms.uct.uct_default_policy import LeafEvaluation, UctDefaultPolicy
 from mcts.algorithms.uct.uct_tree_node import UctTreeNode
 from mcts.algorithms.uct.uct_tree_policy import UctTreePolicy
 from mcts import MonteCarloTreeSearch
@@ -15,6 +15,7 @@ from mcts import MonteCarloTreeSearch
 #         super().__init__(self.tree_policy, self.default_policy)
 
 __all__ = [
+    "LeafEvaluation",
     "UctDefaultPolicy",
     "UctTreeNode",
     "UctTreePolicy"
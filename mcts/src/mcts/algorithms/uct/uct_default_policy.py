@@ -1,53 +1,264 @@
 from collections.abc import Callable
+from enum import Enum
 from math import inf
 from random import Random
-from multiprocessing import cpu_count
 from multiprocessing.pool import Pool
 from typing import Any
 
-from mcts.algorithms.ag.ag_tree_node import AgTreeNode
 from mcts.algorithms.opt.opt_tree_node import OptTreeNode
 from mcts.monte_carlo_tree_search import DefaultPolicy
 from mcts.interfaces import State
 from mcts.algorithms.uct.uct_tree_node import UctTreeNode
 from mcts.other.solutions import Solutions
+from mcts.other.state_node import StateNode
 
-class UctDefaultPolicy[A, S: State[Any, float, float]](DefaultPolicy[UctTreeNode[A, S] | OptTreeNode[A, S] | AgTreeNode[A, S], tuple[float, int]]):
+# Data loaded once in each rollout worker by the pool initializer
+_worker_state_type: type[State] | None = None
+_worker_context: Any = None
+_worker_heur: Callable[[Any, list[Any]], list[float]] | None = None
+
+def _init_rollout_worker(state_type: type[State], context: Any, heur: Callable[[Any, list[Any]], list[float]] | None) -> None:
+    global _worker_state_type, _worker_context, _worker_heur
+    _worker_state_type = state_type
+    _worker_context = context
+    _worker_heur = heur
+
+def _run_encoded_simulation(data: Any, seed: int) -> tuple[Any, float]:
+    # Receives the encoded leaf state and returns the encoded terminal state
+    assert _worker_state_type is not None
+    state = _worker_state_type.decode(_worker_context, data)
+    final_state, reward = UctDefaultPolicy.run_simulation(StateNode(state), _worker_heur, Random(seed))
+    return final_state.encode(), reward
+
+class LeafEvaluation(Enum):
+    # How the rewards of the n_sims rollouts of a leaf are aggregated, rewards are ranked by the
+    # interpretation of the leaf state
+    MEAN = 0 # Mean reward of the rollouts
+    MAX = 1 # Best reward of the rollouts
+    TOP_K = 2 # Mean reward of the top_k best rollouts
+
+class UctDefaultPolicy[A, S: State[Any, float, float]](DefaultPolicy[UctTreeNode[A, S] | OptTreeNode[A, S] | StateNode[S], tuple[float, int]]):
     heur: Callable[[S, list[A]], list[float]] | None
     random_gen: Random
     solutions: Solutions | None
-    pool: Pool | None
+    n_threads: int
+    evaluation: LeafEvaluation
+    top_k: int
+    cut_off: bool # With MAX and TOP_K, stops a rollout once its reward bound cannot enter the kept rewards
+    pool: Pool | None # Created on the first simulation, once the shared context of the states is known
+
+    _pool_context: Any # Shared context the pool workers were initialized with
+
+    def __init__(self, n_sims = 1, n_threads = 1, heuristic: Callable[[S, list[A]], list[float]] | None = None, solutions: Solutions | None = None, seed: int | float | str | bytes | bytearray | None = None,
+            evaluation: LeafEvaluation = LeafEvaluation.MEAN, top_k: int = 1, cut_off: bool = True) -> None:
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
 
-    def __init__(self, n_sims = 1, n_threads = 1, heuristic: Callable[[S, list[A]], list[float]] | None = None, solutions: Solutions | None = None, seed: int | float | str | bytes | bytearray | None = None) -> None:
         self.best_solution = (None, -inf)
         self.random_gen = Random(seed)
         self.n_sims = n_sims
         self.heur = heuristic
         self.solutions = solutions
-        self.pool = Pool(n_threads) if n_threads > 1 else None
+        self.n_threads = n_threads
+        self.evaluation = evaluation
+        self.top_k = top_k
+        self.cut_off = cut_off
+        self.pool = None
+        self._pool_context = None
 
     @staticmethod
-    def run_simulation(node: UctTreeNode[A, S] | OptTreeNode[A, S] | AgTreeNode[A, S], heur: Callable[[S, list[A]], list[float]] | None, random_gen: Random) -> tuple[S, float]:
+    def run_simulation(node: UctTreeNode[A, S] | OptTreeNode[A, S] | StateNode[S], heur: Callable[[S, list[A]], list[float]] | None, random_gen: Random,
+            hook: Callable[[int, bool], None] | None = None) -> tuple[S, float]:
+        # hook, if given, receives the number of actions played, see DefaultPolicy.rollout_hook
         cur_state = node.state
-        
-        while not cur_state.is_terminal():
-            actions = [a for a in cur_state.actions_default()]
-            weights = heur(node.state, actions) if heur is not None else None
+        in_place = cur_state.supports_rollout()
+        steps = 0
+
+        if in_place:
+            # The rollout is played in place on a single mutable copy of the leaf state
+            cur_state = cur_state.clone_for_rollout()
 
-            action = random_gen.choices(actions, weights)[0]
-            cur_state = cur_state.play(action)
+            while not cur_state.is_terminal():
+                actions = [a for a in cur_state.actions_default()]
+                weights = heur(node.state, actions) if heur is not None else None
+
+                cur_state.apply(random_gen.choices(actions, weights)[0])
+                steps += 1
+        else:
+            while not cur_state.is_terminal():
+                actions = [a for a in cur_state.actions_default()]
+                weights = heur(node.state, actions) if heur is not None else None
+
+                action = random_gen.choices(actions, weights)[0]
+                cur_state = cur_state.play(action)
+                steps += 1
+
+        if hook is not None:
+            hook(steps, in_place)
 
         reward = cur_state.get_reward()
 
         return cur_state, reward
 
-    def simulate(self, node: UctTreeNode[A, S] | OptTreeNode[A, S] | AgTreeNode[A, S]) -> tuple[float, int]:
+    @staticmethod
+    def run_cut_simulation(node: UctTreeNode[A, S] | OptTreeNode[A, S] | StateNode[S], heur: Callable[[S, list[A]], list[float]] | None, random_gen: Random,
+            threshold: float, hook: Callable[[int, bool], None] | None = None) -> tuple[S, float] | None:
+        # Same rollout as run_simulation, abandoned (None) once the reward bound of its state shows that it
+        # cannot end above threshold. The bound interprets rewards like the leaf state, as the graph states do
+        cur_state = node.state
+        in_place = cur_state.supports_rollout()
+        steps = 0
+
+        if in_place:
+            cur_state = cur_state.clone_for_rollout()
+
+            while not cur_state.is_terminal():
+                if (bound := cur_state.reward_bound()) is not None and bound <= threshold:
+                    break
+
+                actions = [a for a in cur_state.actions_default()]
+                weights = heur(node.state, actions) if heur is not None else None
+
+                cur_state.apply(random_gen.choices(actions, weights)[0])
+                steps += 1
+        else:
+            while not cur_state.is_terminal():
+                if (bound := cur_state.reward_bound()) is not None and bound <= threshold:
+                    break
+
+                actions = [a for a in cur_state.actions_default()]
+                weights = heur(node.state, actions) if heur is not None else None
+
+                action = random_gen.choices(actions, weights)[0]
+                cur_state = cur_state.play(action)
+                steps += 1
+
+        if hook is not None:
+            hook(steps, in_place)
+
+        return (cur_state, cur_state.get_reward()) if cur_state.is_terminal() else None
+
+    def get_pool(self, state: S) -> Pool:
+        # The workers keep the shared context (e.g. the graph) so only the leaf state is sent per task
+        context = state.shared_context() if state.supports_encoding() else None
+
+        if self.pool is not None and context is not self._pool_context:
+            self.close()
+
+        if self.pool is None:
+            initargs = (type(state), context, self.heur) if state.supports_encoding() else (type(state), None, None)
+            self.pool = Pool(self.n_threads, _init_rollout_worker, initargs)
+            self._pool_context = context
+
+        return self.pool
+
+    def close(self) -> None:
         if self.pool is not None:
-            results = self.pool.starmap(self.run_simulation, [(node, self.heur, self.random_gen)] * self.n_sims)
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+            self._pool_context = None
+
+    def simulate_parallel(self, state: S) -> list[tuple[S, float]]:
+        return self.simulate_parallel_batch([state])[0]
+
+    def simulate_parallel_batch(self, states: list[S]) -> list[list[tuple[S, float]]]:
+        # The rollouts of every state go to the pool in a single call, the results are grouped by state
+        pool = self.get_pool(states[0])
+        # Each task gets its own seed, otherwise every worker would repeat the same rollout
+        seeds = [self.random_gen.getrandbits(64) for _ in range(self.n_sims * len(states))]
+        tasks = [state for state in states for _ in range(self.n_sims)]
+
+        if not states[0].supports_encoding():
+            flat = pool.starmap(self.run_simulation, [(StateNode(state), self.heur, Random(seed)) for state, seed in zip(tasks, seeds)])
+        else:
+            encoded_results = pool.starmap(_run_encoded_simulation, [(state.encode(), seed) for state, seed in zip(tasks, seeds)])
+            flat = []
+
+            for state, (data, reward) in zip(tasks, encoded_results):
+                # Terminal states are only decoded when the solutions need them
+                if self.solutions is not None and self.solutions.accepts(reward):
+                    flat.append((type(state).decode(self._pool_context, data), reward))
+                else:
+                    flat.append((state, reward))
+
+        return [flat[i * self.n_sims:(i + 1) * self.n_sims] for i in range(len(states))]
+
+    def n_kept(self) -> int:
+        # Number of best rewards that make the value of a leaf
+        if self.evaluation == LeafEvaluation.MAX:
+            return 1
+        elif self.evaluation == LeafEvaluation.TOP_K:
+            return self.top_k
+
+        return self.n_sims
+
+    def simulate_kept(self, node: UctTreeNode[A, S] | OptTreeNode[A, S] | StateNode[S]) -> list[tuple[S, float]]:
+        # Once n_kept rollouts are done, the next ones only matter if they beat the worst kept reward, so
+        # they are cut off against it. The abandoned rollouts are left out of the results
+        k = self.n_kept()
+        kept: list[float] = [] # Interpreted rewards of the best rollouts so far, in decreasing order
+        results: list[tuple[S, float]] = []
+        result: tuple[S, float] | None # None for an abandoned rollout
+
+        for _ in range(self.n_sims):
+            if len(kept) < k:
+                result = self.run_simulation(node, self.heur, self.random_gen, self.rollout_hook)
+            else:
+                result = self.run_cut_simulation(node, self.heur, self.random_gen, kept[-1], self.rollout_hook)
+
+            if result is not None:
+                results.append(result)
+                kept = sorted(kept + [node.state.interpret_reward(result[1])], reverse=True)[:k]
+
+        return results
+
+    def evaluate(self, state: S, rewards: list[float]) -> float:
+        # Total reward of the leaf over its n_sims rollouts, so that backpropagate still adds n_sims visits
+        if self.evaluation == LeafEvaluation.MEAN:
+            return sum(rewards)
+
+        best = sorted(rewards, key=state.interpret_reward, reverse=True)[:self.n_kept()]
+
+        return self.n_sims * sum(best) / len(best)
+
+    def simulate(self, node: UctTreeNode[A, S] | OptTreeNode[A, S] | StateNode[S]) -> tuple[float, int]:
+        if self.n_threads > 1:
+            results = self.simulate_parallel(node.state)
+        elif self.cut_off and self.n_kept() < self.n_sims:
+            results = self.simulate_kept(node)
         else:
-            results = [self.run_simulation(node, self.heur, self.random_gen) for _ in range(self.n_sims)]
-    
+            results = [self.run_simulation(node, self.heur, self.random_gen, self.rollout_hook) for _ in range(self.n_sims)]
+
         if self.solutions is not None:
             self.solutions.add_solutions(results)
 
-        return (sum(res[1] for res in results), self.n_sims)
\ No newline at end of file
+        return (self.evaluate(node.state, [res[1] for res in results]), self.n_sims)
+
+    def simulate_batch(self, nodes: list[UctTreeNode[A, S] | OptTreeNode[A, S] | StateNode[S]]) -> list[tuple[float, int]]:
+        # With a pool, the rollouts of all the leaves are dispatched together
+        if self.n_threads <= 1:
+            return super().simulate_batch(nodes)
+
+        batch_results = self.simulate_parallel_batch([node.state for node in nodes])
+        evaluations = []
+
+        for node, results in zip(nodes, batch_results):
+            if self.solutions is not None:
+                self.solutions.add_solutions(results)
+
+            evaluations.append((self.evaluate(node.state, [res[1] for res in results]), self.n_sims))
+
+        return evaluations
+
+    def checkpoint(self) -> Any:
+        # The random generators of the pool workers are not saved, with n_threads above 1 a resumed search
+        # draws other rollouts than an uninterrupted one
+        return (self.random_gen.getstate(), self.best_solution, self.solutions)
+
+    def restore(self, data: Any) -> None:
+        random_state, self.best_solution, solutions = data
+        self.random_gen.setstate(random_state)
+
+        if self.solutions is not None and solutions is not None:
+            self.solutions.restore(solutions)
@@ -1,6 +1,7 @@
 from collections.abc import Iterator
 from mcts.interfaces import State
-from typing import Any
+from mcts.other.transposition_table import TranspositionTable
+from typing import Any, cast
 
 
 class UctTreeNode[A, S: State[Any, float, float]]:
@@ -9,8 +10,12 @@ class UctTreeNode[A, S: State[Any, float, float]]:
     W: float # Total reward
     parent: UctTreeNode[A, S] | None # Parent of the node or None if this node is the root
     children: list[UctTreeNode[A, S]]
+    solved_reward: float | None = None # Reward under best play, set by the solver once every completion has been explored
 
     _children_iter: Iterator[A]
+    _exhausted: bool = False # Whether every action has been expanded
+    _ordered: bool = False # Whether the remaining actions are sorted by priority
+    _virtual_losses: list[float] | None = None # Rewards of the pending virtual visits, unset until used
 
     def __init__(self, state: S, parent: UctTreeNode[A, S] | None = None):
         self.state = state
@@ -24,23 +29,106 @@ class UctTreeNode[A, S: State[Any, float, float]]:
         self.N += result[1]
         self.W += self.state.interpret_reward(result[0])
 
+    def add_virtual_loss(self, penalty: float) -> None:
+        # A pending visit that scores penalty below the current mean, or -penalty on an unvisited node, so
+        # that the node is not selected again as an unvisited one before its result is known
+        reward = (self.W / self.N if self.N > 0 else 0.0) - penalty
+        self.N += 1
+        self.W += reward
+
+        if self._virtual_losses is None:
+            self._virtual_losses = []
+
+        self._virtual_losses.append(reward)
+
+    def remove_virtual_loss(self) -> None:
+        if not self._virtual_losses:
+            return
+
+        reward = self._virtual_losses.pop()
+        self.N -= 1
+        self.W -= reward
+
+        if not self._virtual_losses:
+            self.reset_virtual_losses()
+
+    def reset_virtual_losses(self) -> None:
+        # Undoes the pending virtual losses and releases their list
+        while self._virtual_losses:
+            self.N -= 1
+            self.W -= self._virtual_losses.pop()
+
+        self._virtual_losses = None
+
     def add_child(self, state: S) -> UctTreeNode[A, S]:
         new_node = UctTreeNode(state, self)
         self.children.append(new_node)
         return new_node
     
-    def expand(self) -> UctTreeNode[A, S] | None:
+    def expand(self, transpositions: TranspositionTable[S, UctTreeNode[A, S]] | None = None) -> UctTreeNode[A, S] | None:
         try:
             action = next(self._children_iter)
             new_state = self.state.play(action)
-            return self.add_child(new_state)
         except StopIteration:
+            self._exhausted = True
             return None
 
+        if transpositions is None:
+            return self.add_child(new_state)
+
+        # The node of an equal state is shared instead of growing a new subtree, it keeps its first parent
+        shared_node = transpositions.get(new_state)
+
+        if shared_node is not None:
+            transpositions.reused_visits += shared_node.N
+            self.children.append(shared_node)
+            return shared_node
+
+        new_node = self.add_child(new_state)
+        transpositions.put(new_state, new_node)
+        return new_node
+
+    def collapse(self) -> int:
+        # Releases the subtree, the node keeps its statistics and expands its actions again. Returns the
+        # number of released children
+        released = len(self.children)
+        self.children = []
+        self._children_iter = self.state.actions_tree()
+        self._exhausted = False
+        self._ordered = False
+        return released
+
+    def order_actions(self) -> None:
+        # Expands the actions by decreasing State.action_priority, ties keep the order of the iterator. Called
+        # before the first expansion, as the action iterators restart when they are iterated again
+        if not self._ordered:
+            self._children_iter = iter(sorted(self._children_iter, key=self.state.action_priority, reverse=True))
+            self._ordered = True
+
     def is_terminal(self) -> bool:
         return self.state.is_terminal()
 
+    def try_solve(self) -> bool:
+        # A node is solved when it is terminal or when it is fully expanded and all its children are solved,
+        # its reward is then the one of the child that is best for the player choosing among them
+        if self.solved_reward is not None:
+            return True
+
+        if self.state.is_terminal():
+            self.solved_reward = self.state.get_reward()
+            return True
+
+        if not self._exhausted or any(child.solved_reward is None for child in self.children):
+            return False
+
+        best_child = max(self.children, key=lambda child: child.state.interpret_reward(cast(float, child.solved_reward)))
+        self.solved_reward = best_child.solved_reward
+        return True
+
     def estimated_value(self):
+        if self.solved_reward is not None:
+            return self.state.interpret_reward(self.solved_reward)
+
         return self.W / self.N if self.N > 0 else 0
 
     def best_child(self) -> UctTreeNode[A, S]:
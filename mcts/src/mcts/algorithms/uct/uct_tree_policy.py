@@ -1,25 +1,51 @@
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from math import inf, log, sqrt
 from random import Random
 
 from mcts.interfaces import TreePolicy
 from mcts.interfaces.state import State
 from mcts.algorithms.uct.uct_tree_node import UctTreeNode
+from mcts.other.node_budget import NodeBudget
+from mcts.other.transposition_table import TranspositionTable
 from typing import Any
 
-class UctTreePolicy[A, S: State[Any, float, float]](TreePolicy[UctTreeNode[A, S], tuple[float, int]]):
+class UctTreePolicy[A, S: State[Any, float, float], R: tuple[float, int, *tuple[Any, ...]] = tuple[float, int]](TreePolicy[UctTreeNode[A, S], R]):
+    # R is the result of the default policy, (reward, number of rollouts) followed by the data a subclass
+    # needs, e.g. the played actions of RaveResult
     heuristic: Callable[[S], float] | None
     c_p: float
     c_h: float
     c_r: float
     random_gen: Random
+    transpositions: TranspositionTable[S, UctTreeNode[A, S]] | None # Turns the tree into a DAG over equal states
+    virtual_loss: float # Reward below the mean given to pending visits when several leaves are selected at once
+    solver: bool # Marks exhausted subtrees as solved, selection skips them and the search stops once the root is solved
+    budget: NodeBudget | None # Bounds the number of nodes, the least visited subtrees are recycled past the limit
+    widening: float # Progressive widening exponent, a node of N visits has at most max(1, floor(c_w * N^widening)) children, -1 to disable
+    c_w: float
+    ordered_expansion: bool # Expands the children by decreasing State.action_priority
+
+    _path: list[UctTreeNode[A, S]] # Nodes visited by the current descent, used to backpropagate in a DAG
+
+    def __init__(self, heuristic: Callable[[S], float] | None = None, c_p = 1 / sqrt(2), c_h = 0.1, c_r = 0.0, seed: int | float | str | bytes | bytearray | None = None, transpositions: TranspositionTable[S, UctTreeNode[A, S]] | None = None, virtual_loss: float = 1.0,
+            solver: bool = False, budget: NodeBudget | None = None,
+            widening: float = -1, c_w: float = 1.0, ordered_expansion: bool = False):
+        if budget is not None and transpositions is not None:
+            raise ValueError("A node budget is not supported together with transpositions")
 
-    def __init__(self, heuristic: Callable[[S], float] | None = None, c_p = 1 / sqrt(2), c_h = 0.1, c_r = 0.0, seed: int | float | str | bytes | bytearray | None = None):
         self.heuristic = heuristic
         self.c_p = c_p
         self.c_h = c_h
         self.c_r = c_r
         self.random_gen = Random(seed)
+        self.transpositions = transpositions
+        self.virtual_loss = virtual_loss
+        self.solver = solver
+        self.budget = budget
+        self.widening = widening
+        self.c_w = c_w
+        self.ordered_expansion = ordered_expansion
+        self._path = []
 
     def compute_uct(self, n: int, node: UctTreeNode[A, S] | None) -> float:
         if node is None or node.N == 0:
@@ -33,13 +59,22 @@ class UctTreePolicy[A, S: State[Any, float, float]](TreePolicy[UctTreeNode[A, S]
         return exploit_term + (self.c_p * exploration_term) + (self.c_h * heuristic_term) + (self.c_r * random_term)
 
     def tree_policy(self, node: UctTreeNode[A, S]) -> UctTreeNode[A, S]:
+        if self.solver:
+            return self.solver_tree_policy(node)
+
+        if self.transpositions is not None:
+            self._path.append(node)
+
         if node.N == 0:
             return node
         
-        next_node = self.expand(node)
+        next_node = self.expand(node) if self.can_expand(node) else None
 
         if next_node is None:
             next_node =  self.select(node)
+        elif self.transpositions is not None:
+            # A shared node may already have statistics, in which case the descent continues through it
+            next_node = self.tree_policy(next_node)
 
         return next_node
 
@@ -52,10 +87,174 @@ class UctTreePolicy[A, S: State[Any, float, float]](TreePolicy[UctTreeNode[A, S]
         
         return self.tree_policy(best_node)
 
+    def solver_tree_policy(self, root: UctTreeNode[A, S]) -> UctTreeNode[A, S]:
+        # Same descent as tree_policy over the children that are not solved. A node whose children are all
+        # solved is solved too and the descent restarts from the root, which is returned once it is solved
+        while root.solved_reward is None:
+            node = root
+            self._path = []
+
+            while node.solved_reward is None:
+                if self.transpositions is not None:
+                    self._path.append(node)
+
+                if node.N == 0:
+                    return node
+
+                children = None
+
+                if self.can_expand(node):
+                    next_node = self.expand(node)
+                else:
+                    # Progressive widening only holds back the remaining actions while a child is unsolved
+                    children = [child for child in node.children if child.solved_reward is None]
+                    next_node = self.expand(node) if not children else None
+
+                if next_node is not None:
+                    if self.transpositions is None or next_node.N == 0:
+                        return next_node
+
+                    node = next_node
+                    continue
+
+                if node.state.is_terminal():
+                    return node
+
+                if children is None:
+                    children = [child for child in node.children if child.solved_reward is None]
+
+                if not children:
+                    self.solve(self.ancestors(node))
+                    break
+
+                node = max(map(lambda n: (self.compute_uct(node.N, n), n), children), key=lambda x: x[0])[1]
+
+        return root
+
+    def ancestors(self, node: UctTreeNode[A, S] | None) -> Iterator[UctTreeNode[A, S]]:
+        # The node and its ancestors, from the node up to the root
+        if self.transpositions is not None:
+            yield from reversed(self._path)
+            return
+
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def solve(self, nodes: Iterable[UctTreeNode[A, S]]) -> None:
+        # Ancestors can only be solved once their descendant on the path is
+        for node in nodes:
+            if not node.try_solve():
+                break
+
+    def is_solved(self, node: UctTreeNode[A, S]) -> bool:
+        return node.solved_reward is not None
+
+    def can_expand(self, node: UctTreeNode[A, S]) -> bool:
+        # Progressive widening, the k-th child is only added once c_w * N^widening reaches k
+        return self.widening < 0 or not node.children or len(node.children) + 1 <= self.c_w * node.N ** self.widening
+
     def expand(self, node: UctTreeNode[A, S]) -> UctTreeNode[A, S] | None:
-        return node.expand()
+        if self.ordered_expansion:
+            node.order_actions()
+
+        new_node = node.expand(self.transpositions)
+
+        if new_node is not None and self.budget is not None:
+            self.budget.add()
+
+        return new_node
+
+    def backpropagate(self, node: UctTreeNode[A, S] | None, result: R) -> None:
+        if self.solver:
+            self.solve(self.ancestors(node))
+
+        if self.transpositions is not None:
+            # Parent links only follow the first path to a shared node, so the descent path is used instead
+            for path_node in self._path:
+                path_node.update(result)
+
+            self._path = []
+            return
+
+        leaf = node
 
-    def backpropagate(self, node: UctTreeNode[A, S] | None, result: tuple[float, int]) -> None:
         while node != None:
             node.update(result)
+            node = node.parent
+
+        if self.budget is not None and self.budget.is_full():
+            root = leaf
+
+            while root is not None and root.parent is not None:
+                root = root.parent
+
+            self.budget.recycle(root)
+
+    def reroot(self, root: UctTreeNode[A, S], action: A) -> UctTreeNode[A, S]:
+        # Children do not keep their action, so the child is matched on the state it leads to. A child that
+        # was not expanded yet becomes a fresh root
+        new_state = root.state.play(action)
+        new_root = next((child for child in root.children if child.state == new_state), None)
+
+        if new_root is None:
+            new_root = type(root)(new_state)
+
+        new_root.parent = None
+        root.children = []
+        self._path = []
+
+        if self.budget is not None:
+            self.budget.recount(new_root)
+
+        if self.transpositions is not None:
+            # Only the nodes below the new root stay shared. A shared node whose first parent was released
+            # takes the parent it is reached from, so that it does not keep the released subtree alive
+            self.transpositions.clear()
+            self.transpositions.put(new_root.state, new_root)
+            seen = {id(new_root)}
+            stack = [new_root]
+
+            while stack:
+                node = stack.pop()
+
+                for child in node.children:
+                    if id(child) not in seen:
+                        seen.add(id(child))
+                        child.parent = node
+                        self.transpositions.put(child.state, child)
+                        stack.append(child)
+
+        return new_root
+
+    def checkpoint(self) -> Any:
+        return self.random_gen.getstate()
+
+    def restore(self, root: UctTreeNode[A, S], data: Any) -> None:
+        self.random_gen.setstate(data)
+        self._path = []
+
+        if self.budget is not None:
+            self.budget.recount(root)
+
+        if self.transpositions is not None:
+            # A loaded tree has no shared nodes, each node is the one of its state
+            self.transpositions.clear()
+
+            for node in NodeBudget.nodes(root):
+                self.transpositions.put(node.state, node)
+
+    def add_virtual_loss(self, node: UctTreeNode[A, S] | None) -> float:
+        if self.transpositions is not None:
+            raise ValueError("Virtual loss is not supported together with transpositions")
+
+        while node != None:
+            node.add_virtual_loss(self.virtual_loss)
+            node = node.parent
+
+        return self.virtual_loss
+
+    def remove_virtual_loss(self, node: UctTreeNode[A, S] | None, value: float) -> None:
+        while node != None:
+            node.remove_virtual_loss()
             node = node.parent
\ No newline at end of file
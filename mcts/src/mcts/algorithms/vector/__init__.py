@@ -0,0 +1,11 @@
+from mcts.algorithms.vector.opt_vector_tree_node import OptVectorTreeNode
+from mcts.algorithms.vector.opt_vector_tree_policy import OptVectorTreePolicy
+from mcts.algorithms.vector.uct_vector_tree_node import UctVectorTreeNode
+from mcts.algorithms.vector.uct_vector_tree_policy import UctVectorTreePolicy
+
+__all__ = [
+    "OptVectorTreeNode",
+    "OptVectorTreePolicy",
+    "UctVectorTreeNode",
+    "UctVectorTreePolicy"
+]
\ No newline at end of file
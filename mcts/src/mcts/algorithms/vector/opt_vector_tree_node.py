@@ -0,0 +1,45 @@
+from array import array
+from typing import Any
+
+from mcts.algorithms.opt.opt_tree_node import OptTreeNode
+from mcts.interfaces import State
+
+
+class OptVectorTreeNode[A, S: State[Any, float, float]](OptTreeNode[A, S]):
+    # OptTreeNode that mirrors the N and best solution of its children in contiguous arrays, read by
+    # OptVectorTreePolicy. As with UctVectorTreeNode, the nodes cannot be shared by transpositions
+    parent: OptVectorTreeNode[A, S] | None
+    child_N: array[float]
+    child_best: array[float]
+
+    _index: int # Position among the children of the parent
+
+    def __init__(self, state: S, parent: OptVectorTreeNode[A, S] | None = None, index: int = -1):
+        super().__init__(state, parent)
+        self.child_N = array("d")
+        self.child_best = array("d")
+        self._index = index
+
+    def sync(self) -> None:
+        # Also called by the tree policy, which changes N directly for virtual losses
+        if self.parent is not None:
+            self.parent.child_N[self._index] = self.N
+            self.parent.child_best[self._index] = self.best_solution
+
+    def update(self, result: tuple[float, int]) -> None:
+        super().update(result)
+        self.sync()
+
+    def add_child(self, action: A) -> OptVectorTreeNode[A, S]:
+        self.child_N.append(0)
+        self.child_best.append(0)
+
+        new_node = OptVectorTreeNode(self.state.play(action), self, len(self.children))
+        self.children.append((action, new_node))
+        new_node.sync()
+        return new_node
+
+    def collapse(self) -> int:
+        self.child_N = array("d")
+        self.child_best = array("d")
+        return super().collapse()
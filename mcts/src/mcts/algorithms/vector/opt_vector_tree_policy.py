@@ -0,0 +1,83 @@
+from math import inf, log, sqrt
+from typing import Any, cast
+
+import numpy as np
+
+from mcts.algorithms.opt.opt_tree_node import OptTreeNode
+from mcts.algorithms.opt.opt_tree_policy import OptTreePolicy
+from mcts.algorithms.vector.opt_vector_tree_node import OptVectorTreeNode
+from mcts.interfaces import State
+from mcts.other.node_budget import NodeBudget
+
+
+class OptVectorTreePolicy[A, S: State[Any, float, float]](OptTreePolicy[A, S]):
+    # Same choices as OptTreePolicy, with the scores of all the children computed in one pass over the
+    # arrays of an OptVectorTreeNode, with NumPy from vector_threshold children on. The random numbers
+    # are only drawn when c_r is not 0
+    vector_threshold: int
+
+    def __init__(self, c_p = 1 / sqrt(2), c_h = 0.1, c_r = 0.0, seed: int | float | str | bytes | bytearray | None = None, vector_threshold: int = 64):
+        super().__init__(c_p, c_h, c_r, seed, None)
+        self.vector_threshold = vector_threshold
+
+    def select(self, node: OptTreeNode[A, S]) -> OptTreeNode[A, S]:
+        if node.state.is_terminal():
+            return node
+
+        # The string form avoids subscripting the generic class at runtime on every level
+        node = cast("OptVectorTreeNode[A, S]", node)
+
+        if node.best_solution <= node.worst_solution:
+            # Every child scores 0, the first one wins
+            return self.tree_policy(node.children[0][1])
+
+        k = len(node.children)
+        randoms = [self.random_gen.random() for _ in range(k)] if self.c_r != 0 else None
+
+        if k == 1:
+            return self.tree_policy(node.children[0][1])
+
+        # Same operations, in the same order, as compute_uct so the scores are bit for bit equal
+        worst = node.worst_solution
+        spread = node.best_solution - worst
+        log_n = 2.0 * log(node.N)
+
+        if k >= self.vector_threshold:
+            best = np.frombuffer(node.child_best)
+            scores = (np.where(best > -inf, best, worst) - worst) / spread
+            scores += self.c_p * np.sqrt(log_n / np.frombuffer(node.child_N))
+
+            if randoms is not None:
+                scores += self.c_r * (np.array(randoms) / node.N)
+
+            return self.tree_policy(node.children[int(scores.argmax())][1])
+
+        c_p = self.c_p
+        values = [((best if best > -inf else worst) - worst) / spread + c_p * sqrt(log_n / n) for best, n in zip(node.child_best, node.child_N)]
+
+        if randoms is not None:
+            c_r, parent_n = self.c_r, node.N
+            values = [value + c_r * (r / parent_n) for value, r in zip(values, randoms)]
+
+        return self.tree_policy(node.children[values.index(max(values))][1])
+
+    def add_virtual_loss(self, node: OptTreeNode[A, S] | None) -> float:
+        value = super().add_virtual_loss(node)
+        self._sync_path(node)
+        return value
+
+    def remove_virtual_loss(self, node: OptTreeNode[A, S] | None, value: float) -> None:
+        super().remove_virtual_loss(node, value)
+        self._sync_path(node)
+
+    def _sync_path(self, node: OptTreeNode[A, S] | None) -> None:
+        while node is not None:
+            cast("OptVectorTreeNode[A, S]", node).sync()
+            node = node.parent
+
+    def restore(self, root: OptTreeNode[A, S], data: Any) -> None:
+        # The loaded nodes are created with zeroed arrays, each child writes its statistics to its parent
+        super().restore(root, data)
+
+        for node in NodeBudget.nodes(root):
+            cast("OptVectorTreeNode[A, S]", node).sync()
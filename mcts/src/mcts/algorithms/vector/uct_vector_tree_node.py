@@ -0,0 +1,60 @@
+from array import array
+from typing import Any
+
+from mcts.algorithms.uct.uct_tree_node import UctTreeNode
+from mcts.interfaces import State
+
+
+class UctVectorTreeNode[A, S: State[Any, float, float]](UctTreeNode[A, S]):
+    # UctTreeNode that mirrors the N and W of its children in contiguous arrays, which are read by
+    # UctVectorTreePolicy to score all the children at once. A child writes its statistics to the arrays
+    # of its parent whenever they change, so the nodes cannot be shared by transpositions
+    parent: UctVectorTreeNode[A, S] | None
+    child_N: array[float]
+    child_W: array[float]
+    child_H: array[float] # Heuristic value of each child, filled by the tree policy
+    n_heuristics: int # Number of children whose heuristic value is in child_H
+
+    _index: int # Position among the children of the parent
+
+    def __init__(self, state: S, parent: UctVectorTreeNode[A, S] | None = None, index: int = -1):
+        super().__init__(state, parent)
+        self.child_N = array("d")
+        self.child_W = array("d")
+        self.child_H = array("d")
+        self.n_heuristics = 0
+        self._index = index
+
+    def sync(self) -> None:
+        # Also called by the tree policy once a checkpointed tree is loaded
+        if self.parent is not None:
+            self.parent.child_N[self._index] = self.N
+            self.parent.child_W[self._index] = self.W
+
+    def update(self, result: tuple[float, int]) -> None:
+        super().update(result)
+        self.sync()
+
+    def add_virtual_loss(self, penalty: float) -> None:
+        super().add_virtual_loss(penalty)
+        self.sync()
+
+    def remove_virtual_loss(self) -> None:
+        super().remove_virtual_loss()
+        self.sync()
+
+    def add_child(self, state: S) -> UctVectorTreeNode[A, S]:
+        self.child_N.append(0)
+        self.child_W.append(0)
+        self.child_H.append(0)
+
+        new_node = UctVectorTreeNode(state, self, len(self.children))
+        self.children.append(new_node)
+        return new_node
+
+    def collapse(self) -> int:
+        self.child_N = array("d")
+        self.child_W = array("d")
+        self.child_H = array("d")
+        self.n_heuristics = 0
+        return super().collapse()
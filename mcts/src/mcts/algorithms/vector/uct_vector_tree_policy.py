@@ -0,0 +1,85 @@
+from collections.abc import Callable
+from math import log, sqrt
+from typing import Any, cast
+
+import numpy as np
+
+from mcts.algorithms.uct.uct_tree_node import UctTreeNode
+from mcts.algorithms.uct.uct_tree_policy import UctTreePolicy
+from mcts.algorithms.vector.uct_vector_tree_node import UctVectorTreeNode
+from mcts.interfaces import State
+from mcts.other.node_budget import NodeBudget
+
+
+class UctVectorTreePolicy[A, S: State[Any, float, float]](UctTreePolicy[A, S]):
+    # Same choices as UctTreePolicy, with the scores of all the children computed in one pass over the
+    # arrays of a UctVectorTreeNode, with NumPy from vector_threshold children on. The heuristic is
+    # evaluated once per child, so it must only depend on the state, and the random numbers are only
+    # drawn when c_r is not 0, as they have no effect otherwise
+    vector_threshold: int
+
+    def __init__(self, heuristic: Callable[[S], float] | None = None, c_p = 1 / sqrt(2), c_h = 0.1, c_r = 0.0, seed: int | float | str | bytes | bytearray | None = None,
+            virtual_loss: float = 1.0, vector_threshold: int = 64):
+        super().__init__(heuristic, c_p, c_h, c_r, seed, None, virtual_loss)
+        self.vector_threshold = vector_threshold
+
+    def select(self, node: UctTreeNode[A, S]) -> UctTreeNode[A, S]:
+        if node.state.is_terminal():
+            return node
+
+        # The string form avoids subscripting the generic class at runtime on every level
+        node = cast("UctVectorTreeNode[A, S]", node)
+        k = len(node.children)
+        n_unvisited = node.child_N.count(0)
+
+        # One random number per visited child, in the order compute_uct would draw them
+        randoms = [self.random_gen.random() for _ in range(k - n_unvisited)] if self.c_r != 0 else None
+
+        if k == 1:
+            return self.tree_policy(node.children[0])
+
+        if n_unvisited > 0:
+            # Unvisited children score inf, the first one wins
+            return self.tree_policy(node.children[node.child_N.index(0)])
+
+        if self.heuristic is not None:
+            for index in range(node.n_heuristics, k):
+                node.child_H[index] = self.heuristic(node.children[index].state)
+
+            node.n_heuristics = k
+
+        # Same operations, in the same order, as compute_uct so the scores are bit for bit equal
+        log_n = log(node.N)
+
+        if k >= self.vector_threshold:
+            n = np.frombuffer(node.child_N)
+            scores = np.frombuffer(node.child_W) / n
+            scores += self.c_p * np.sqrt(log_n / n)
+
+            if self.heuristic is not None:
+                scores += self.c_h * np.frombuffer(node.child_H)
+
+            if randoms is not None:
+                scores += self.c_r * (np.array(randoms) / node.N)
+
+            return self.tree_policy(node.children[int(scores.argmax())])
+
+        c_p = self.c_p
+        values = [w / n + c_p * sqrt(log_n / n) for w, n in zip(node.child_W, node.child_N)]
+
+        if self.heuristic is not None:
+            c_h = self.c_h
+            values = [value + c_h * h for value, h in zip(values, node.child_H)]
+
+        if randoms is not None:
+            c_r, parent_n = self.c_r, node.N
+            values = [value + c_r * (r / parent_n) for value, r in zip(values, randoms)]
+
+        return self.tree_policy(node.children[values.index(max(values))])
+
+    def restore(self, root: UctTreeNode[A, S], data: Any) -> None:
+        # The loaded nodes are created with zeroed arrays, each child writes its statistics to its parent
+        super().restore(root, data)
+
+        for node in NodeBudget.nodes(root):
+            cast("UctVectorTreeNode[A, S]", node).sync()
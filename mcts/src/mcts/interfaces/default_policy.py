@@ -1,7 +1,25 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
 
 
 class DefaultPolicy[T, R](ABC):
+    # Set by SearchProfiler for the duration of a run. The policies that support it call it once per
+    # rollout run in this process, with the number of actions played and whether they were applied in place
+    rollout_hook: Callable[[int, bool], None] | None = None
+
     @abstractmethod
     def simulate(self, node: T) -> R:
-        pass
\ No newline at end of file
+        pass
+
+    # Simulates the leaves of a batch, selected together with virtual loss. Policies that can share work
+    # between leaves (e.g. a pool or a vectorised engine) override it
+    def simulate_batch(self, nodes: list[T]) -> list[R]:
+        return [self.simulate(node) for node in nodes]
+
+    # Checkpoints are optional, see TreePolicy.checkpoint
+    def checkpoint(self) -> Any:
+        raise NotImplementedError(f"{type(self).__name__} does not support checkpoints")
+
+    def restore(self, data: Any) -> None:
+        raise NotImplementedError(f"{type(self).__name__} does not support checkpoints")
\ No newline at end of file
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
-from typing import Hashable, Self 
+from typing import Any, Hashable, Self 
 
 
 class State[A, R1, R2](ABC, Hashable):
@@ -30,4 +30,49 @@ class State[A, R1, R2](ABC, Hashable):
 
     @abstractmethod
     def __eq__(self, other) -> bool:
-        pass
\ No newline at end of file
+        pass
+
+    # Optional compact encoding, used to send states to other processes without the data that is
+    # shared by every state of a search (e.g. the graph), which is sent once as the shared context
+    def supports_encoding(self) -> bool:
+        return False
+
+    def shared_context(self) -> Any:
+        return None
+
+    def encode(self) -> Any:
+        raise NotImplementedError(f"{type(self).__name__} does not support encoding")
+
+    @classmethod
+    def decode(cls, context: Any, data: Any) -> Self:
+        raise NotImplementedError(f"{cls.__name__} does not support encoding")
+
+    # Optional in-place rollout mode. clone_for_rollout returns a mutable copy on which apply plays an
+    # action in place and undo reverts the last applied action. Clones are not meant to be hashed or
+    # stored in a tree, they avoid allocating a new state at every step of a rollout
+    def supports_rollout(self) -> bool:
+        return False
+
+    def clone_for_rollout(self) -> Self:
+        raise NotImplementedError(f"{type(self).__name__} does not support in-place rollouts")
+
+    def apply(self, action: A) -> None:
+        raise NotImplementedError(f"{type(self).__name__} does not support in-place rollouts")
+
+    def undo(self) -> None:
+        raise NotImplementedError(f"{type(self).__name__} does not support in-place rollouts")
+
+    # Optional priority of the actions of actions_tree, higher first. Only used by the tree policies that
+    # order their expansions, a constant priority keeps the order of the iterator
+    def action_priority(self, action: A) -> float:
+        return 0.0
+
+    # Optional identity of an action across positions, used by the AMAF statistics of RAVE. Two actions
+    # with the same key are treated as the same move (e.g. "vertex v gets color c")
+    def action_key(self, action: A) -> Hashable:
+        return action
+
+    # Optional bound for branch and bound: an upper bound on the interpreted reward of every terminal
+    # state reachable from this one, or None when it is unknown
+    def reward_bound(self) -> R2 | None:
+        return None
\ No newline at end of file
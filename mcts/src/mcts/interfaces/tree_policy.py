@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Any
 
 
 class TreePolicy[T, R](ABC):
@@ -10,4 +11,47 @@ class TreePolicy[T, R](ABC):
     def backpropagate(self, node: T, result: R) -> None:
         pass
 
+    # Virtual loss is optional, it is needed to select several leaves before their results are known.
+    # add_virtual_loss returns the value that was added, which must be given back to remove it
+    def add_virtual_loss(self, node: T) -> float:
+        raise NotImplementedError(f"{type(self).__name__} does not support virtual loss")
 
+    def remove_virtual_loss(self, node: T, value: float) -> None:
+        raise NotImplementedError(f"{type(self).__name__} does not support virtual loss")
+
+    # Selects up to n distinct leaves for a batch, each one with a virtual loss so that the next descents
+    # avoid it. A leaf selected again (e.g. a terminal node) is skipped, the batch ends early after n such
+    # repeated descents. The virtual losses must be removed before the leaves are backpropagated
+    def select_leaves(self, root: T, n: int) -> list[tuple[T, float]]:
+        leaves: list[tuple[T, float]] = []
+        selected: set[Any] = set() # Nodes hash by identity, arena nodes are indices
+        repeats = 0
+
+        while len(leaves) < n and repeats < n:
+            leaf = self.tree_policy(root)
+
+            if leaf in selected:
+                repeats += 1
+                continue
+
+            selected.add(leaf)
+            leaves.append((leaf, self.add_virtual_loss(leaf)))
+
+        return leaves
+
+    # Whether the value of the subtree of node is proven, the search stops once the root is solved
+    def is_solved(self, node: T) -> bool:
+        return False
+
+    # Tree reuse is optional, reroot commits action at root and returns the node of the resulting state
+    # as the new root, with the statistics it already has. The rest of the tree is released
+    def reroot(self, root: T, action: Any) -> T:
+        raise NotImplementedError(f"{type(self).__name__} does not support tree reuse")
+
+    # Checkpoints are optional, checkpoint returns the picklable state the policy needs to resume a saved
+    # tree (e.g. its random generator) and restore takes it back once the tree of root has been loaded
+    def checkpoint(self) -> Any:
+        raise NotImplementedError(f"{type(self).__name__} does not support checkpoints")
+
+    def restore(self, root: T, data: Any) -> None:
+        raise NotImplementedError(f"{type(self).__name__} does not support checkpoints")
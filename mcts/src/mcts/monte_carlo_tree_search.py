@@ -1,23 +1,177 @@
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
 from mcts.interfaces import TreePolicy, DefaultPolicy
+from mcts.other.run_summary import RunSummary
+from mcts.other.search_profiler import SearchProfiler
+from mcts.other.solutions import Solutions
+from mcts.other.tree_checkpoint import load_tree, save_tree
 
 class MonteCarloTreeSearch[T, R]:
+    solutions: Solutions | None # Shared with the default policy to track the best reward found
 
-    def __init__(self, tree_policy: TreePolicy[T, R], default_policy: DefaultPolicy[T, R]):
+    def __init__(self, tree_policy: TreePolicy[T, R], default_policy: DefaultPolicy[T, R], solutions: Solutions | None = None):
         self.tree_policy = tree_policy
         self.default_policy = default_policy
+        self.solutions = solutions
+
+    def best_reward(self) -> float | None:
+        if self.solutions is None or self.solutions.best_solution is None:
+            return None
+
+        return self.solutions.best_solution[1]
+
+    def run(self, root: T, max_iter: int = -1, max_time: float = -1, target_reward: float | None = None,
+            stop_callback: Callable[[RunSummary[T]], bool] | None = None, check_every: int = 1, verbose: bool = False,
+            profiler: SearchProfiler | None = None, batch_size: int = 1) -> RunSummary[T]:
+        # A negative max_iter or max_time means there is no limit on it. The deadline, target reward
+        # and stop callback are only checked every check_every iterations to keep the loop cheap. The
+        # profiler, if given, records the time of each phase of the iterations of this run. With a
+        # batch_size above 1, each step selects up to batch_size leaves with virtual loss and simulates
+        # them together, each leaf counts as an iteration
+        if max_iter < 0 and max_time < 0 and target_reward is None and stop_callback is None:
+            raise ValueError("At least one stopping criterion must be given")
+
+        if check_every < 1:
+            raise ValueError("check_every must be at least 1")
+
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1")
+
+        if target_reward is not None and self.solutions is None:
+            raise ValueError("A target reward requires a Solutions object")
+
+        summary = RunSummary(root, 0, 0.0, None)
+        t0 = perf_counter()
+        deadline = t0 + max_time if max_time >= 0 else None
+
+        if profiler is not None:
+            profiler.attach(self.tree_policy, self.default_policy)
+
+        try:
+            self._loop(root, summary, t0, deadline, max_iter, target_reward, stop_callback, check_every, verbose, profiler, batch_size)
+        finally:
+            if profiler is not None:
+                profiler.detach(root)
+
+        summary.elapsed = perf_counter() - t0
+        summary.best_reward = self.best_reward()
+
+        return summary
+
+    def _loop(self, root: T, summary: RunSummary[T], t0: float, deadline: float | None, max_iter: int, target_reward: float | None,
+            stop_callback: Callable[[RunSummary[T]], bool] | None, check_every: int, verbose: bool, profiler: SearchProfiler | None,
+            batch_size: int) -> None:
+        checks = 0 # Number of check_every multiples of n_iter already checked, batches can skip over some
+
+        while max_iter < 0 or summary.n_iter < max_iter:
+            if self.tree_policy.is_solved(root):
+                summary.solved = True
+                break
+
+            size = batch_size if max_iter < 0 else min(batch_size, max_iter - summary.n_iter)
+
+            if size > 1:
+                summary.n_iter += self.batch_iteration(root, size, profiler)
+            else:
+                if profiler is not None:
+                    profiler.begin()
+
+                node = self.tree_policy.tree_policy(root)
+
+                if profiler is not None:
+                    profiler.selected([node])
+
+                res = self.default_policy.simulate(node)
+
+                if profiler is not None:
+                    profiler.simulated([res])
+
+                self.tree_policy.backpropagate(node, res)
+
+                if profiler is not None:
+                    profiler.finished()
+
+                summary.n_iter += 1
+
+            if verbose:
+                print(f"Finished iteration {summary.n_iter}")
+
+            if summary.n_iter // check_every == checks:
+                continue
+
+            checks = summary.n_iter // check_every
+
+            now = perf_counter()
+
+            if target_reward is not None:
+                best_reward = self.best_reward()
+
+                if best_reward is not None and best_reward >= target_reward:
+                    summary.target_reached = True
+                    break
+
+            if stop_callback is not None:
+                summary.elapsed = now - t0
+                summary.best_reward = self.best_reward()
+
+                if stop_callback(summary):
+                    break
+
+            if deadline is not None and now >= deadline:
+                break
+
+    def batch_iteration(self, root: T, size: int, profiler: SearchProfiler | None = None) -> int:
+        # Selects up to size distinct leaves, simulates them together and backpropagates them once their
+        # virtual losses are removed. Returns the number of leaves
+        if profiler is not None:
+            profiler.begin()
+
+        leaves = self.tree_policy.select_leaves(root, size)
+        nodes = [leaf for leaf, _ in leaves]
+
+        if profiler is not None:
+            profiler.selected(nodes)
+
+        results = self.default_policy.simulate_batch(nodes)
+
+        if profiler is not None:
+            profiler.simulated(results)
+
+        for leaf, virtual_loss in leaves:
+            self.tree_policy.remove_virtual_loss(leaf, virtual_loss)
+
+        for (leaf, _), res in zip(leaves, results):
+            self.tree_policy.backpropagate(leaf, res)
+
+        if profiler is not None:
+            profiler.finished()
+
+        return len(leaves)
 
-    def run(self, root: T, max_iter: int, max_time: float=1000) -> T:
-        n_iter = 0
+    def advance(self, root: T, action: Any) -> T:
+        # Commits action and returns the new root to pass to the next run, the statistics of the chosen
+        # subtree are kept so the simulations already spent under it are not repeated
+        return self.tree_policy.reroot(root, action)
 
-        while n_iter < max_iter:
-            node = self.tree_policy.tree_policy(root)
+    def save(self, path: str, root: T) -> int:
+        # Checkpoints the search between two runs: the tree of root with its statistics, the solutions and
+        # the state of the policies (random generators, incumbents). The tree is streamed to the file with
+        # one fixed size record per node and only the root state. Returns the number of saved nodes
+        data = (self.solutions, self.tree_policy.checkpoint(), self.default_policy.checkpoint())
+        return save_tree(path, root, data)
 
-            res = self.default_policy.simulate(node)
-            self.tree_policy.backpropagate(node, res)
+    def load(self, path: str) -> T:
+        # Restores a checkpoint written by save into this search, whose policies must be set up as the
+        # ones of the saved search. Returns the root to resume the search from with run
+        root, (solutions, tree_data, default_data) = load_tree(path)
 
-            n_iter += 1
-            print(f"Finished iteration {n_iter}")
+        if self.solutions is not None and solutions is not None:
+            self.solutions.restore(solutions)
 
+        self.tree_policy.restore(root, tree_data)
+        self.default_policy.restore(default_data)
         return root
 
     def __str__(self) -> str:
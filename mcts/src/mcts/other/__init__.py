@@ -1,5 +1,20 @@
+from mcts.other.node_budget import NodeBudget
+from mcts.other.run_summary import ParallelRunSummary, RunSummary
+from mcts.other.search_profiler import SearchProfile, SearchProfiler
 from mcts.other.solutions import Solutions
+from mcts.other.state_node import StateNode
+from mcts.other.transposition_table import TranspositionTable
+from mcts.other.tree_checkpoint import load_tree, save_tree
 
 __all__ = [
-    "Solutions"
+    "NodeBudget",
+    "ParallelRunSummary",
+    "RunSummary",
+    "SearchProfile",
+    "SearchProfiler",
+    "Solutions",
+    "StateNode",
+    "TranspositionTable",
+    "load_tree",
+    "save_tree"
 ]
\ No newline at end of file
@@ -0,0 +1,74 @@
+from collections.abc import Iterator
+from typing import Any
+
+from mcts.other.search_profiler import node_children
+
+
+class NodeBudget:
+    # Bounds the number of nodes of an object tree (UctTreeNode or OptTreeNode). Once max_nodes is exceeded
+    # the least visited nodes whose children are all leaves are collapsed back into leaves, until the tree
+    # is down to recycle_to * max_nodes nodes. A collapsed node keeps its statistics and expands its
+    # actions again when it is next selected, so no part of the search space is lost
+    max_nodes: int # -1 for no limit
+    recycle_to: float # Fraction of max_nodes kept by a recycling pass, below 1 so that the passes are amortised
+    n_nodes: int # Nodes of the tree, the root included
+    n_recycled: int # Nodes released by the recycling passes
+    n_passes: int
+
+    def __init__(self, max_nodes: int = -1, recycle_to: float = 0.9) -> None:
+        if not 0 <= recycle_to < 1:
+            raise ValueError("recycle_to must be in [0, 1)")
+
+        self.max_nodes = max_nodes
+        self.recycle_to = recycle_to
+        self.n_nodes = 1
+        self.n_recycled = 0
+        self.n_passes = 0
+
+    def add(self) -> None:
+        self.n_nodes += 1
+
+    def is_full(self) -> bool:
+        return self.max_nodes >= 0 and self.n_nodes > self.max_nodes
+
+    @staticmethod
+    def nodes(root: Any) -> Iterator[Any]:
+        stack = [root]
+
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node_children(node))
+
+    def recount(self, root: Any) -> None:
+        # Needed when the tree changes outside of the expansions, e.g. after a reroot
+        self.n_nodes = sum(1 for _ in self.nodes(root))
+
+    def recycle(self, root: Any) -> None:
+        target = int(self.max_nodes * self.recycle_to)
+        self.n_passes += 1
+
+        while self.n_nodes > target:
+            # Collapsing the bottom interior nodes only drops leaves, so the collapsed nodes keep an exact count
+            frontier = [node for node in self.nodes(root)
+                if node is not root and node.children and not any(child.children for child in node_children(node))]
+
+            if not frontier:
+                break
+
+            frontier.sort(key=lambda node: node.N)
+
+            for node in frontier:
+                if self.n_nodes <= target:
+                    break
+
+                released = node.collapse()
+                self.n_nodes -= released
+                self.n_recycled += released
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "n_nodes": self.n_nodes,
+            "n_recycled": self.n_recycled,
+            "n_passes": self.n_passes
+        }
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class RunSummary[T]:
+    root: T
+    n_iter: int # Number of completed iterations
+    elapsed: float # Wall-clock time spent in the search, in seconds
+    best_reward: float | None # Best reward found, or None if no Solutions object was tracked
+    target_reached: bool = False
+    solved: bool = False # Whether the search stopped because the tree policy solved the root
+
+@dataclass
+class ParallelRunSummary:
+    n_iter: int # Number of completed iterations, summed over all workers
+    elapsed: float # Wall-clock time spent in the search, in seconds
+    best_reward: float | None
+    best_solution: Any = None # Best solution found by any worker, as stored by Solutions
+    root_stats: list[tuple[int, float]] = field(default_factory=list) # Merged (visits, value) of each root child
+    worker_iters: list[int] = field(default_factory=list) # Iterations completed by each worker
+    target_reached: bool = False
@@ -0,0 +1,205 @@
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from time import perf_counter
+from typing import Any
+
+from mcts.interfaces import DefaultPolicy, TreePolicy
+
+
+@dataclass
+class PhaseStats:
+    count: int = 0
+    time: float = 0.0 # Cumulative time in seconds
+
+@dataclass
+class SearchProfile:
+    n_iter: int = 0
+    elapsed: float = 0.0 # Time spent in the profiled iterations, in seconds
+    selection: PhaseStats = field(default_factory=PhaseStats) # Tree policy, without the expansions
+    expansion: PhaseStats = field(default_factory=PhaseStats) # Calls to expand, including the ones on fully expanded nodes
+    simulation: PhaseStats = field(default_factory=PhaseStats)
+    backpropagation: PhaseStats = field(default_factory=PhaseStats)
+    play_calls: int = 0 # State.play calls of the expansions that added a node and of the counted rollouts
+    apply_calls: int = 0 # State.apply calls of the counted rollouts, played in place
+    n_rollouts: int = 0
+    counted_rollouts: int = 0 # Rollouts reported to the profiler by the default policy, see DefaultPolicy.rollout_hook
+    rollout_steps: int = 0 # Actions played by the counted rollouts
+    max_rollout_length: int = 0 # Actions played by the longest counted rollout
+    leaf_depths: list[int] = field(default_factory=list) # Number of iterations whose selected node was at each depth
+    tree_size: int = 0 # Distinct nodes reachable from the root at the end of the run
+    tree_depths: list[int] = field(default_factory=list) # Number of nodes at each depth at the end of the run
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.n_iter / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mean_rollout_length(self) -> float:
+        return self.rollout_steps / self.counted_rollouts if self.counted_rollouts > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        report = asdict(self)
+        report["iterations_per_second"] = self.iterations_per_second
+        report["mean_rollout_length"] = self.mean_rollout_length
+
+        # The rollouts of a pool, or of a policy without the hook, are not counted
+        if self.counted_rollouts < self.n_rollouts:
+            for name in ("play_calls", "apply_calls", "rollout_steps", "max_rollout_length", "mean_rollout_length"):
+                report[name] = "n/a"
+
+        return report
+
+def node_children(node: Any) -> Iterable[Any]:
+    # UctTreeNode keeps its children in a list, OptTreeNode as (action, child) pairs
+    return (child[1] if isinstance(child, tuple) else child for child in node.children)
+
+def node_depth(node: Any) -> int:
+    depth = 0
+
+    while (node := getattr(node, "parent", None)) is not None:
+        depth += 1
+
+    return depth
+
+def increment(histogram: list[int], index: int) -> None:
+    histogram.extend([0] * (index + 1 - len(histogram)))
+    histogram[index] += 1
+
+
+class SearchProfiler:
+    # Opt-in instrumentation of MonteCarloTreeSearch.run. The engine marks the phases of its own steps with
+    # begin, selected, simulated and finished, and the default policy reports each rollout through its
+    # rollout_hook. The expansions are timed by wrapping the expand method of the tree policy object. Both
+    # are set on the policies of the run only, and removed at its end. children and depth default to the
+    # parent/children links of the object trees, the arena policies need arena based ones
+    profile: SearchProfile
+    children: Callable[[Any], Iterable[Any]]
+    depth: Callable[[Any], int]
+
+    _tree_policy: Any # Policies the profiler is attached to
+    _default_policy: Any
+    _expand: Any # expand set on the tree policy object before the run, None if it was the method
+    _t0: float # Start of the current step
+    _t1: float # End of its selection
+    _t2: float # End of its simulation
+    _expansion_time: float # Expansion time before the current step
+    _nodes: list[Any] # Leaves of the current step
+
+    def __init__(self, children: Callable[[Any], Iterable[Any]] = node_children, depth: Callable[[Any], int] = node_depth) -> None:
+        self.profile = SearchProfile()
+        self.children = children
+        self.depth = depth
+        self._tree_policy = None
+        self._default_policy = None
+        self._expand = None
+        self._nodes = []
+
+    def attach(self, tree_policy: TreePolicy[Any, Any], default_policy: DefaultPolicy[Any, Any]) -> None:
+        profile = self.profile
+        expand = getattr(tree_policy, "expand", None)
+
+        if expand is not None:
+            def timed_expand(*args: Any) -> Any:
+                t0 = perf_counter()
+                node = expand(*args)
+                profile.expansion.time += perf_counter() - t0
+                profile.expansion.count += 1
+
+                # The arena policies return the NO_NODE handle -1 instead of None
+                if node is not None and node != -1:
+                    profile.play_calls += 1
+
+                return node
+
+            # Shadows the method on this policy object only
+            self._expand = vars(tree_policy).get("expand")
+            setattr(tree_policy, "expand", timed_expand)
+
+        default_policy.rollout_hook = self.rollout
+        self._tree_policy = tree_policy
+        self._default_policy = default_policy
+
+    def detach(self, root: Any) -> None:
+        if self._tree_policy is not None and "expand" in vars(self._tree_policy):
+            if self._expand is None:
+                delattr(self._tree_policy, "expand")
+            else:
+                setattr(self._tree_policy, "expand", self._expand)
+
+        if self._default_policy is not None:
+            self._default_policy.rollout_hook = None
+
+        self._tree_policy = None
+        self._default_policy = None
+        self.record_tree(root)
+
+    def rollout(self, steps: int, in_place: bool) -> None:
+        # rollout_hook of the default policy, called once per rollout with the number of actions it played
+        profile = self.profile
+        profile.counted_rollouts += 1
+        profile.rollout_steps += steps
+        profile.max_rollout_length = max(profile.max_rollout_length, steps)
+
+        if in_place:
+            profile.apply_calls += steps
+        else:
+            profile.play_calls += steps
+
+    def begin(self) -> None:
+        self._expansion_time = self.profile.expansion.time
+        self._t0 = perf_counter()
+
+    def selected(self, nodes: list[Any]) -> None:
+        self._t1 = perf_counter()
+        self._nodes = nodes
+
+    def simulated(self, results: list[Any]) -> None:
+        self._t2 = perf_counter()
+
+        # The default policies return (reward, number of rollouts, ...)
+        self.profile.n_rollouts += sum(res[1] if isinstance(res, tuple) else 1 for res in results)
+
+    def finished(self) -> None:
+        # Records the step marked since begin
+        t3 = perf_counter()
+        profile = self.profile
+        n = len(self._nodes)
+
+        profile.selection.time += (self._t1 - self._t0) - (profile.expansion.time - self._expansion_time)
+        profile.selection.count += n
+        profile.simulation.time += self._t2 - self._t1
+        profile.simulation.count += n
+        profile.backpropagation.time += t3 - self._t2
+        profile.backpropagation.count += n
+        profile.n_iter += n
+        profile.elapsed += t3 - self._t0
+
+        for node in self._nodes:
+            increment(profile.leaf_depths, self.depth(node))
+
+        self._nodes = []
+
+    def record_tree(self, root: Any) -> None:
+        # Breadth first over distinct nodes, shared nodes of a DAG are counted at their smallest depth. Nodes
+        # hash by identity (or by index in an arena)
+        depths: list[int] = []
+        seen = {root}
+        level = [root]
+
+        while level:
+            depths.append(len(level))
+            next_level = []
+
+            for node in level:
+                for child in self.children(node):
+                    if child not in seen:
+                        seen.add(child)
+                        next_level.append(child)
+
+            level = next_level
+
+        self.profile.tree_size = len(seen)
+        self.profile.tree_depths = depths
+
+    def report(self) -> dict[str, Any]:
+        return self.profile.as_dict()
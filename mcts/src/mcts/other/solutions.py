@@ -10,6 +10,10 @@ class Solutions[A]:
         self.history = []
         self.best_solution = None
 
+    def accepts(self, reward: float) -> bool:
+        # Whether a solution with this reward would be stored by add_solution
+        return self.keep_history or self.best_solution is None or reward > self.best_solution[1]
+
     def add_solution(self, solution: Solution[A]) -> None:
         if self.best_solution is None or solution[1] > self.best_solution[1]:
             self.best_solution = solution
@@ -17,6 +21,15 @@ class Solutions[A]:
         if self.keep_history:
             self.history.append(solution)
 
+    def restore(self, other: Solutions[A]) -> None:
+        # Takes the solutions of other, e.g. read from a checkpoint, the objects sharing this one see them
+        self.history = other.history
+        self.best_solution = other.best_solution
+
+    def reset(self) -> None:
+        self.history = []
+        self.best_solution = None
+
     def add_solutions(self, solutions: list[Solution[A]]) -> None:
         for solution in solutions:
             self.add_solution(solution)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from typing import Any
+
+from mcts.interfaces import State
+
+
+class StateNode[S: State[Any, float, float]]:
+    # Minimal stand-in for a tree node, default policies only read the state of the node. Used to run
+    # them on states that are detached from their tree (e.g. in worker processes)
+    __slots__ = ("state",)
+    state: S
+
+    def __init__(self, state: S) -> None:
+        self.state = state
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+
+class TranspositionTable[K, V]:
+    # Bounded map from states to the nodes that represent them, the least recently used entry is
+    # replaced once the table is full. Evicted nodes stay in the tree, they just stop being shared
+    max_size: int # Maximum number of entries, -1 for no limit
+    key: Callable[[K], Hashable] | None # Maps a state to its table key, the state itself if None
+    hits: int
+    misses: int
+    evictions: int
+    reused_visits: int # Visits already accumulated by the nodes returned on hits
+
+    _entries: OrderedDict[Hashable, V]
+
+    def __init__(self, max_size: int = -1, key: Callable[[K], Hashable] | None = None) -> None:
+        if max_size == 0:
+            raise ValueError("max_size must be positive, or -1 for no limit")
+
+        self.max_size = max_size
+        self.key = key
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reused_visits = 0
+        self._entries = OrderedDict()
+
+    def _key(self, state: K) -> Hashable:
+        return self.key(state) if self.key is not None else state
+
+    def get(self, state: K) -> V | None:
+        key = self._key(state)
+        value = self._entries.get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, state: K, value: V) -> None:
+        key = self._key(state)
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        elif self.max_size >= 0 and len(self._entries) >= self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        self._entries[key] = value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "reused_visits": self.reused_visits
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, state: K) -> bool:
+        return self._key(state) in self._entries
@@ -0,0 +1,141 @@
+import os
+import pickle
+from math import isnan, nan
+from struct import Struct
+from typing import Any, BinaryIO
+
+MAGIC = b"MCTSTREE"
+VERSION = 1
+
+# N, W (UCT) or best solution (OPT), 0 (UCT) or worst solution (OPT), solved reward (NaN when unset),
+# number of children and flags
+RECORD = Struct("<ddddIB")
+
+EXHAUSTED = 1
+ORDERED = 2
+DEAD = 4
+AMAF = 8 # The record is followed by the pickled AMAF table of a RaveTreeNode
+
+
+def save_tree(path: str, root: Any, data: Any) -> int:
+    # Writes the tree of root (UctTreeNode or OptTreeNode, subclasses included) to path, after a pickled
+    # header with the node type, the root state and data. Only the root state is stored: the nodes follow
+    # in preorder as fixed size records with their number of children, and the action of a child is its
+    # position in the action order of its parent. The file is written next to path and moved over it once
+    # complete, so an interrupted save keeps the previous checkpoint. Returns the number of nodes
+    partial_path = path + ".partial"
+
+    try:
+        with open(partial_path, "wb") as file:
+            file.write(MAGIC + bytes([VERSION]))
+            pickle.dump((type(root), root.state, data), file, pickle.HIGHEST_PROTOCOL)
+            n_nodes = write_nodes(file, root)
+    except BaseException:
+        os.remove(partial_path)
+        raise
+
+    os.replace(partial_path, path)
+    return n_nodes
+
+def load_tree(path: str) -> tuple[Any, Any]:
+    # Rebuilds the tree written by save_tree, each child is created again by expanding its parent in the
+    # saved order. The states must iterate their actions in the same order on every call, as the node
+    # recycling of NodeBudget already requires. Returns the root and the data of the header
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC) + 1) != MAGIC + bytes([VERSION]):
+            raise ValueError(f"{path} is not a search tree checkpoint")
+
+        node_type, state, data = pickle.load(file)
+        root = node_type(state)
+        read_nodes(file, root)
+
+        if file.read(1):
+            raise ValueError(f"{path} has data after the last node")
+
+    return root, data
+
+def write_nodes(file: BinaryIO, root: Any) -> int:
+    # The nodes are written as they are visited, only the stack of the walk is kept in memory
+    if not hasattr(root, "children") or not hasattr(root, "N"):
+        raise ValueError(f"{type(root).__name__} trees cannot be checkpointed")
+
+    opt = hasattr(root, "best_solution")
+    n_nodes = 0
+    stack = [root]
+
+    while stack:
+        node = stack.pop()
+        children = [child[1] for child in node.children] if opt else node.children
+
+        if getattr(node, "_virtual_losses", None):
+            raise ValueError("A tree cannot be checkpointed while leaves are in flight")
+
+        if any(child.parent is not node for child in children):
+            raise ValueError("Trees with shared nodes (transpositions) cannot be checkpointed")
+
+        amaf = getattr(node, "amaf", None)
+        flags = (EXHAUSTED if node._exhausted else 0) | (ORDERED if node._ordered else 0) \
+            | (DEAD if getattr(node, "dead", False) else 0) | (AMAF if amaf is not None else 0)
+        solved = nan if node.solved_reward is None else node.solved_reward
+
+        if opt:
+            file.write(RECORD.pack(node.N, node.best_solution, node.worst_solution, solved, len(children), flags))
+        else:
+            file.write(RECORD.pack(node.N, node.W, 0.0, solved, len(children), flags))
+
+        if amaf is not None:
+            pickle.dump(amaf, file, pickle.HIGHEST_PROTOCOL)
+
+        n_nodes += 1
+        stack.extend(reversed(children))
+
+    return n_nodes
+
+def read_nodes(file: BinaryIO, root: Any) -> int:
+    opt = hasattr(root, "best_solution")
+    n_nodes = 0
+    stack: list[list[Any]] = [] # [node, children left to read] of the nodes whose subtree is being read
+    node = root
+
+    while True:
+        record = file.read(RECORD.size)
+
+        if len(record) < RECORD.size:
+            raise ValueError("The checkpoint ends before the last node")
+
+        n, value, worst, solved, n_children, flags = RECORD.unpack(record)
+        node.N = int(n) if n.is_integer() else n
+
+        if opt:
+            node.best_solution = value
+            node.worst_solution = worst
+            node.dead = bool(flags & DEAD)
+        else:
+            node.W = value
+
+        if not isnan(solved):
+            node.solved_reward = solved
+
+        if flags & AMAF:
+            node.amaf = pickle.load(file)
+
+        if flags & ORDERED:
+            node.order_actions()
+
+        node._exhausted = bool(flags & EXHAUSTED)
+        n_nodes += 1
+
+        if n_children > 0:
+            stack.append([node, n_children])
+
+        while stack and stack[-1][1] == 0:
+            stack.pop()
+
+        if not stack:
+            return n_nodes
+
+        stack[-1][1] -= 1
+        node = stack[-1][0].expand()
+
+        if node is None:
+            raise ValueError("The states have fewer actions than when the checkpoint was written")
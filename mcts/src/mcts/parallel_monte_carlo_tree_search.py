@@ -0,0 +1,382 @@
+from collections.abc import Callable
+from functools import partial
+from multiprocessing import Pipe, Process, Queue
+from multiprocessing.connection import Connection
+from multiprocessing.pool import Pool
+from queue import SimpleQueue
+from random import Random
+from time import perf_counter
+from typing import Any, cast
+
+from mcts.interfaces import TreePolicy, DefaultPolicy, State
+from mcts.monte_carlo_tree_search import MonteCarloTreeSearch
+from mcts.other.run_summary import ParallelRunSummary, RunSummary
+from mcts.other.solutions import Solution, Solutions
+from mcts.other.state_node import StateNode
+
+# Factories are called inside the worker processes with a seed that is distinct for each worker, so
+# they must be picklable (e.g. a module level function or a functools.partial of one)
+type SearchFactory[T, R] = Callable[[int], tuple[MonteCarloTreeSearch[T, R], T]]
+type DefaultPolicyFactory[R] = Callable[[int, Solutions], DefaultPolicy[Any, R]]
+
+def worker_seeds(seed: int | float | str | bytes | bytearray | None, n_workers: int) -> list[int]:
+    random_gen = Random(seed)
+    return [random_gen.getrandbits(64) for _ in range(n_workers)]
+
+def root_stats(root: Any) -> list[tuple[int, float]]:
+    return [(int(node.N), value) for node, value in root.policy_array()]
+
+def merge_root_stats(worker_stats: list[list[tuple[int, float]]]) -> list[tuple[int, float]]:
+    # Children are matched by expansion order, visits are summed and values averaged by visits
+    merged: list[tuple[int, float]] = []
+
+    for index in range(max((len(stats) for stats in worker_stats), default=0)):
+        entries = [stats[index] for stats in worker_stats if index < len(stats)]
+        visits = sum(n for n, _ in entries)
+        value = sum(n * v for n, v in entries) / visits if visits > 0 else 0
+        merged.append((visits, value))
+
+    return merged
+
+def _root_worker[T, R](conn: Connection, search_factory: SearchFactory[T, R], seed: int) -> None:
+    search, root = search_factory(seed)
+    sent_reward: float | None = None
+
+    while (request := conn.recv()) is not None:
+        max_iter, max_time = request
+        summary = search.run(root, max_iter, max_time)
+
+        # The best solution is only sent when it improves, as states may hold large structures
+        best_solution = search.solutions.best_solution if search.solutions is not None else None
+
+        if best_solution is not None and (sent_reward is None or best_solution[1] > sent_reward):
+            sent_reward = best_solution[1]
+        else:
+            best_solution = None
+
+        conn.send((summary.n_iter, root_stats(root), best_solution))
+
+    conn.close()
+
+
+class RootParallelMonteCarloTreeSearch[T, R]:
+    # Runs independent trees in worker processes, which sync every sync_iter iterations (or sync_time
+    # seconds) of each worker. At each sync the best solutions of the workers are gathered, for the target
+    # reward, and nothing is sent back: the trees stay independent. The root statistics are merged once,
+    # at the end of the run
+    search_factory: SearchFactory[T, R]
+    n_workers: int
+    seed: int | float | str | bytes | bytearray | None
+    sync_iter: int
+    sync_time: float
+    solutions: Solutions
+
+    def __init__(self, search_factory: SearchFactory[T, R], n_workers: int, sync_iter: int = 100, sync_time: float = -1,
+            seed: int | float | str | bytes | bytearray | None = None):
+        if sync_iter <= 0 and sync_time <= 0:
+            raise ValueError("Either sync_iter or sync_time must be positive")
+
+        self.search_factory = search_factory
+        self.n_workers = n_workers
+        self.sync_iter = sync_iter
+        self.sync_time = sync_time
+        self.seed = seed
+        self.solutions = Solutions()
+
+    def run(self, max_iter: int = -1, max_time: float = -1, target_reward: float | None = None) -> ParallelRunSummary:
+        # max_iter is the total number of iterations over all workers
+        if max_iter < 0 and max_time < 0 and target_reward is None:
+            raise ValueError("At least one stopping criterion must be given")
+
+        summary = ParallelRunSummary(0, 0.0, None, worker_iters=[0] * self.n_workers)
+        worker_stats: list[list[tuple[int, float]]] = [[] for _ in range(self.n_workers)]
+        connections: list[Connection] = []
+        processes: list[Process] = []
+
+        for seed in worker_seeds(self.seed, self.n_workers):
+            parent_conn, child_conn = Pipe()
+            process = Process(target=_root_worker, args=(child_conn, self.search_factory, seed), daemon=True)
+            process.start()
+            connections.append(parent_conn)
+            processes.append(process)
+
+        t0 = perf_counter()
+        deadline = t0 + max_time if max_time >= 0 else None
+
+        try:
+            while max_iter < 0 or summary.n_iter < max_iter:
+                # -1 leaves the round unlimited on that side, the other one ends it
+                round_iter = self.sync_iter if self.sync_iter > 0 else -1
+
+                if max_iter >= 0:
+                    remaining = -(-(max_iter - summary.n_iter) // self.n_workers)
+                    round_iter = min(round_iter, remaining) if round_iter > 0 else remaining
+
+                round_time = self.sync_time if self.sync_time > 0 else -1
+
+                if deadline is not None:
+                    remaining_time = max(0.0, deadline - perf_counter())
+                    round_time = min(round_time, remaining_time) if round_time > 0 else remaining_time
+
+                for conn in connections:
+                    conn.send((round_iter, round_time))
+
+                round_total = 0
+
+                for index, conn in enumerate(connections):
+                    n_iter, stats, best_solution = conn.recv()
+                    round_total += n_iter
+                    summary.n_iter += n_iter
+                    summary.worker_iters[index] += n_iter
+                    worker_stats[index] = stats
+
+                    if best_solution is not None:
+                        self.solutions.add_solution(best_solution)
+
+                best = self.solutions.best_solution
+
+                if target_reward is not None and best is not None and best[1] >= target_reward:
+                    summary.target_reached = True
+                    break
+
+                if deadline is not None and perf_counter() >= deadline:
+                    break
+
+                if round_total == 0:
+                    # Every tree is solved, the next rounds would not iterate either
+                    break
+        finally:
+            for conn in connections:
+                conn.send(None)
+                conn.close()
+
+            for process in processes:
+                process.join()
+
+        summary.elapsed = perf_counter() - t0
+        summary.root_stats = merge_root_stats(worker_stats)
+        summary.best_solution = self.solutions.best_solution
+        summary.best_reward = summary.best_solution[1] if summary.best_solution is not None else None
+
+        return summary
+
+
+_worker_policy: DefaultPolicy[Any, Any] | None = None
+_worker_solutions: Solutions | None = None
+_worker_state_type: type[State] | None = None
+_worker_context: Any = None
+
+def _init_tree_worker[R](default_policy_factory: DefaultPolicyFactory[R], seeds: Queue, state_type: type[State] | None, context: Any) -> None:
+    global _worker_policy, _worker_solutions, _worker_state_type, _worker_context
+    _worker_solutions = Solutions()
+    _worker_policy = default_policy_factory(seeds.get(), _worker_solutions)
+    _worker_state_type = state_type
+    _worker_context = context
+
+def _simulate_state(data: Any) -> tuple[Any, Solution | None]:
+    # Receives the encoded leaf state when the states support encoding, the state itself otherwise
+    policy = cast(DefaultPolicy[Any, Any], _worker_policy)
+    solutions = cast(Solutions, _worker_solutions)
+    state = _worker_state_type.decode(_worker_context, data) if _worker_state_type is not None else data
+
+    solutions.reset()
+    result = policy.simulate(StateNode(state))
+    best_solution = solutions.best_solution
+
+    if best_solution is not None and _worker_state_type is not None:
+        best_solution = (best_solution[0].encode(), best_solution[1])
+
+    return result, best_solution
+
+
+class TreeParallelMonteCarloTreeSearch[T, R]:
+    # Keeps a single tree in this process and selects one leaf per worker using virtual loss, the
+    # leaves are then simulated in parallel and backpropagated together
+    tree_policy: TreePolicy[T, R]
+    default_policy_factory: DefaultPolicyFactory[R]
+    n_workers: int
+    seed: int | float | str | bytes | bytearray | None
+    solutions: Solutions | None
+
+    def __init__(self, tree_policy: TreePolicy[T, R], default_policy_factory: DefaultPolicyFactory[R], n_workers: int,
+            solutions: Solutions | None = None, seed: int | float | str | bytes | bytearray | None = None):
+        self.tree_policy = tree_policy
+        self.default_policy_factory = default_policy_factory
+        self.n_workers = n_workers
+        self.solutions = solutions
+        self.seed = seed
+
+    def best_reward(self) -> float | None:
+        if self.solutions is None or self.solutions.best_solution is None:
+            return None
+
+        return self.solutions.best_solution[1]
+
+    def run(self, root: T, max_iter: int = -1, max_time: float = -1, target_reward: float | None = None) -> RunSummary[T]:
+        if max_iter < 0 and max_time < 0 and target_reward is None:
+            raise ValueError("At least one stopping criterion must be given")
+
+        if target_reward is not None and self.solutions is None:
+            raise ValueError("A target reward requires a Solutions object")
+
+        seeds: Queue = Queue()
+
+        for seed in worker_seeds(self.seed, self.n_workers):
+            seeds.put(seed)
+
+        summary = RunSummary(root, 0, 0.0, None)
+        t0 = perf_counter()
+        deadline = t0 + max_time if max_time >= 0 else None
+
+        root_state = cast(Any, root).state
+        state_type = type(root_state) if root_state.supports_encoding() else None
+        context = root_state.shared_context() if state_type is not None else None
+
+        with Pool(self.n_workers, _init_tree_worker, (self.default_policy_factory, seeds, state_type, context)) as pool:
+            while max_iter < 0 or summary.n_iter < max_iter:
+                batch_size = self.n_workers if max_iter < 0 else min(self.n_workers, max_iter - summary.n_iter)
+                leaves: list[tuple[T, float]] = []
+
+                for _ in range(batch_size):
+                    leaf = self.tree_policy.tree_policy(root)
+                    leaves.append((leaf, self.tree_policy.add_virtual_loss(leaf)))
+
+                states = [cast(Any, leaf).state for leaf, _ in leaves]
+                results = pool.map(_simulate_state, [state.encode() for state in states] if state_type is not None else states)
+
+                for leaf, virtual_loss in leaves:
+                    self.tree_policy.remove_virtual_loss(leaf, virtual_loss)
+
+                for (leaf, _), (res, best_solution) in zip(leaves, results):
+                    self.tree_policy.backpropagate(leaf, res)
+
+                    if best_solution is not None and self.solutions is not None:
+                        if state_type is not None:
+                            best_solution = (state_type.decode(context, best_solution[0]), best_solution[1])
+
+                        self.solutions.add_solution(best_solution)
+
+                summary.n_iter += batch_size
+                best_reward = self.best_reward()
+
+                if target_reward is not None and best_reward is not None and best_reward >= target_reward:
+                    summary.target_reached = True
+                    break
+
+                if deadline is not None and perf_counter() >= deadline:
+                    break
+
+        summary.elapsed = perf_counter() - t0
+        summary.best_reward = self.best_reward()
+
+        return summary
+
+
+class AsyncTreeParallelMonteCarloTreeSearch[T, R](TreeParallelMonteCarloTreeSearch[T, R]):
+    # TreeParallelMonteCarloTreeSearch without the synchronisation of each batch: up to max_in_flight
+    # leaves are simulated at once, a new leaf is selected (with virtual loss) as soon as a result is
+    # backpropagated, so the workers run while this process selects and backpropagates
+    max_in_flight: int
+
+    def __init__(self, tree_policy: TreePolicy[T, R], default_policy_factory: DefaultPolicyFactory[R], n_workers: int,
+            solutions: Solutions | None = None, seed: int | float | str | bytes | bytearray | None = None, max_in_flight: int = -1):
+        super().__init__(tree_policy, default_policy_factory, n_workers, solutions, seed)
+        # Twice the workers by default, so a worker gets its next leaf without waiting for this process
+        self.max_in_flight = max_in_flight if max_in_flight > 0 else 2 * n_workers
+
+    def run(self, root: T, max_iter: int = -1, max_time: float = -1, target_reward: float | None = None) -> RunSummary[T]:
+        if max_iter < 0 and max_time < 0 and target_reward is None:
+            raise ValueError("At least one stopping criterion must be given")
+
+        if target_reward is not None and self.solutions is None:
+            raise ValueError("A target reward requires a Solutions object")
+
+        seeds: Queue = Queue()
+
+        for seed in worker_seeds(self.seed, self.n_workers):
+            seeds.put(seed)
+
+        summary = RunSummary(root, 0, 0.0, None)
+        t0 = perf_counter()
+        deadline = t0 + max_time if max_time >= 0 else None
+
+        root_state = cast(Any, root).state
+        state_type = type(root_state) if root_state.supports_encoding() else None
+        context = root_state.shared_context() if state_type is not None else None
+
+        # The pool calls back from its result thread, the results are handled here in completion order
+        completed: SimpleQueue = SimpleQueue()
+        in_flight: dict[int, tuple[T, float]] = {} # Task id -> (leaf, virtual loss)
+        leaves: set[Any] = set() # Leaves of the tasks in flight, nodes hash by identity
+        n_submitted = 0
+        stopping = False
+
+        def on_result(task: int, result: Any) -> None:
+            completed.put((task, result, None))
+
+        def on_error(task: int, error: BaseException) -> None:
+            completed.put((task, None, error))
+
+        with Pool(self.n_workers, _init_tree_worker, (self.default_policy_factory, seeds, state_type, context)) as pool:
+            while True:
+                if not stopping and self.tree_policy.is_solved(root):
+                    summary.solved = True
+                    stopping = True
+
+                # Fills the pipeline, a leaf that is already in flight (e.g. a terminal node) is skipped. The
+                # filling stops after max_in_flight such descents, the next result frees a leaf
+                repeats = 0
+
+                while not stopping and len(in_flight) < self.max_in_flight and (max_iter < 0 or n_submitted < max_iter) and repeats < self.max_in_flight:
+                    leaf = self.tree_policy.tree_policy(root)
+
+                    if leaf in leaves:
+                        repeats += 1
+                        continue
+
+                    virtual_loss = self.tree_policy.add_virtual_loss(leaf)
+                    state = cast(Any, leaf).state
+                    task = n_submitted
+                    pool.apply_async(_simulate_state, (state.encode() if state_type is not None else state,),
+                        callback=partial(on_result, task), error_callback=partial(on_error, task))
+
+                    in_flight[task] = (leaf, virtual_loss)
+                    leaves.add(leaf)
+                    n_submitted += 1
+
+                if not in_flight:
+                    break
+
+                task, result, error = completed.get()
+
+                if error is not None:
+                    raise error
+
+                leaf, virtual_loss = in_flight.pop(task)
+                leaves.discard(leaf)
+                res, best_solution = result
+
+                self.tree_policy.remove_virtual_loss(leaf, virtual_loss)
+                self.tree_policy.backpropagate(leaf, res)
+
+                if best_solution is not None and self.solutions is not None:
+                    if state_type is not None:
+                        best_solution = (state_type.decode(context, best_solution[0]), best_solution[1])
+
+                    self.solutions.add_solution(best_solution)
+
+                summary.n_iter += 1
+                best_reward = self.best_reward()
+
+                # Once a criterion is met no new leaf is selected, the rollouts in flight are still applied
+                if target_reward is not None and best_reward is not None and best_reward >= target_reward:
+                    summary.target_reached = True
+                    stopping = True
+
+                if deadline is not None and perf_counter() >= deadline:
+                    stopping = True
+
+        summary.elapsed = perf_counter() - t0
+        summary.best_reward = self.best_reward()
+
+        return summary
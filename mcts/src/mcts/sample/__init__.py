@@ -1,9 +1,15 @@
+from mcts.sample.graph_bounds import greedy_clique
+from mcts.sample.graph_color_bitset_dsatur_state import GraphColorBitsetDsaturState
 from mcts.sample.graph_color_dsatur_state import GraphColorDsaturState
 from mcts.sample.graph_color_seq_state import GraphColorSeqState
+from mcts.sample.tic_tac_toe_bitboard_state import TicTacToeBitboardState
 from mcts.sample.tic_tac_toe_state import TicTacToeState
 
 __all__ = [
+    "greedy_clique",
+    "GraphColorBitsetDsaturState",
     "GraphColorDsaturState", 
     "GraphColorSeqState", 
+    "TicTacToeBitboardState",
     "TicTacToeState"
 ]
\ No newline at end of file
@@ -0,0 +1,13 @@
+def greedy_clique(graph: list[set[int]]) -> list[int]:
+    # Clique grown greedily from the vertices of highest degree, its size is a lower bound on the
+    # number of colors of any coloring of the graph
+    clique: list[int] = []
+    candidates = set(range(len(graph)))
+
+    while candidates:
+        vertex = max(candidates, key=lambda v: (len(graph[v] & candidates), -v))
+        clique.append(vertex)
+        candidates &= graph[vertex]
+        candidates.discard(vertex)
+
+    return clique
\ No newline at end of file
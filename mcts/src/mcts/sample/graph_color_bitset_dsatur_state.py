@@ -0,0 +1,311 @@
+from collections.abc import Iterator
+from typing import cast
+from mcts.interfaces import State
+
+class BitsetGraph:
+    # Immutable data shared by every state of a search. Vertices are stored by rank, ordered by
+    # decreasing degree and then by index, so the lowest set bit of a bitset is the DSATUR tie-break
+    graph: list[set[int]]
+    order: list[int] # Vertex of each rank
+    rank: list[int] # Rank of each vertex
+    adj: list[int] # Adjacency bitset of each rank, in rank space
+
+    def __init__(self, graph: list[set[int]]) -> None:
+        self.graph = graph
+        self.order = sorted(range(len(graph)), key=lambda v: (-len(graph[v]), v))
+        self.rank = [0] * len(graph)
+
+        for r, v in enumerate(self.order):
+            self.rank[v] = r
+
+        self.adj = []
+
+        for v in self.order:
+            bits = 0
+
+            for neighbor in graph[v]:
+                if neighbor != v:
+                    bits |= 1 << self.rank[neighbor]
+
+            self.adj.append(bits)
+
+    def __getstate__(self) -> tuple[list[int], list[int]]:
+        # The graph is rebuilt from the bitsets, which are much more compact to send
+        return (self.order, self.adj)
+
+    def __setstate__(self, data: tuple[list[int], list[int]]) -> None:
+        self.order, self.adj = data
+        self.rank = [0] * len(self.order)
+
+        for r, v in enumerate(self.order):
+            self.rank[v] = r
+
+        self.graph = [set() for _ in self.order]
+
+        for r, bits in enumerate(self.adj):
+            vertex = self.order[r]
+
+            while bits:
+                low = bits & -bits
+                self.graph[vertex].add(self.order[low.bit_length() - 1])
+                bits ^= low
+
+def raise_saturation(buckets: list[int], vertices: int) -> None:
+    # Moves the given vertices one saturation bucket up
+    for s in range(len(buckets) - 1, -1, -1):
+        moved = buckets[s] & vertices
+
+        if moved:
+            buckets[s] ^= moved
+
+            if s + 1 == len(buckets):
+                buckets.append(moved)
+            else:
+                buckets[s + 1] |= moved
+
+class GraphColorBitsetDsaturActionIterator:
+    _vertex: int = -1
+    _color: int = 0 # Index for iterator
+    _forbidden: int = 0 # Bitset of the colors of the neighbors of the vertex
+    _is_terminal: bool = False
+
+    def __init__(self, state: GraphColorBitsetDsaturState) -> None:
+        self.state = state
+
+        if state.is_terminal():
+            self._is_terminal = True
+            return
+
+        self._rank = state.next_rank()
+        self._vertex = state.context.order[self._rank]
+
+        for color, neighbors in enumerate(state.neighbor_classes):
+            if (neighbors >> self._rank) & 1:
+                self._forbidden |= 1 << color
+
+    def __iter__(self):
+        self._color = 0
+        return self
+
+    def __next__(self) -> tuple[int, int]:
+        while not self._is_terminal and self._color <= self.state.n_colors:
+            color = self._color
+            self._color += 1
+
+            if (self._forbidden >> color) & 1:
+                continue
+
+            return (self._vertex, color)
+
+        raise StopIteration
+
+
+class GraphColorBitsetDsaturState(State[tuple[int, int], float, float]):
+    # Same search space and actions as GraphColorDsaturState, with every set stored as an integer bitset
+    # in rank space so that playing a move takes O(n_colors) bitset operations
+    graph: list[set[int]]
+    context: BitsetGraph
+    # The sequences are tuples shared between states, and lists only in rollout clones
+    color_classes: tuple[int, ...] | list[int] # Vertices of each color
+    neighbor_classes: tuple[int, ...] | list[int] # Vertices adjacent to at least one vertex of each color
+    buckets: tuple[int, ...] | list[int] # Uncolored vertices of each saturation degree
+    uncolored: int
+
+    _hash: int | None = None
+    _undo: list[tuple[int, int, int, list[int]]] # (rank, color, previous neighbor class, previous buckets)
+
+    @property
+    def n_colors(self) -> int:
+        return len(self.color_classes)
+
+    @property
+    def colorings(self) -> dict[int, int]:
+        order = self.context.order
+        colorings = {}
+
+        for color, bits in enumerate(self.color_classes):
+            while bits:
+                low = bits & -bits
+                colorings[order[low.bit_length() - 1]] = color
+                bits ^= low
+
+        return colorings
+
+    @property
+    def coloring(self):
+        colorings = self.colorings
+        return [colorings[v] for v in range(len(colorings))]
+
+    def __init__(self, graph: list[set[int]], context: BitsetGraph | None = None, color_classes: tuple[int, ...] | list[int] = (),
+            neighbor_classes: tuple[int, ...] | list[int] = (), buckets: tuple[int, ...] | list[int] | None = None, uncolored: int | None = None) -> None:
+        self.graph = graph
+        self.context = context if context is not None else BitsetGraph(graph)
+        self.color_classes = color_classes
+        self.neighbor_classes = neighbor_classes
+        self.uncolored = uncolored if uncolored is not None else (1 << len(graph)) - 1
+        self.buckets = buckets if buckets is not None else (self.uncolored,)
+
+    def next_rank(self) -> int:
+        # Lowest rank among the uncolored vertices with the highest saturation
+        for bits in reversed(self.buckets):
+            if bits:
+                return (bits & -bits).bit_length() - 1
+
+        return -1
+
+    def is_terminal(self) -> bool:
+        return self.uncolored == 0
+
+    def interpret_reward(self, reward: float) -> float:
+        return reward
+
+    def get_reward(self) -> float:
+        return -self.n_colors
+
+    def reward_bound(self) -> float:
+        # Colors are never removed, so no completion uses fewer colors
+        return -self.n_colors
+
+    def action_priority(self, action: tuple[int, int]) -> float:
+        # Minus the number of uncolored neighbors whose saturation the action raises, as in GraphColorDsaturState
+        vertex, color = action
+        raised = self.context.adj[self.context.rank[vertex]] & self.uncolored
+
+        if color < len(self.neighbor_classes):
+            raised &= ~self.neighbor_classes[color]
+
+        return -raised.bit_count()
+
+    def actions_tree(self) -> Iterator[tuple[int, int]]:
+        return GraphColorBitsetDsaturActionIterator(self)
+
+    def actions_default(self) -> Iterator[tuple[int, int]]:
+        return GraphColorBitsetDsaturActionIterator(self)
+
+    def play(self, action: tuple[int, int]) -> GraphColorBitsetDsaturState:
+        vertex, color = action
+        rank = self.context.rank[vertex]
+        bit = 1 << rank
+        uncolored = self.uncolored & ~bit
+        buckets = [bits & ~bit for bits in self.buckets]
+
+        color_classes = list(self.color_classes)
+        neighbor_classes = list(self.neighbor_classes)
+
+        if color == len(color_classes):
+            color_classes.append(0)
+            neighbor_classes.append(0)
+
+        adj = self.context.adj[rank]
+        raise_saturation(buckets, adj & uncolored & ~neighbor_classes[color])
+        color_classes[color] |= bit
+        neighbor_classes[color] |= adj
+
+        return GraphColorBitsetDsaturState(self.graph, self.context, tuple(color_classes), tuple(neighbor_classes), tuple(buckets), uncolored)
+
+    def supports_rollout(self) -> bool:
+        return True
+
+    def clone_for_rollout(self) -> GraphColorBitsetDsaturState:
+        clone = GraphColorBitsetDsaturState(self.graph, self.context, list(self.color_classes), list(self.neighbor_classes),
+            list(self.buckets), self.uncolored)
+        clone._undo = []
+        return clone
+
+    def apply(self, action: tuple[int, int]) -> None:
+        vertex, color = action
+        rank = self.context.rank[vertex]
+        bit = 1 << rank
+        color_classes = cast(list[int], self.color_classes)
+        neighbor_classes = cast(list[int], self.neighbor_classes)
+
+        if color == len(color_classes):
+            color_classes.append(0)
+            neighbor_classes.append(0)
+
+        self._undo.append((rank, color, neighbor_classes[color], cast(list[int], self.buckets)))
+        self.uncolored &= ~bit
+        buckets = [bits & ~bit for bits in self.buckets]
+
+        adj = self.context.adj[rank]
+        raise_saturation(buckets, adj & self.uncolored & ~neighbor_classes[color])
+        color_classes[color] |= bit
+        neighbor_classes[color] |= adj
+        self.buckets = buckets
+
+    def undo(self) -> None:
+        rank, color, neighbors, self.buckets = self._undo.pop()
+        bit = 1 << rank
+        color_classes = cast(list[int], self.color_classes)
+        neighbor_classes = cast(list[int], self.neighbor_classes)
+
+        self.uncolored |= bit
+        color_classes[color] &= ~bit
+        neighbor_classes[color] = neighbors
+
+        if color_classes[color] == 0 and color == len(color_classes) - 1:
+            color_classes.pop()
+            neighbor_classes.pop()
+
+    def equals(self, other: GraphColorBitsetDsaturState) -> bool:
+        return self.color_classes == other.color_classes
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(self.color_classes)
+
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        try:
+            other_state = cast(GraphColorBitsetDsaturState, other)
+            return self.equals(other_state)
+        except:
+            return False
+
+    def supports_encoding(self) -> bool:
+        return True
+
+    def shared_context(self) -> BitsetGraph:
+        return self.context
+
+    def encode(self) -> tuple[int, ...]:
+        return tuple(self.color_classes)
+
+    @classmethod
+    def decode(cls, context: BitsetGraph, data: tuple[int, ...]) -> GraphColorBitsetDsaturState:
+        # The neighbor classes and saturation buckets are rebuilt from the color classes
+        uncolored = (1 << len(context.order)) - 1
+        neighbor_classes = []
+
+        for bits in data:
+            uncolored &= ~bits
+            neighbors = 0
+
+            while bits:
+                low = bits & -bits
+                neighbors |= context.adj[low.bit_length() - 1]
+                bits ^= low
+
+            neighbor_classes.append(neighbors)
+
+        buckets = [uncolored]
+
+        for neighbors in neighbor_classes:
+            raise_saturation(buckets, neighbors & uncolored)
+
+        return cls(context.graph, context, data, tuple(neighbor_classes), tuple(buckets), uncolored)
+
+    def is_valid(self) -> bool:
+        for bits in self.color_classes:
+            members = bits
+
+            while members:
+                low = members & -members
+
+                if self.context.adj[low.bit_length() - 1] & bits:
+                    return False
+
+                members ^= low
+
+        return True
@@ -49,10 +49,6 @@ class GraphColorDsaturActionIterator:
 
             return new_assignment
 
-        if self._is_terminal:
-            print(self.state.coloring)
-            exit()
-
         raise StopIteration
 
 
@@ -63,6 +59,7 @@ class GraphColorDsaturState(State[tuple[int, int], float, float]):
     n_colors: int
 
     _hash: int | None = None
+    _undo: list[tuple[int, int, int, list[int]]] # (vertex, color, previous n_colors, neighbors that gained the color)
 
     @property
     def coloring(self):
@@ -83,6 +80,22 @@ class GraphColorDsaturState(State[tuple[int, int], float, float]):
     def get_reward(self) -> float:
         return -self.n_colors
 
+    def reward_bound(self) -> float:
+        # Colors are never removed, so no completion uses fewer colors
+        return -self.n_colors
+
+    def action_priority(self, action: tuple[int, int]) -> float:
+        # Minus the number of uncolored neighbors whose saturation the action raises, so that the colors
+        # already surrounding the neighborhood come first and a new color comes last
+        vertex, color = action
+        raised = 0
+
+        for neighbor in self.graph[vertex]:
+            if neighbor != vertex and neighbor not in self.colorings and color not in self.neighbors_colors.get(neighbor, ()):
+                raised += 1
+
+        return -raised
+
     def actions_tree(self) -> Iterator[tuple[int, int]]:
         return GraphColorDsaturActionIterator(self)
     
@@ -105,14 +118,86 @@ class GraphColorDsaturState(State[tuple[int, int], float, float]):
 
         return GraphColorDsaturState(self.graph, new_state, neighbors_colors, max(self.n_colors, action[1] + 1))
 
+    def supports_encoding(self) -> bool:
+        return True
+
+    def shared_context(self) -> list[set[int]]:
+        return self.graph
+
+    def encode(self) -> tuple[tuple[tuple[int, int], ...], int]:
+        return (tuple(self.colorings.items()), self.n_colors)
+
+    @classmethod
+    def decode(cls, context: list[set[int]], data: tuple[tuple[tuple[int, int], ...], int]) -> GraphColorDsaturState:
+        # The neighbors colors are rebuilt from the colorings instead of being sent
+        colorings = dict(data[0])
+        neighbors_colors: dict[int, set[int]] = {}
+
+        for vertex, color in colorings.items():
+            for neighbor in context[vertex]:
+                if neighbor not in colorings:
+                    neighbors_colors.setdefault(neighbor, set()).add(color)
+
+        return cls(context, colorings, neighbors_colors, data[1])
+
+    def supports_rollout(self) -> bool:
+        return True
+
+    def clone_for_rollout(self) -> GraphColorDsaturState:
+        neighbors_colors = {vertex: colors.copy() for vertex, colors in self.neighbors_colors.items()}
+        clone = GraphColorDsaturState(self.graph, self.colorings.copy(), neighbors_colors, self.n_colors)
+        clone._undo = []
+        return clone
+
+    def apply(self, action: tuple[int, int]) -> None:
+        vertex, color = action
+        gained = []
+
+        for neighbor in self.graph[vertex]:
+            if neighbor in self.colorings:
+                continue
+
+            colors = self.neighbors_colors.setdefault(neighbor, set())
+
+            if color not in colors:
+                colors.add(color)
+                gained.append(neighbor)
+
+        self.colorings[vertex] = color
+        self._undo.append((vertex, color, self.n_colors, gained))
+        self.n_colors = max(self.n_colors, color + 1)
+
+    def undo(self) -> None:
+        vertex, color, self.n_colors, gained = self._undo.pop()
+        del self.colorings[vertex]
+
+        for neighbor in gained:
+            self.neighbors_colors[neighbor].discard(color)
+
     def equals(self, other: GraphColorDsaturState) -> bool:
         return self.colorings == other.colorings
 
     def __hash__(self) -> int:
-        if self._hash is not None:
-            return self._hash
-        else:
-            return hash(tuple(self.colorings.items()))
+        # The colorings are compared as dicts, so the hash must not depend on the insertion order
+        if self._hash is None:
+            self._hash = hash(frozenset(self.colorings.items()))
+
+        return self._hash
+
+    def canonical_key(self) -> tuple[tuple[int, int], ...]:
+        # Equal for colorings that only differ by a permutation of the colors, usable as a transposition key
+        relabel: dict[int, int] = {}
+        key = []
+
+        for vertex in sorted(self.colorings):
+            color = self.colorings[vertex]
+
+            if color not in relabel:
+                relabel[color] = len(relabel)
+
+            key.append((vertex, relabel[color]))
+
+        return tuple(key)
             
     def __eq__(self, other: object) -> bool:
         try:
@@ -43,17 +43,18 @@ class GraphColorSeqActionIterator:
 
 class GraphColorSeqState(State[tuple[int, float], float, float]):
     graph: list[set[int]]
-    colorings: tuple[int, ...]
+    colorings: tuple[int, ...] | list[int] # A list only in rollout clones
     n_colors: int
     heuristic_value: float
 
     _hash: int | None = None
+    _undo: list[tuple[int, float]] # Previous (n_colors, heuristic_value) of each applied action
 
     @property
     def coloring(self):
         return self.colorings
 
-    def __init__(self, graph: list[set[int]], colorings: tuple[int, ...] = (), n_colors: int = 0, heuristic_value: float = 0) -> None:
+    def __init__(self, graph: list[set[int]], colorings: tuple[int, ...] | list[int] = (), n_colors: int = 0, heuristic_value: float = 0) -> None:
         self.graph = graph
         self.colorings = colorings
         self.n_colors = n_colors
@@ -68,6 +69,18 @@ class GraphColorSeqState(State[tuple[int, float], float, float]):
     def get_reward(self) -> float:
         return -self.n_colors
 
+    def reward_bound(self) -> float:
+        # Colors are never removed, so no completion uses fewer colors
+        return -self.n_colors
+
+    def action_key(self, action: tuple[int, float]) -> tuple[int, int]:
+        # The action colors the next vertex in order
+        return (len(self.colorings), action[0])
+
+    def action_priority(self, action: tuple[int, float]) -> float:
+        # Heuristic value computed by the action iterator
+        return action[1]
+
     def actions_tree(self) -> Iterator[tuple[int, float]]:
         return GraphColorSeqActionIterator(self)
     
@@ -75,10 +88,41 @@ class GraphColorSeqState(State[tuple[int, float], float, float]):
         return GraphColorSeqActionIterator(self)
 
     def play(self, action: tuple[int, float]) -> GraphColorSeqState:
-        new_state = self.colorings + (action[0],)
+        new_state = tuple(self.colorings) + (action[0],)
         
         return GraphColorSeqState(self.graph, new_state, max(self.n_colors, action[0] + 1), action[1])
 
+    def supports_encoding(self) -> bool:
+        return True
+
+    def shared_context(self) -> list[set[int]]:
+        return self.graph
+
+    def encode(self) -> tuple[tuple[int, ...], int, float]:
+        return (tuple(self.colorings), self.n_colors, self.heuristic_value)
+
+    @classmethod
+    def decode(cls, context: list[set[int]], data: tuple[tuple[int, ...], int, float]) -> GraphColorSeqState:
+        return cls(context, *data)
+
+    def supports_rollout(self) -> bool:
+        return True
+
+    def clone_for_rollout(self) -> GraphColorSeqState:
+        clone = GraphColorSeqState(self.graph, list(self.colorings), self.n_colors, self.heuristic_value)
+        clone._undo = []
+        return clone
+
+    def apply(self, action: tuple[int, float]) -> None:
+        cast(list[int], self.colorings).append(action[0])
+        self._undo.append((self.n_colors, self.heuristic_value))
+        self.n_colors = max(self.n_colors, action[0] + 1)
+        self.heuristic_value = action[1]
+
+    def undo(self) -> None:
+        cast(list[int], self.colorings).pop()
+        self.n_colors, self.heuristic_value = self._undo.pop()
+
     def equals(self, other: GraphColorSeqState) -> bool:
         return self.colorings == other.colorings
 
@@ -0,0 +1,163 @@
+from collections.abc import Iterator
+from typing import cast
+
+from mcts.interfaces import State
+
+FULL = 0b111111111 # Every cell, cell i is bit i
+
+LINES = [
+    0b000000111, 0b000111000, 0b111000000, # Rows
+    0b001001001, 0b010010010, 0b100100100, # Columns
+    0b100010001, 0b001010100 # Diagonals
+]
+
+# WINS[mask] is True when the cells of mask contain a full line
+WINS = [any(mask & line == line for line in LINES) for mask in range(FULL + 1)]
+
+class TicTacToeBitboardIterator:
+    _free: int # Bitset of the empty cells that were not returned yet
+
+    def __init__(self, state: TicTacToeBitboardState) -> None:
+        self._free = 0 if state.is_terminal() else FULL & ~(state.x | state.o)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        if not self._free:
+            raise StopIteration
+
+        low = self._free & -self._free
+        self._free ^= low
+        return low.bit_length() - 1
+
+class TicTacToeBitboardState(State[int, float, float]):
+    # Same game as TicTacToeState, with the cells of each player in a 9 bit mask. The actions are returned
+    # in the same order, so both states give the same games for the same random choices
+    x: int # Cells of player 1
+    o: int # Cells of player 2
+    turn: int
+
+    _hash: int
+    _undo: list[int] # Cells of the applied actions, -1 for the ones that were ignored
+
+    def __init__(self, x: int = 0, o: int = 0, turn: int = 1) -> None:
+        self.x = x
+        self.o = o
+        self.turn = turn
+        self._hash = x | (o << 9)
+
+    def action_key(self, action: int) -> tuple[int, int]:
+        # The same cell is a different move for each player
+        return (self.turn, action)
+
+    def actions_tree(self) -> Iterator[int]:
+        return TicTacToeBitboardIterator(self)
+
+    def actions_default(self) -> Iterator[int]:
+        return TicTacToeBitboardIterator(self)
+
+    def play(self, action: int) -> TicTacToeBitboardState:
+        if action < 0 or action > 8 or (self.x | self.o) >> action & 1:
+            return self
+
+        if self.turn == 1:
+            return TicTacToeBitboardState(self.x | (1 << action), self.o, 2)
+
+        return TicTacToeBitboardState(self.x, self.o | (1 << action), 1)
+
+    def winner(self) -> int:
+        if WINS[self.x]:
+            return 1
+
+        if WINS[self.o]:
+            return 2
+
+        # If there's no winner and there are empty cells, the state is not terminal
+        return -1 if self.x | self.o != FULL else 0
+
+    def is_terminal(self) -> bool:
+        return WINS[self.x] or WINS[self.o] or self.x | self.o == FULL
+
+    def interpret_reward(self, reward: float) -> float:
+        return -1 * reward if self.turn == 1 else reward
+
+    def get_reward(self) -> float:
+        if WINS[self.x]:
+            return 1
+        elif WINS[self.o]:
+            return -1
+
+        return 0
+
+    def get_symbol_board(self) -> list[str]:
+        return ["X" if self.x >> i & 1 else ("O" if self.o >> i & 1 else " ") for i in range(9)]
+
+    def __str__(self) -> str:
+        symbol_board = self.get_symbol_board()
+
+        first_line = f" {symbol_board[0]} | {symbol_board[1]} | {symbol_board[2]}"
+        second_line = f" {symbol_board[3]} | {symbol_board[4]} | {symbol_board[5]}"
+        third_line = f" {symbol_board[6]} | {symbol_board[7]} | {symbol_board[8]}"
+
+        sep_line = "---+---+---"
+
+        return f"{first_line}\n{sep_line}\n{second_line}\n{sep_line}\n{third_line}\n"
+
+    def supports_encoding(self) -> bool:
+        return True
+
+    def encode(self) -> tuple[int, int, int]:
+        return (self.x, self.o, self.turn)
+
+    @classmethod
+    def decode(cls, context: None, data: tuple[int, int, int]) -> TicTacToeBitboardState:
+        return cls(*data)
+
+    def supports_rollout(self) -> bool:
+        return True
+
+    def clone_for_rollout(self) -> TicTacToeBitboardState:
+        clone = TicTacToeBitboardState(self.x, self.o, self.turn)
+        clone._undo = []
+        return clone
+
+    def apply(self, action: int) -> None:
+        if action < 0 or action > 8 or (self.x | self.o) >> action & 1:
+            self._undo.append(-1)
+            return
+
+        if self.turn == 1:
+            self.x |= 1 << action
+            self.turn = 2
+        else:
+            self.o |= 1 << action
+            self.turn = 1
+
+        self._undo.append(action)
+
+    def undo(self) -> None:
+        action = self._undo.pop()
+
+        if action != -1:
+            # The player who played the action is the one whose turn it is not
+            if self.turn == 2:
+                self.x ^= 1 << action
+                self.turn = 1
+            else:
+                self.o ^= 1 << action
+                self.turn = 2
+
+    def equals(self, other: TicTacToeBitboardState) -> bool:
+        return self.x == other.x and self.o == other.o
+
+    def __hash__(self) -> int:
+        # Rollout clones are mutated in place and are not meant to be hashed
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        try:
+            other_state = cast(TicTacToeBitboardState, other)
+            return self.equals(other_state)
+        except:
+            return False
\ No newline at end of file
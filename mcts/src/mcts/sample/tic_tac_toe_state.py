@@ -38,11 +38,16 @@ class TicTacToeState(State[int, float, float]):
     turn: int
 
     _hash: int | None = None
+    _undo: list[int] # Cells of the applied actions, -1 for the ones that were ignored
 
     def __init__(self, board: list[int] = [0] * 9, turn: int = 1) -> None:
         self.board = board
         self.turn = turn
 
+    def action_key(self, action: int) -> tuple[int, int]:
+        # The same cell is a different move for each player
+        return (self.turn, action)
+
     def actions_tree(self) -> Iterator[int]:
         return TicTacToeStateIterator(self)
     
@@ -112,14 +117,48 @@ class TicTacToeState(State[int, float, float]):
 
         return f"{first_line}\n{sep_line}\n{second_line}\n{sep_line}\n{third_line}\n"
     
+    def supports_encoding(self) -> bool:
+        return True
+
+    def encode(self) -> tuple[tuple[int, ...], int]:
+        return (tuple(self.board), self.turn)
+
+    @classmethod
+    def decode(cls, context: None, data: tuple[tuple[int, ...], int]) -> TicTacToeState:
+        return cls(list(data[0]), data[1])
+
+    def supports_rollout(self) -> bool:
+        return True
+
+    def clone_for_rollout(self) -> TicTacToeState:
+        clone = TicTacToeState(self.board.copy(), self.turn)
+        clone._undo = []
+        return clone
+
+    def apply(self, action: int) -> None:
+        if action < 0 or action > 8 or self.board[action] != 0:
+            self._undo.append(-1)
+            return
+
+        self.board[action] = self.turn
+        self.turn = (self.turn % 2) + 1
+        self._undo.append(action)
+
+    def undo(self) -> None:
+        action = self._undo.pop()
+
+        if action != -1:
+            self.board[action] = 0
+            self.turn = (self.turn % 2) + 1
+
     def equals(self, other: TicTacToeState) -> bool:
         return self.board == other.board
 
     def __hash__(self) -> int:
-        if self._hash is not None:
-            return self._hash
-        else:
-            return hash(self.board) 
+        if self._hash is None:
+            self._hash = hash(tuple(self.board))
+
+        return self._hash
     
     def __eq__(self, other: object) -> bool:
         try: